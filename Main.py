@@ -1,35 +1,77 @@
+import os
 import sys
+import threading
+import time
 
-from PyQt6.QtCore import QSettings
+from PyQt6.QtCore import QSettings, QStandardPaths, QTimer
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QLabel, QLineEdit, QPushButton,
-    QWidget, QMessageBox, QGroupBox
+    QWidget, QMessageBox, QGroupBox, QCheckBox
 )
 
-from air_quality_class.air_quality_class_ui import AirQualityClass
-from geo_class.geo_class_ui import GeoClass
-from helper_class.helper_class_ui import HelperClass
-from life_class.life_class_ui import LifestyleClass
-from ocean_class.ocean_class_ui import OceanClass
 from utils.api_client import ApiClient
-from weather_class.weather_class_ui import WeatherClass
+from utils.async_fetch import AsyncFetcher
+from utils.disk_cache import DiskCache
+from utils.instrumentation import CHART_RENDER_SECONDS, MetricsHook
+from utils.metrics import MetricsRegistry, MetricsServer
+from utils.rate_limiter import RateLimiter
+
+# 功能窗口在首次打开时才导入，启动时不加载 matplotlib 等重量级依赖
+
+DEFAULT_VERIFY_INTERVAL = 24 * 60 * 60  # 已保存的 API Key 默认每天最多联网验证一次
+DEFAULT_COLLECT_INTERVAL = 6 * 60 * 60  # 历史数据默认每 6 小时归档一次
+METRICS_FILE_INTERVAL = 15 * 1000  # 指标文件的写入间隔（毫秒）
 
 
 class MainApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("SkyTracker")
-        self.setFixedSize(500, 450)
-
-        self.api_client = ApiClient()
+        self.setFixedSize(500, 540)
 
         self.settings = QSettings("SkyTracker", "SkyTrackerApp")
 
+        # 响应持久化到应用数据目录，重启后可直接展示上次的数据
+        data_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+        self.disk_cache = DiskCache(os.path.join(data_dir, "response_cache.sqlite3"))
+        # 启动时在后台清理过期缓存，退出时不再同步执行，避免缓存较大时关闭窗口卡顿
+        threading.Thread(target=self.disk_cache.compact, name="DiskCacheCompact", daemon=True).start()
+        # 按 Key 限流并统计每日配额，上限可在配置中修改（0 表示不限）
+        per_minute = int(self.settings.value("rate_limit_per_minute", 0))
+        daily_quota = int(self.settings.value("daily_quota", 0))
+        self.rate_limiter = RateLimiter(
+            per_minute=per_minute or None,
+            daily_quota=daily_quota or None,
+            quota_path=os.path.join(data_dir, "daily_quota.json"),
+        )
+
+        # 每次请求的各阶段耗时、缓存命中与状态记录到进程内的指标注册表
+        self.metrics = MetricsRegistry()
+        self.metrics.register(CHART_RENDER_SECONDS)
+
+        # 缓存过期 10 分钟内先展示旧数据，后台刷新后窗口自动更新
+        # 配置了 api_base_url 时经由局域网缓存代理（utils.proxy_server）访问，为空则直连心知天气
+        self.api_client = ApiClient(disk_cache=self.disk_cache, stale_grace=10 * 60, rate_limiter=self.rate_limiter,
+                                    base_url=self.settings.value("api_base_url", "") or None,
+                                    hooks=[MetricsHook(self.metrics)],
+                                    offline=self.settings.value("offline_mode", False, type=bool))
+        self.metrics_server = None
+        self.metrics_timer = None
+        self.start_metrics_export()
+
+        # 关注城市的历史数据归档，Key 可用且关注列表非空时才启动
+        self.history_dir = os.path.join(data_dir, "history")
+        self.history_collector = None
+
+        self.fetcher = AsyncFetcher(self)
+        QApplication.instance().aboutToQuit.connect(self.release_resources)
+
         # 初始化 UI
         self.init_ui()
 
-        self.check_saved_api_key()
-        self.show_startup_message()
+        # 有已保存的 Key 时直接启用功能并在后台验证，否则在窗口显示后给出提示
+        if not self.check_saved_api_key():
+            QTimer.singleShot(0, self.show_startup_message)
 
     def show_startup_message(self):
         startup_message = QMessageBox(self)
@@ -41,7 +83,7 @@ class MainApp(QMainWindow):
             "提示：本程序功能基于心知天气试用版API，请确保您拥有试用版或更高级版本的API访问权限并拥有网络连接用于验证。"
         )
         startup_message.setStandardButtons(QMessageBox.StandardButton.Ok)
-        startup_message.exec()
+        startup_message.open()  # 不阻塞事件循环
 
     def init_ui(self):
         layout = QVBoxLayout()
@@ -91,17 +133,29 @@ class MainApp(QMainWindow):
         self.button_helper.setEnabled(False)
         self.button_helper.clicked.connect(self.open_helper_class)
 
+        # 性能监控不访问接口，无需 Key
+        self.button_perf_hud = QPushButton("性能监控")
+        self.button_perf_hud.clicked.connect(self.open_perf_hud)
+
         for button in [
             self.button_weather,
             self.button_air_quality,
             self.button_lifestyle,
             self.button_ocean,
             self.button_geo,
-            self.button_helper
+            self.button_helper,
+            self.button_perf_hud
         ]:
             button.setStyleSheet("font-size: 14px; padding: 10px;")
             function_layout.addWidget(button)
 
+        # 离线模式：只显示缓存中的数据（含已过期的），不访问网络
+        self.checkbox_offline = QCheckBox("离线模式（只显示缓存数据，不访问网络）")
+        self.checkbox_offline.setStyleSheet("font-size: 14px;")
+        self.checkbox_offline.setChecked(self.api_client.offline)
+        self.checkbox_offline.toggled.connect(self.set_offline)
+        function_layout.addWidget(self.checkbox_offline)
+
         function_group.setLayout(function_layout)
         layout.addWidget(function_group)
 
@@ -139,10 +193,38 @@ class MainApp(QMainWindow):
         """)
 
     def check_saved_api_key(self):
+        """使用已保存的 API Key，返回是否存在已保存的 Key"""
         saved_key = self.settings.value("api_key", "")
-        if saved_key:
-            self.input_key.setText(saved_key)
+        if not saved_key:
+            return False
+
+        # 先乐观地启用功能，验证在后台进行
+        self.input_key.setText(saved_key)
+        self.api_client.set_api_key(saved_key)
+        self.set_buttons_enabled(True)
+        QTimer.singleShot(0, self.start_history_collector)  # 不拖慢首次绘制
+
+        # 距上次验证成功未超过间隔时不再联网验证
+        verified_at = float(self.settings.value("api_key_verified_at", 0))
+        interval = float(self.settings.value("api_key_verify_interval", DEFAULT_VERIFY_INTERVAL))
+        if time.time() - verified_at >= interval and not self.api_client.offline:
             self.verify_api_key(saved_key, show_message=False)
+        return True
+
+    def set_buttons_enabled(self, enabled):
+        for button in [
+            self.button_weather,
+            self.button_air_quality,
+            self.button_lifestyle,
+            self.button_ocean,
+            self.button_geo,
+            self.button_helper
+        ]:
+            button.setEnabled(enabled)
+
+    def set_offline(self, offline):
+        self.api_client.offline = offline
+        self.settings.setValue("offline_mode", offline)
 
     def confirm_key(self):
         api_key = self.input_key.text().strip()
@@ -153,32 +235,35 @@ class MainApp(QMainWindow):
         self.verify_api_key(api_key)
 
     def verify_api_key(self, api_key, show_message=True):
-        try:
-            # 设置 API Key
-            self.api_client.set_api_key(api_key)
-
-            # 测试 API Key 是否有效
-            if self.api_client.test_api_key():
-                if show_message:
-                    QMessageBox.information(self, "成功", "API Key 验证成功！")
-                    self.ask_save_key(api_key)
-
-                # 验证成功则启用所有按钮
-                for button in [
-                    self.button_weather,
-                    self.button_air_quality,
-                    self.button_lifestyle,
-                    self.button_ocean,
-                    self.button_geo,
-                    self.button_helper
-                ]:
-                    button.setEnabled(True)
-            else:
-                if show_message:
-                    QMessageBox.warning(self, "失败", "API Key 无效，请重新输入！")
-        except Exception as e:
+        # 设置 API Key，并在后台测试 API Key 是否有效
+        self.api_client.set_api_key(api_key)
+        self.fetcher.run(
+            self.api_client.verify_api_key,
+            on_result=lambda valid: self.on_api_key_verified(api_key, valid, show_message),
+            # 后台验证时网络不可用不影响已启用的功能，下次启动再验证
+            on_error=None if show_message else lambda e: print(f"API Key 后台验证失败: {e}"),
+            error_message="设置或验证 API Key 时出错",
+        )
+
+    def on_api_key_verified(self, api_key, valid, show_message):
+        if valid:
+            if api_key == self.settings.value("api_key", ""):
+                self.settings.setValue("api_key_verified_at", time.time())
+            if show_message:
+                QMessageBox.information(self, "成功", "API Key 验证成功！")
+                self.ask_save_key(api_key)
+
+            # 验证成功则启用所有按钮
+            self.set_buttons_enabled(True)
+            self.start_history_collector()
+        else:
+            self.set_buttons_enabled(False)
+            self.stop_history_collector()
+            self.settings.remove("api_key_verified_at")
             if show_message:
-                QMessageBox.critical(self, "错误", f"设置或验证 API Key 时出错: {e}")
+                QMessageBox.warning(self, "失败", "API Key 无效，请重新输入！")
+            else:
+                self.label_key.setText("已保存的 API Key 验证失败，请重新输入:")
 
     def ask_save_key(self, api_key):
         # 提示用户是否保存 API Key，下次启动免输入
@@ -191,36 +276,112 @@ class MainApp(QMainWindow):
 
         if choice == QMessageBox.StandardButton.Yes:
             self.settings.setValue("api_key", api_key)
+            self.settings.setValue("api_key_verified_at", time.time())
         else:
             self.settings.remove("api_key")
+            self.settings.remove("api_key_verified_at")
+
+    def start_history_collector(self):
+        """按配置中的关注列表（history_watch_list）在后台定期归档历史天气与空气质量"""
+        cities = [city for city in self.settings.value("history_watch_list", [], type=list) if city]
+        if not cities or self.history_collector is not None:
+            return
+
+        # 归档依赖 numpy，仅在需要时导入
+        from utils.history_archive import HistoryArchive, HistoryCollector
+        interval = float(self.settings.value("history_collect_interval", DEFAULT_COLLECT_INTERVAL))
+        self.history_collector = HistoryCollector(
+            self.api_client, HistoryArchive(self.history_dir), cities, interval=interval
+        )
+        self.history_collector.start()
+
+    def stop_history_collector(self):
+        if self.history_collector is not None:
+            self.history_collector.stop(timeout=0)  # 不等待进行中的请求，线程随后自行退出
+            self.history_collector = None
+
+    def start_metrics_export(self):
+        """
+        按配置导出 Prometheus 格式的指标：metrics_port 非 0 时在本机该端口提供 /metrics，
+        metrics_file 非空时定期写入该文件
+        """
+        port = int(self.settings.value("metrics_port", 0))
+        if port:
+            try:
+                self.metrics_server = MetricsServer(self.metrics, port=port).start()
+            except OSError as e:
+                print(f"指标端口 {port} 启动失败: {e}")
+
+        path = self.settings.value("metrics_file", "")
+        if path:
+            self.metrics_timer = QTimer(self)
+            self.metrics_timer.timeout.connect(lambda: self.write_metrics(path))
+            self.metrics_timer.start(METRICS_FILE_INTERVAL)
+
+    def write_metrics(self, path):
+        try:
+            self.metrics.write_prometheus(path)
+        except OSError as e:
+            print(f"写入指标文件失败: {e}")
+
+    def stop_metrics_export(self):
+        if self.metrics_timer is not None:
+            self.metrics_timer.stop()
+            self.write_metrics(self.settings.value("metrics_file", ""))  # 退出前写入最终结果
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+
+    def closeEvent(self, event):
+        # 停止历史归档与指标导出；各功能窗口是独立的顶层窗口，关闭主窗口后可能仍在使用 api_client
+        self.stop_history_collector()
+        self.stop_metrics_export()
+        super().closeEvent(event)
+
+    def release_resources(self):
+        # 所有窗口关闭、程序退出前释放连接池与磁盘缓存，正在进行的缓存清理会被中断
+        self.api_client.close()
 
     def open_weather_class(self):
+        from weather_class.weather_class_ui import WeatherClass
         self.weather_window = WeatherClass(self.api_client)
         self.weather_window.show()
 
     def open_air_quality_class(self):
+        from air_quality_class.air_quality_class_ui import AirQualityClass
         self.air_quality_window = AirQualityClass(self.api_client)
         self.air_quality_window.show()
 
     def open_lifestyle_class(self):
+        from life_class.life_class_ui import LifestyleClass
         self.lifestyle_window = LifestyleClass(self.api_client)
         self.lifestyle_window.show()
 
     def open_ocean_class(self):
+        from ocean_class.ocean_class_ui import OceanClass
         self.ocean_window = OceanClass(self.api_client)
         self.ocean_window.show()
 
     def open_geo_class(self):
+        from geo_class.geo_class_ui import GeoClass
         self.geo_window = GeoClass(self.api_client)
         self.geo_window.show()
 
     def open_helper_class(self):
+        from helper_class.helper_class_ui import HelperClass
         self.helper_window = HelperClass(self.api_client)
         self.helper_window.show()
 
+    def open_perf_hud(self):
+        from helper_class.perf_hud_ui import PerfHud
+        self.perf_hud_window = PerfHud(self.api_client, self.metrics)
+        self.perf_hud_window.show()
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    app.setOrganizationName("SkyTracker")
+    app.setApplicationName("SkyTrackerApp")
     window = MainApp()
     window.show()
     sys.exit(app.exec())
@@ -4,10 +4,7 @@ from PyQt6.QtWidgets import (
     QMainWindow, QVBoxLayout, QPushButton, QWidget, QGroupBox, QApplication
 )
 
-from air_quality_class.air_quality_ranking_ui import AirQualityRanking
-from air_quality_class.current_air_quality_ui import CurrentAirQuality
-from air_quality_class.daily_air_quality_ui import DailyAirQuality
-from air_quality_class.hourly_air_quality_ui import HourlyAirQualityForecast
+# 子功能窗口在首次打开时才导入，启动时不加载 matplotlib 等重量级依赖
 
 
 class AirQualityClass(QMainWindow):
@@ -98,21 +95,25 @@ class AirQualityClass(QMainWindow):
 
     def open_current_air_quality(self):
         if not self.current_air_quality_window:
+            from air_quality_class.current_air_quality_ui import CurrentAirQuality
             self.current_air_quality_window = CurrentAirQuality(self.api_client)
         self.current_air_quality_window.show()
 
     def open_city_air_ranking(self):
         if not self.city_air_ranking_window:
+            from air_quality_class.air_quality_ranking_ui import AirQualityRanking
             self.city_air_ranking_window = AirQualityRanking(self.api_client)
         self.city_air_ranking_window.show()
 
     def open_daily_air_forecast(self):
         if not self.daily_air_forecast_window:
+            from air_quality_class.daily_air_quality_ui import DailyAirQuality
             self.daily_air_forecast_window = DailyAirQuality(self.api_client)
         self.daily_air_forecast_window.show()
 
     def open_hourly_air_forecast(self):
         if not self.hourly_air_forecast_window:
+            from air_quality_class.hourly_air_quality_ui import HourlyAirQualityForecast
             self.hourly_air_forecast_window = HourlyAirQualityForecast(self.api_client)
         self.hourly_air_forecast_window.show()
 
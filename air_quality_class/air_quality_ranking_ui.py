@@ -4,6 +4,8 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QLineEdit, QPushButton, QMessageBox
 )
 
+from utils.async_fetch import AsyncFetcher
+
 
 class AirQualityRanking(QWidget):
     def __init__(self, api_client, parent=None):
@@ -14,6 +16,7 @@ class AirQualityRanking(QWidget):
 
         self.data = []  # 保存城市排名数据
         self.filtered_data = []  # 搜索过滤后的数据
+        self.fetcher = AsyncFetcher(self)
 
         self.init_ui()
 
@@ -43,18 +46,20 @@ class AirQualityRanking(QWidget):
         self.setLayout(layout)
 
     def fetch_air_quality_ranking(self):
-        try:
-            ranking_data = self.api_client.fetch_air_quality_ranking()
-            self.data = ranking_data.get('results', [])
-            self.filtered_data = list(enumerate(self.data, start=1))  # 包含排名的初始数据
-            if not self.data:
-                QMessageBox.warning(self, "提示", "暂无城市空气质量排名数据！")
-                self.table.setRowCount(0)  # 清空表格
-                return
-
-            self.update_table()
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"获取空气质量排名数据失败: {e}")
+        self.fetcher.run(
+            self.api_client.fetch_air_quality_ranking,
+            on_result=self.on_ranking_fetched, error_message="获取空气质量排名数据失败",
+        )
+
+    def on_ranking_fetched(self, ranking_data):
+        self.data = ranking_data.get('results', [])
+        self.filtered_data = list(enumerate(self.data, start=1))  # 包含排名的初始数据
+        if not self.data:
+            QMessageBox.warning(self, "提示", "暂无城市空气质量排名数据！")
+            self.table.setRowCount(0)  # 清空表格
+            return
+
+        self.update_table()
 
     def update_table(self):
         # 更新表格显示
@@ -2,17 +2,27 @@ import sys
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QMessageBox
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
+
+from utils.async_fetch import AsyncFetcher
 
 class CurrentAirQuality(QWidget):
+    # 后台刷新到更新的数据时触发（跨线程，经信号切回 GUI 线程）
+    data_refreshed = pyqtSignal(object)
+
     def __init__(self, api_client, parent=None):
         super().__init__(parent)
         self.api_client = api_client
         self.setWindowTitle("空气质量实况")
         self.setFixedSize(400, 400)
 
+        self.location = None  # 当前显示的城市
+        self.fetcher = AsyncFetcher(self)
+
         self.init_ui()
 
+        self.data_refreshed.connect(self.update_air_quality_info)
+
     def init_ui(self):
         layout = QVBoxLayout()
 
@@ -41,11 +51,26 @@ class CurrentAirQuality(QWidget):
             QMessageBox.warning(self, "警告", "城市名称不能为空！")
             return
 
-        try:
-            air_data = self.api_client.fetch_current_air_quality(location=city)
-            self.update_air_quality_info(air_data)
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"获取空气质量数据失败: {e}")
+        self.location = city
+        self.fetcher.run(
+            self.api_client.fetch_current_air_quality, location=city,
+            on_result=self.update_air_quality_info, error_message="获取空气质量数据失败",
+        )
+
+    def on_data_refreshed(self, path, params, data):
+        # 在后台线程中调用，仅转发当前城市的空气质量实况
+        if path == "/air/now.json" and params.get("location") == self.location:
+            self.data_refreshed.emit(data)
+
+    def showEvent(self, event):
+        # 只在窗口显示期间接收后台刷新，关闭后共享的 api_client 不再持有本窗口
+        self.api_client.add_refresh_listener(self.on_data_refreshed)
+        super().showEvent(event)
+
+    def closeEvent(self, event):
+        self.location = None
+        self.api_client.remove_refresh_listener(self.on_data_refreshed)
+        super().closeEvent(event)
 
     def update_air_quality_info(self, data):
         results = data.get('results', [{}])[0]
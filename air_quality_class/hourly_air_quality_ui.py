@@ -1,20 +1,13 @@
 import sys
-from collections import OrderedDict
-from datetime import datetime
-
-import matplotlib
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-from matplotlib.patches import Patch
 
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QLineEdit, QPushButton, QMessageBox
 )
 
-# 设置中文显示及负号
-matplotlib.rcParams['font.sans-serif'] = ['SimHei']
-matplotlib.rcParams['axes.unicode_minus'] = False
+from utils.async_fetch import AsyncFetcher
+from utils.charts import AqiBands, ChartCanvas
+from utils.timeseries import TimeSeries, normalize_hourly
 
 
 class HourlyAirQualityForecast(QWidget):
@@ -24,12 +17,18 @@ class HourlyAirQualityForecast(QWidget):
         self.setWindowTitle("逐小时空气质量预报")
         self.setFixedSize(1200, 800)
 
-        self.data = []               # 保存逐小时空气质量预报数据
+        self.series = None           # 逐小时空气质量预报时间序列
         self.current_chart = 0       # 当前显示的图表索引
         self.chart_titles = [
             "空气质量指数 (AQI)",
             "PM2.5", "PM10", "SO2", "NO2", "CO", "O3"
         ]
+        self.chart_fields = ["aqi", "pm25", "pm10", "so2", "no2", "co", "o3"]  # 与 chart_titles 一一对应
+        self.times = []              # 每次获取后格式化一次的时间标签
+        self.requested_city = None   # 最近一次请求的城市
+        self.city = None             # 当前数据所属的城市
+        self.generation = 0          # 当前数据所属的请求代数，与城市、图表索引共同组成位图缓存键
+        self.fetcher = AsyncFetcher(self)
 
         self.init_ui()
 
@@ -47,9 +46,12 @@ class HourlyAirQualityForecast(QWidget):
         layout.addWidget(btn_fetch)
 
         # Matplotlib 图表区域
-        self.canvas = FigureCanvas(Figure(figsize=(18, 6)))  # 图表区域尺寸调大，避免拥挤
+        self.canvas = ChartCanvas(figsize=(18, 6))  # 图表区域尺寸调大，避免拥挤
         layout.addWidget(self.canvas)
-        self.ax = self.canvas.figure.add_subplot(111)
+        self.chart = self.canvas.add_chart(
+            111, self.chart_titles[0], "时间 (日-小时)", "空气质量指数 浓度", [(None, 'blue')]
+        )
+        self.aqi_bands = AqiBands(self.chart, legend_loc="upper left")  # 仅 AQI 图表显示分级背景色
 
         # 切换图表按钮
         button_layout = QHBoxLayout()
@@ -73,129 +75,61 @@ class HourlyAirQualityForecast(QWidget):
             QMessageBox.warning(self, "警告", "城市名称不能为空！")
             return
 
-        try:
-            air_data = self.api_client.fetch_hourly_air_quality_forecast(location=city)
-            self.data = air_data.get('results', [{}])[0].get('hourly', [])
-            if not self.data:
-                QMessageBox.information(self, "提示", "当前城市暂无空气质量预报数据！")
-                return
+        self.requested_city = city
+        self.fetcher.run(
+            self.api_client.fetch_hourly_air_quality_forecast, location=city,
+            on_result=self.on_hourly_air_quality_fetched, error_message="获取空气质量预报数据失败",
+        )
 
-            # 去重并按时间排序
-            self.data = list(OrderedDict((hour['time'], hour) for hour in self.data).values())
+    def on_hourly_air_quality_fetched(self, air_data):
+        hourly = air_data.get('results', [{}])[0].get('hourly', [])
+        if not hourly:
+            QMessageBox.information(self, "提示", "当前城市暂无空气质量预报数据！")
+            return
 
-            self.current_chart = 0
-            self.update_chart()
-            self.prev_button.setEnabled(True)
-            self.next_button.setEnabled(True)
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"获取空气质量预报数据失败: {e}")
+        # 时间与各项数据只在获取后解析一次，翻页时直接取用；按小时去重并排序，缺失的小时补为 NaN
+        self.series = normalize_hourly(TimeSeries.from_records(hourly, 'time', fields=self.chart_fields))
+        self.times = self.series.strftime("%d-%H")  # 日-小时 (如 "25-19" 表示 25号19点)
 
-    def update_chart(self):
-        if not self.data:
-            return
+        # 新数据到达，之前缓存的图表位图全部失效
+        self.city = self.requested_city
+        self.generation = self.fetcher.generation
+        self.canvas.clear_bitmaps()
 
-        # 清空图表
-        self.ax.clear()
+        self.current_chart = 0
+        self.update_chart()
+        self.prev_button.setEnabled(True)
+        self.next_button.setEnabled(True)
 
-        # 格式化时间为 日-小时 (如 "25-19" 表示 25号19点)
-        times = [
-            datetime.strptime(hour['time'], "%Y-%m-%dT%H:%M:%S%z").strftime("%d-%H")
-            for hour in self.data
-        ]
+    def update_chart(self):
+        if not self.series:
+            return
 
-        # 提取各项数据
-        data_map = {
-            0: [int(hour['aqi']) for hour in self.data],    # AQI
-            1: [float(hour['pm25']) for hour in self.data], # PM2.5
-            2: [float(hour['pm10']) for hour in self.data], # PM10
-            3: [float(hour['so2']) for hour in self.data],  # SO2
-            4: [float(hour['no2']) for hour in self.data],  # NO2
-            5: [float(hour['co']) for hour in self.data],   # CO
-            6: [float(hour['o3']) for hour in self.data],   # O3
-        }
-
-        y_data = data_map[self.current_chart]
+        times = self.times
+        field = self.chart_fields[self.current_chart]
+        y_data = self.series[field]
         title = self.chart_titles[self.current_chart]
         ylabel = title.split()[0]  # "空气质量指数" or "PM2.5" etc.
 
-        # 绘制折线图
-        self.ax.plot(range(len(times)), y_data, marker='o', label=title, color='blue')
-        self.ax.set_title(title)
-        self.ax.set_xlabel("时间 (日-小时)")
-        self.ax.set_ylabel(f"{ylabel} 浓度")
         # 设置 X 轴刻度点 (均匀减少显示)
-        self.ax.set_xticks(range(0, len(times), max(1, len(times) // 10)))
-        self.ax.set_xticklabels(times[::max(1, len(times) // 10)], rotation=45, ha='right')
-        self.ax.grid(True)
+        step = max(1, len(times) // 10)
 
         # 如果当前图表是 AQI，则使用颜色分层 + 动态设置范围 + 图例
         if self.current_chart == 0:
+            ylim = (0, self.aqi_bands.update(self.series.max(field)))
+        else:
+            self.aqi_bands.set_visible(False)
+            ylim = None
 
-            max_aqi = max(y_data) if y_data else 0
-
-            #    intervals[i] ~ intervals[i+1] 的颜色为 colors[i]
-            intervals = [0, 50, 100, 150, 200, 300]
-            colors = ["green", "yellow", "orange", "red", "purple", "brown"]
-
-            if max_aqi <= 50:
-                y_upper = 50
-            elif max_aqi <= 100:
-                y_upper = 100
-            elif max_aqi <= 150:
-                y_upper = 150
-            elif max_aqi <= 200:
-                y_upper = 200
-            elif max_aqi <= 300:
-                y_upper = 300
-            else:
-                y_upper = max_aqi + 10
-
-            self.ax.set_ylim(0, y_upper)
-
-            # 动态填充背景色: 只到 y_upper
-            for i in range(len(intervals) - 1):
-                low = intervals[i]
-                high = intervals[i + 1]
-                if high > y_upper:
-                    self.ax.axhspan(low, y_upper, facecolor=colors[i], alpha=0.15)
-                    break  # 超过 y_upper 后，就不用再画后面区间了
-                else:
-                    self.ax.axhspan(low, high, facecolor=colors[i], alpha=0.15)
-
-            # 如果 max_aqi > 300，需要再单独填充 300~y_upper 区间 (棕色)
-            if max_aqi > 300:
-                self.ax.axhspan(300, y_upper, facecolor="brown", alpha=0.15)
-
-            patches = [
-                Patch(facecolor="green",  alpha=0.15, label="0-50：优"),
-                Patch(facecolor="yellow", alpha=0.15, label="50-100：良"),
-                Patch(facecolor="orange", alpha=0.15, label="100-150：轻度污染"),
-                Patch(facecolor="red",    alpha=0.15, label="150-200：中度污染"),
-                Patch(facecolor="purple", alpha=0.15, label="200-300：重度污染"),
-                Patch(facecolor="brown",  alpha=0.15, label=">300：严重污染"),
-            ]
-
-            # 根据 max_aqi 决定要显示哪些档位
-            if max_aqi <= 50:
-                patches = patches[:1]
-            elif max_aqi <= 100:
-                patches = patches[:2]
-            elif max_aqi <= 150:
-                patches = patches[:3]
-            elif max_aqi <= 200:
-                patches = patches[:4]
-            elif max_aqi <= 300:
-                patches = patches[:5]
-            # 若 >300 则 6 档都显示
-
-            self.ax.legend(
-                handles=patches,
-                loc="upper left",
-                title="污染等级",
-                fancybox=True
-            )
-
-        self.canvas.draw()
+        # 绘制折线图
+        self.chart.set_labels(title=title, ylabel=f"{ylabel} 浓度")
+        self.chart.set_data(
+            range(len(times)), [y_data],
+            xticks=range(0, len(times), step), xticklabels=times[::step], rotation=45, ylim=ylim,
+        )
+        # 同一次获取的同一张图表只渲染一次，之后翻页直接贴回缓存的位图；
+        # 图形状态仍同步更新，窗口重绘时显示的是当前图表
+        self.canvas.render(cache_key=(self.city, self.generation, self.current_chart))
 
     def show_previous_chart(self):
         if self.current_chart > 0:
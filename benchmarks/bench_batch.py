@@ -0,0 +1,66 @@
+"""
+对比多城市刷新的三种方式：逐个城市顺序调用、ApiClient.fetch_many 线程池并发、
+AsyncApiClient.fetch_many 协程并发。桩服务器为每个请求加上固定延迟，模拟网络往返。
+
+用法: python -m benchmarks.bench_batch [城市数] [延迟毫秒]
+"""
+import asyncio
+import sys
+import time
+
+from benchmarks.stub_server import StubServer
+from utils.api_client import ApiClient
+from utils.async_api_client import AsyncApiClient
+
+
+def bench_sequential(base_url, cities):
+    """旧做法：逐个城市阻塞调用"""
+    with ApiClient(cache=False) as api_client:
+        api_client.base_url = base_url
+        api_client.set_api_key("bench")
+        start = time.perf_counter()
+        for city in cities:
+            api_client.fetch_current_weather(location=city)
+        return time.perf_counter() - start
+
+
+def bench_threaded(base_url, cities, max_workers):
+    with ApiClient(cache=False, pool_maxsize=max_workers) as api_client:
+        api_client.base_url = base_url
+        api_client.set_api_key("bench")
+        start = time.perf_counter()
+        results = api_client.fetch_current_weather_many(cities, max_workers=max_workers)
+        elapsed = time.perf_counter() - start
+    assert all(result.ok for result in results)
+    return elapsed
+
+
+async def bench_async(base_url, cities, max_concurrency):
+    async with AsyncApiClient() as api_client:
+        api_client.base_url = base_url
+        api_client.set_api_key("bench")
+        start = time.perf_counter()
+        results = await api_client.fetch_current_weather_many(cities, max_concurrency=max_concurrency)
+        elapsed = time.perf_counter() - start
+    assert all(result.ok for result in results)
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+    cities = [f"city{i}" for i in range(count)]
+
+    with StubServer(latency=latency) as server:
+        sequential = bench_sequential(server.base_url, cities)
+        threaded = bench_threaded(server.base_url, cities, max_workers=16)
+        concurrent = asyncio.run(bench_async(server.base_url, cities, max_concurrency=32))
+
+    print(f"城市数: {count}，每个请求延迟 {latency * 1000:.0f} ms")
+    print(f"顺序调用:                    {sequential:7.2f} s")
+    print(f"fetch_many (16 线程):        {threaded:7.2f} s  提升 {sequential / threaded:.1f}x")
+    print(f"AsyncApiClient (并发 32):    {concurrent:7.2f} s  提升 {sequential / concurrent:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
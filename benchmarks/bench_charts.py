@@ -0,0 +1,75 @@
+"""
+对比图表翻页的两种渲染方式：每次 ax.clear() 后重建全部装饰并整图重绘，
+与 ChartCanvas 原地更新 Line2D 并 blit。Qt 默认使用 offscreen 平台。
+
+用法: python -m benchmarks.bench_charts [翻页次数]
+"""
+import os
+import random
+import sys
+import time
+
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from PyQt6.QtWidgets import QApplication
+
+from utils.charts import ChartCanvas
+
+
+def make_days(count):
+    """生成 count 天的逐小时潮高，取值范围相同"""
+    random.seed(0)
+    return [[random.uniform(0, 300) for _ in range(24)] for _ in range(count)]
+
+
+def bench_clear_redraw(app, days):
+    """旧实现：清空坐标轴，重新绘制折线、标题与网格后整图重绘"""
+    canvas = FigureCanvas(Figure(figsize=(8, 4)))
+    ax = canvas.figure.add_subplot(111)
+    canvas.show()
+    start = time.perf_counter()
+    for heights in days:
+        ax.clear()
+        ax.plot(range(len(heights)), heights, marker='o')
+        ax.set_title("逐小时潮汐高度")
+        ax.set_xlabel("时间 (小时)")
+        ax.set_ylabel("潮高 (cm)")
+        ax.grid(True)
+        canvas.draw()
+        app.processEvents()
+    return (time.perf_counter() - start) / len(days)
+
+
+def bench_blit(app, days):
+    """新实现：装饰只创建一次，固定坐标范围后每页只重绘折线"""
+    canvas = ChartCanvas(figsize=(8, 4))
+    chart = canvas.add_chart(111, "逐小时潮汐高度", "时间 (小时)", "潮高 (cm)", [("潮高", None)])
+    canvas.show()
+    chart.set_data(range(24), [days[0]], ylim=(-15, 315))
+    canvas.render()  # 首次整图绘制不计入
+    app.processEvents()
+    start = time.perf_counter()
+    for heights in days:
+        chart.set_data(range(len(heights)), [heights], ylim=(-15, 315))
+        canvas.render()
+        app.processEvents()
+    return (time.perf_counter() - start) / len(days), canvas.full_draws, canvas.blits
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication(sys.argv[:1])
+    days = make_days(count)
+
+    clear_redraw = bench_clear_redraw(app, days)
+    blit, full_draws, blits = bench_blit(app, days)
+
+    print(f"翻页次数: {count}")
+    print(f"ax.clear() + draw:      {clear_redraw * 1000:8.2f} ms/页")
+    print(f"ChartCanvas (blit):     {blit * 1000:8.2f} ms/页（整图重绘 {full_draws} 次，blit {blits} 次）")
+    print(f"提升: {clear_redraw / blit:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+对比每次新建连接的 requests.get 与 ApiClient 连接池的吞吐量。
+
+用法: python -m benchmarks.bench_connection_pool [请求数]
+"""
+import sys
+import time
+
+import requests
+
+from benchmarks.stub_server import StubServer
+from utils.api_client import ApiClient
+
+
+def bench_unpooled(base_url, count):
+    """旧实现：每次调用模块级 requests.get"""
+    params = {"key": "bench", "location": "beijing", "language": "zh-Hans", "unit": "c"}
+    start = time.perf_counter()
+    for _ in range(count):
+        response = requests.get(f"{base_url}/weather/now.json", params=params)
+        response.raise_for_status()
+        response.json()
+    return count / (time.perf_counter() - start)
+
+
+def bench_pooled(base_url, count):
+    """新实现：ApiClient 复用连接池（关闭缓存，只比较传输层）"""
+    with ApiClient(cache=False) as api_client:
+        api_client.base_url = base_url
+        api_client.set_api_key("bench")
+        start = time.perf_counter()
+        for _ in range(count):
+            api_client.fetch_current_weather(location="beijing")
+        return count / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    with StubServer() as server:
+        unpooled = bench_unpooled(server.base_url, count)
+        pooled = bench_pooled(server.base_url, count)
+
+    print(f"请求数: {count}")
+    print(f"requests.get (无连接池): {unpooled:8.1f} req/s")
+    print(f"ApiClient (连接池):      {pooled:8.1f} req/s")
+    print(f"提升: {pooled / unpooled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+多个客户端同时刷新同一批城市时，对比各自直连上游与经由缓存代理的吞吐量及上游请求数。
+每个客户端模拟一台桌面程序或一个定时任务，使用各自的 ApiClient（关闭本地缓存，每轮都发起请求），
+同时在途的请求数为 CLIENT_WORKERS，与桌面程序刷新时的并发相近。
+上游为带固定延迟的本地桩服务器，与代理一同运行在子进程中，避免与客户端争用 GIL。
+
+用法: python -m benchmarks.bench_proxy [客户端数] [城市数] [轮数] [延迟毫秒]
+"""
+import multiprocessing
+import sys
+import threading
+import time
+
+from benchmarks.stub_server import StubServer
+from utils.api_client import ApiClient
+from utils.proxy_server import ProxyServer
+
+CLIENT_WORKERS = 2
+
+
+def run_clients(base_url, clients, cities, rounds):
+    """所有客户端同时开始，各自按轮刷新全部城市，返回 (耗时, 请求总数)"""
+    barrier = threading.Barrier(clients + 1)
+    errors = []
+
+    def client():
+        with ApiClient(cache=False, pool_maxsize=CLIENT_WORKERS, base_url=base_url) as api_client:
+            api_client.set_api_key("bench")
+            barrier.wait()
+            for _ in range(rounds):
+                results = api_client.fetch_current_weather_many(cities, max_workers=CLIENT_WORKERS)
+                errors.extend(result.error for result in results if not result.ok)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    assert not errors, errors[0]
+    return elapsed, clients * len(cities) * rounds
+
+
+def serve(conn, latency):
+    """子进程：启动桩上游与缓存代理，按主进程的指令返回统计，收到 stop 后退出"""
+    with StubServer(latency=latency) as upstream, \
+            ApiClient(pool_maxsize=32, base_url=upstream.base_url) as api_client:
+        api_client.set_api_key("bench")
+        with ProxyServer(api_client, port=0) as proxy:
+            conn.send((upstream.base_url, proxy.base_url))
+            while conn.recv() != "stop":
+                conn.send((upstream.requests, proxy.stats()))
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    latency = (float(sys.argv[4]) if len(sys.argv) > 4 else 200) / 1000
+    cities = [f"city{i}" for i in range(count)]
+
+    conn, child_conn = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=serve, args=(child_conn, latency), daemon=True)
+    server.start()
+    try:
+        upstream_url, proxy_url = conn.recv()
+        direct, total = run_clients(upstream_url, clients, cities, rounds)
+        conn.send("stats")
+        direct_upstream, _ = conn.recv()
+
+        proxied, _ = run_clients(proxy_url, clients, cities, rounds)
+        conn.send("stats")
+        upstream_requests, stats = conn.recv()
+        proxied_upstream = upstream_requests - direct_upstream
+    finally:
+        conn.send("stop")
+        server.join()
+
+    print(f"客户端: {clients}，城市: {count}，轮数: {rounds}，上游延迟 {latency * 1000:.0f} ms，共 {total} 次请求")
+    print(f"各自直连:   {direct:6.2f} s  {total / direct:7.0f} 次/s  上游请求 {direct_upstream}")
+    print(f"经由代理:   {proxied:6.2f} s  {total / proxied:7.0f} 次/s  上游请求 {proxied_upstream}"
+          f"  提升 {direct / proxied:.1f}x")
+    print(f"代理缓存命中率 {stats['cache']['hit_ratio']:.1%}，合并的并发请求 {stats['upstream']['coalesced']} 次")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+测量冷启动耗时：导入 Main、主窗口首次绘制，以及首次打开图表窗口的耗时，
+并与预先导入全部功能模块（延迟导入之前的做法）对比。
+
+每次测量都在新的解释器进程中进行，Qt 默认使用 offscreen 平台，配置与缓存写入临时目录。
+
+用法: python -m benchmarks.bench_startup [重复次数]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# 延迟导入之前，启动时会一并导入的全部功能窗口模块
+FEATURE_MODULES = [
+    "weather_class.current_weather_ui", "weather_class.daily_forecast_ui", "weather_class.hourly_forecast_ui",
+    "weather_class.hourly_history_ui", "weather_class.alerts_ui",
+    "air_quality_class.air_quality_ranking_ui", "air_quality_class.current_air_quality_ui",
+    "air_quality_class.daily_air_quality_ui", "air_quality_class.hourly_air_quality_ui",
+    "life_class.life_index_ui", "life_class.lunar_calendar_ui", "life_class.vehicle_restriction_ui",
+    "ocean_class.tide_forecast_ui", "geo_class.sun_times_ui", "geo_class.moon_times_ui",
+    "helper_class.city_search_ui",
+]
+
+
+def child(eager):
+    """在子进程中执行一次冷启动并输出各阶段耗时（秒）"""
+    start = time.perf_counter()
+    import importlib
+
+    from PyQt6.QtWidgets import QApplication
+
+    import Main
+    if eager:
+        for module in FEATURE_MODULES:
+            importlib.import_module(module)
+    imported = time.perf_counter()
+
+    app = QApplication(sys.argv)
+    window = Main.MainApp()
+    window.show()
+    app.processEvents()
+    painted = time.perf_counter()
+    matplotlib_loaded = "matplotlib" in sys.modules
+
+    window.open_weather_class()
+    window.weather_window.open_hourly_history()
+    app.processEvents()
+    chart_opened = time.perf_counter()
+
+    print(json.dumps({
+        "import": imported - start,
+        "first_paint": painted - start,
+        "first_chart": chart_opened - painted,
+        "matplotlib_loaded": matplotlib_loaded,  # 首次绘制时是否已加载 matplotlib
+    }))
+    window.close()
+
+
+def measure(eager, repeat):
+    """启动 repeat 个子进程，返回各阶段耗时的中位数"""
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, XDG_CONFIG_HOME=home, XDG_DATA_HOME=home)
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+        command = [sys.executable, "-m", "benchmarks.bench_startup", "--child"] + (["--eager"] if eager else [])
+        runs = [
+            json.loads(subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout)
+            for _ in range(repeat)
+        ]
+    result = {key: statistics.median(run[key] for run in runs) for key in ("import", "first_paint", "first_chart")}
+    result["matplotlib_loaded"] = any(run["matplotlib_loaded"] for run in runs)
+    return result
+
+
+def main():
+    if "--child" in sys.argv:
+        child(eager="--eager" in sys.argv)
+        return
+
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    lazy = measure(eager=False, repeat=repeat)
+    eager = measure(eager=True, repeat=repeat)
+
+    print(f"重复次数: {repeat}（取中位数）")
+    print(f"{'':14}{'延迟导入':>10}{'预先导入':>10}")
+    for key, label in (("import", "导入 Main"), ("first_paint", "首次绘制"), ("first_chart", "首次打开图表")):
+        print(f"{label:<12}{lazy[key] * 1000:>10.1f}ms{eager[key] * 1000:>10.1f}ms")
+    print(f"首次绘制时已加载 matplotlib: 延迟导入 {lazy['matplotlib_loaded']}，预先导入 {eager['matplotlib_loaded']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+按心知天气响应结构生成的确定性合成数据，用于尚未录制真实响应的接口，
+使基准测试在没有录制文件时也能覆盖天气实况请求，以及逐小时历史、空气质量与月相等图表数据。
+"""
+import json
+import random
+from datetime import datetime, timedelta
+
+from benchmarks.replay import JSON_CONTENT_TYPE
+
+LOCATION = {"id": "WX4FBXXFKE4F", "name": "北京", "country": "CN", "path": "北京,北京,中国",
+            "timezone": "Asia/Shanghai", "timezone_offset": "+08:00"}
+START = datetime(2025, 1, 1)
+WEATHER_TEXTS = ["晴", "多云", "阴", "小雨"]
+WIND_DIRECTIONS = ["北", "东北", "东", "东南", "南", "西南", "西", "西北"]
+PHASE_NAMES = ["新月", "蛾眉月", "上弦月", "盈凸月", "满月", "亏凸月", "下弦月", "残月"]
+
+
+def _number(rng, low, high, digits=0):
+    """API 中的数值以字符串返回"""
+    return f"{rng.uniform(low, high):.{digits}f}"
+
+
+def _clock(rng, low_hour, high_hour):
+    return f"{rng.randrange(low_hour, high_hour):02d}:{rng.randrange(60):02d}"
+
+
+def current_weather(rng):
+    return {"results": [{"location": LOCATION, "now": {
+        "text": rng.choice(WEATHER_TEXTS), "code": str(rng.randrange(10)), "temperature": _number(rng, -5, 10),
+    }, "last_update": START.strftime("%Y-%m-%dT%H:%M:%S+08:00")}]}
+
+
+def hourly_history(rng, hours=24):
+    """过去 24 小时历史天气，与接口一致按时间倒序"""
+    records = []
+    for i in range(hours):
+        moment = START - timedelta(hours=i)
+        records.append({
+            "last_update": moment.strftime("%Y-%m-%dT%H:%M:%S+08:00"),
+            "text": rng.choice(WEATHER_TEXTS), "code": str(rng.randrange(10)),
+            "temperature": _number(rng, -5, 10), "feels_like": _number(rng, -8, 8),
+            "pressure": _number(rng, 1010, 1030), "humidity": _number(rng, 20, 90),
+            "visibility": _number(rng, 5, 30, 1), "wind_direction": rng.choice(WIND_DIRECTIONS),
+            "wind_direction_degree": _number(rng, 0, 360), "wind_speed": _number(rng, 0, 20, 1),
+            "wind_scale": _number(rng, 0, 5), "clouds": _number(rng, 0, 100),
+            "dew_point": "" if i % 5 == 0 else _number(rng, -15, 0),  # 露点温度时有缺失
+        })
+    return {"results": [{"location": LOCATION, "hourly_history": records}]}
+
+
+def _air(rng):
+    return {"aqi": _number(rng, 20, 220), "pm25": _number(rng, 5, 180), "pm10": _number(rng, 10, 250),
+            "so2": _number(rng, 2, 20), "no2": _number(rng, 10, 80), "co": _number(rng, 0.2, 2.0, 3),
+            "o3": _number(rng, 10, 160), "quality": "良"}
+
+
+def daily_air_quality(rng, days=5):
+    return {"results": [{"location": LOCATION, "daily": [
+        {"date": (START + timedelta(days=i)).strftime("%Y-%m-%d"), **_air(rng)} for i in range(days)
+    ]}]}
+
+
+def hourly_air_quality_forecast(rng, hours=72):
+    return {"results": [{"location": LOCATION, "hourly": [
+        {"time": (START + timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M:%S+08:00"), **_air(rng)}
+        for i in range(hours)
+    ]}]}
+
+
+def moon_times(rng, days=15):
+    moon = []
+    for i in range(days):
+        phase = (i / 29.53) % 1
+        moon.append({
+            "date": (START + timedelta(days=i)).strftime("%Y-%m-%d"),
+            # 每月有一两天没有月出或月落
+            "rise": "" if i % 13 == 6 else _clock(rng, 5, 23), "set": "" if i % 13 == 12 else _clock(rng, 0, 18),
+            "fraction": f"{abs(0.5 - phase) * 2:.3f}", "phase": f"{phase:.3f}",
+            "phase_name": PHASE_NAMES[int(phase * 8) % 8],
+        })
+    return {"results": [{"location": LOCATION, "moon": moon}]}
+
+
+# 接口路径 -> 生成函数
+GENERATORS = {
+    "/weather/now.json": current_weather,
+    "/weather/hourly_history.json": hourly_history,
+    "/air/daily.json": daily_air_quality,
+    "/air/hourly.json": hourly_air_quality_forecast,
+    "/geo/moon.json": moon_times,
+}
+
+
+def fill_missing(store, seed=0):
+    """为 store 中没有录制的接口添加合成响应，返回添加的接口路径"""
+    rng = random.Random(seed)
+    recorded = set(store.paths())
+    added = []
+    for path, generate in GENERATORS.items():
+        body = json.dumps(generate(rng), ensure_ascii=False).encode("utf-8")  # 始终生成，保证各接口数据与录制情况无关
+        if path not in recorded:
+            store.add(path, {}, 200, JSON_CONTENT_TYPE, body)
+            added.append(path)
+    return added
@@ -0,0 +1,65 @@
+"""
+访问心知天气，为注册表中的每个接口录制真实响应，写入 benchmarks/fixtures 供离线回放。
+需要有效的 API Key 与网络连接；录制文件中不保存 Key。
+
+用法: python -m benchmarks.record_fixtures -k YOUR_KEY [-l beijing -l shanghai ...] [--port 永兴岛] [-o 目录]
+"""
+import argparse
+import os
+import sys
+
+from benchmarks.replay import DEFAULT_FIXTURES_DIR, FixtureStore, RecordingAdapter, mount
+from utils.api_client import ApiClient
+from utils.cli import target_param
+from utils.endpoints import API_KEY_ENV, ENDPOINTS
+
+DEFAULT_LOCATIONS = ["beijing", "shanghai", "guangzhou"]
+DEFAULT_PORTS = ["永兴岛"]
+
+
+def record(api_client, targets):
+    """按接口的目标参数依次请求每个接口，返回失败的 (接口名, 目标, 异常) 列表；错误响应同样被录制"""
+    failures = []
+    for endpoint in ENDPOINTS.values():
+        name = target_param(endpoint)
+        for target in targets.get(name, [None]):
+            try:
+                # 只录制完整响应，不经过结果提取函数
+                api_client.get(endpoint.path, endpoint.bind(**({name: target} if name else {})))
+            except Exception as e:
+                failures.append((endpoint.name, target, e))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.record_fixtures", description="录制心知天气接口的真实响应")
+    parser.add_argument("-k", "--key", help=f"API Key，默认读取环境变量 {API_KEY_ENV}")
+    parser.add_argument("-l", "--location", action="append", help=f"录制的城市，可重复，默认 {DEFAULT_LOCATIONS}")
+    parser.add_argument("--port", action="append", help=f"录制潮汐数据的港口，可重复，默认 {DEFAULT_PORTS}")
+    parser.add_argument("-o", "--output", default=DEFAULT_FIXTURES_DIR, help="录制文件目录")
+    parser.add_argument("--base-url", help="接口地址，默认使用心知天气官方地址")
+    args = parser.parse_args(argv)
+
+    api_key = args.key or os.environ.get(API_KEY_ENV)
+    if not api_key:
+        parser.error(f"请通过 --key 或环境变量 {API_KEY_ENV} 提供 API Key")
+
+    locations = args.location or DEFAULT_LOCATIONS
+    targets = {"location": locations, "port": args.port or DEFAULT_PORTS, "query": locations}
+
+    # 从已有录制开始，只替换本次重新录制的条目
+    store = FixtureStore.load(args.output)
+    with ApiClient(cache=False, base_url=args.base_url) as api_client:
+        mount(api_client.session, RecordingAdapter(store))
+        api_client.set_api_key(api_key)
+        failures = record(api_client, targets)
+    store.save()
+
+    print(f"已录制 {len(store)} 条响应到 {args.output}")
+    for name, target, error in failures:
+        print(f"{name}({target or ''}) 失败: {error}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
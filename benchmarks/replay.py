@@ -0,0 +1,222 @@
+"""
+录制与回放心知天气响应，使基准测试与压测可以离线、可重复地运行：
+- FixtureStore：按接口保存的录制响应，位于 benchmarks/fixtures，每个接口一个 JSON 文件
+- RecordingAdapter：挂载到 ApiClient.session，照常访问网络并把每个响应写入 FixtureStore
+- ReplayAdapter：挂载到 ApiClient.session，直接由 FixtureStore 构造响应，不访问网络
+
+桩服务器（benchmarks.stub_server）也可以加载同一份 FixtureStore，经由真实的 HTTP 连接回放。
+"""
+import json
+import os
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import timedelta
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from utils.endpoints import ENDPOINTS_BY_PATH
+from utils.response_cache import ResponseCache
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+
+
+def api_path(url_path):
+    """URL 路径转换为接口路径，例如 /v3/weather/now.json -> /weather/now.json"""
+    _, sep, tail = url_path.partition("/v3/")
+    return "/" + tail if sep else url_path
+
+
+def request_params(query):
+    """查询字符串转换为请求参数字典，去掉 key，录制文件中不保存 API Key"""
+    params = dict(parse_qsl(query, keep_blank_values=True))
+    params.pop("key", None)
+    return params
+
+
+def error_body(message):
+    """与心知天气错误响应格式相同的正文"""
+    return json.dumps({"status": message}, ensure_ascii=False).encode("utf-8")
+
+
+@dataclass(frozen=True)
+class Fixture:
+    """一条录制的响应"""
+
+    path: str
+    params: dict
+    status: int
+    content_type: str
+    body: bytes
+
+
+class FixtureStore:
+    """
+    按接口保存的录制响应。查找时先按接口路径与参数精确匹配，
+    strict 为 False 时再退回到同一接口的其他录制（按参数哈希固定选取一条），
+    这样对任意城市的请求都能得到真实结构的响应，且每次运行选中的响应相同。
+    """
+
+    def __init__(self, root=DEFAULT_FIXTURES_DIR):
+        self.root = root
+        self._fixtures = {}  # 缓存键 -> Fixture，缓存键同 ResponseCache.make_key
+        self._by_path = {}  # 接口路径 -> [Fixture]，按录制顺序
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, root=DEFAULT_FIXTURES_DIR):
+        """读取目录下的全部录制文件，目录不存在时返回空的 FixtureStore"""
+        store = cls(root)
+        if os.path.isdir(root):
+            for name in sorted(os.listdir(root)):
+                if name.endswith(".json"):
+                    with open(os.path.join(root, name), encoding="utf-8") as f:
+                        for entry in json.load(f):
+                            store._add(_decode_entry(entry))
+        return store
+
+    def __len__(self):
+        return len(self._fixtures)
+
+    def paths(self):
+        """已录制的接口路径"""
+        with self._lock:
+            return list(self._by_path)
+
+    def add(self, path, params, status, content_type, body):
+        """添加一条录制，相同接口与参数的旧录制被替换"""
+        self._add(Fixture(path, dict(params), status, content_type or JSON_CONTENT_TYPE, bytes(body)))
+
+    def lookup(self, path, params, strict=False):
+        """查找录制的响应，没有时返回 None"""
+        key = ResponseCache.make_key(path, params)
+        with self._lock:
+            fixture = self._fixtures.get(key)
+            if fixture is not None or strict:
+                return fixture
+            candidates = self._by_path.get(path)
+            if not candidates:
+                return None
+            return candidates[zlib.crc32(repr(key).encode("utf-8")) % len(candidates)]
+
+    def save(self):
+        """按接口写出录制文件，每个文件按参数排序，便于比较差异"""
+        os.makedirs(self.root, exist_ok=True)
+        with self._lock:
+            by_path = {path: list(fixtures) for path, fixtures in self._by_path.items()}
+        for path, fixtures in by_path.items():
+            fixtures.sort(key=lambda fixture: ResponseCache.make_key(fixture.path, fixture.params))
+            file = os.path.join(self.root, f"{_fixture_name(path)}.json")
+            with open(file + ".tmp", "w", encoding="utf-8") as f:
+                json.dump([_encode_entry(fixture) for fixture in fixtures], f, ensure_ascii=False, indent=1)
+            os.replace(file + ".tmp", file)
+
+    def _add(self, fixture):
+        key = ResponseCache.make_key(fixture.path, fixture.params)
+        with self._lock:
+            previous = self._fixtures.get(key)
+            self._fixtures[key] = fixture
+            fixtures = self._by_path.setdefault(fixture.path, [])
+            if previous is not None:
+                fixtures.remove(previous)
+            fixtures.append(fixture)
+
+
+def _fixture_name(path):
+    """录制文件名：已注册接口使用接口名，其余使用路径"""
+    endpoint = ENDPOINTS_BY_PATH.get(path)
+    if endpoint is not None:
+        return endpoint.name
+    return path.strip("/").replace("/", "_").removesuffix(".json")
+
+
+def _encode_entry(fixture):
+    """JSON 正文按对象保存，便于阅读与比较；其余正文按文本保存"""
+    text = fixture.body.decode("utf-8", errors="replace")
+    try:
+        body, is_json = json.loads(text), True
+    except ValueError:
+        body, is_json = text, False
+    return {"path": fixture.path, "params": fixture.params, "status": fixture.status,
+            "content_type": fixture.content_type, "json": is_json, "body": body}
+
+
+def _decode_entry(entry):
+    body = entry["body"]
+    if entry.get("json", True):
+        body = json.dumps(body, ensure_ascii=False, separators=(",", ":"))
+    return Fixture(entry["path"], entry["params"], entry["status"], entry["content_type"], body.encode("utf-8"))
+
+
+class RecordingAdapter(HTTPAdapter):
+    """照常发起请求，并把每个响应（包括错误响应）写入 FixtureStore，不保存 API Key"""
+
+    def __init__(self, store, **kwargs):
+        """kwargs: 传给 HTTPAdapter 的连接池参数"""
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        url = urlsplit(request.url)
+        self.store.add(api_path(url.path), request_params(url.query), response.status_code,
+                       response.headers.get("Content-Type"), response.content)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """由 FixtureStore 构造响应，不访问网络；没有对应录制时返回 404"""
+
+    def __init__(self, store, latency=0.0, strict=False):
+        """
+        latency: 每个请求的固定延迟（秒），模拟网络往返
+        strict: 为 True 时只按参数精确匹配，见 FixtureStore.lookup
+        """
+        super().__init__()
+        self.store = store
+        self.latency = latency
+        self.strict = strict
+        self.requests = 0  # 已回放的请求数
+        self._lock = threading.Lock()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        url = urlsplit(request.url)
+        fixture = self.store.lookup(api_path(url.path), request_params(url.query), self.strict)
+        if fixture is None:
+            status, content_type, body = 404, JSON_CONTENT_TYPE, error_body(f"没有录制的响应: {url.path}")
+        else:
+            status, content_type, body = fixture.status, fixture.content_type, fixture.body
+
+        response = requests.Response()
+        response.status_code = status
+        try:
+            response.reason = HTTPStatus(status).phrase
+        except ValueError:
+            response.reason = ""
+        response.headers = CaseInsensitiveDict({"Content-Type": content_type, "Content-Length": str(len(body))})
+        response._content = body
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=self.latency)
+        return response
+
+    def close(self):
+        pass
+
+
+def mount(session, adapter):
+    """将录制或回放适配器挂载到 session 的 http 与 https 请求上，例如 mount(api_client.session, adapter)"""
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
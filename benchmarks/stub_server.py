@@ -0,0 +1,173 @@
+"""
+本地桩服务器，提供与心知天气相同的 /v3/... 路径，用于离线压测。
+可回放录制的响应（见 benchmarks.replay），并注入固定延迟、随机抖动、错误状态码与连接重置。
+随机数使用固定种子，同样的请求序列每次得到相同的延迟与错误。
+
+用法: python -m benchmarks.stub_server [--port 8765] [--fixtures benchmarks/fixtures]
+                                     [--latency 毫秒] [--jitter 毫秒] [--error-rate 0.05] [--reset-rate 0.01]
+"""
+import argparse
+import json
+import random
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from benchmarks.replay import DEFAULT_FIXTURES_DIR, JSON_CONTENT_TYPE, FixtureStore, api_path, error_body, request_params
+
+# 最小化的心知天气响应，未加载录制响应时对所有接口返回
+STUB_RESPONSE = {
+    "results": [{
+        "location": {"id": "WX4FBXXFKE4F", "name": "北京", "country": "CN", "timezone": "Asia/Shanghai"},
+        "now": {"text": "晴", "code": "0", "temperature": "20"},
+        "last_update": "2025-01-01T12:00:00+08:00",
+    }]
+}
+STUB_BODY = json.dumps(STUB_RESPONSE, ensure_ascii=False).encode("utf-8")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 才能保持长连接
+    protocol_version = "HTTP/1.1"
+    # 头部与正文分开写出，关闭 Nagle 避免长连接下的延迟确认
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if not url.path.startswith("/v3/"):
+            self.send_error(404)
+            return
+
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            delay = server.latency + server.rng.uniform(-server.jitter, server.jitter) if server.jitter \
+                else server.latency
+            roll = server.rng.random()
+        if delay > 0:
+            time.sleep(delay)  # 模拟上游处理与网络往返耗时
+
+        if roll < server.reset_rate:
+            self.reset_connection()
+            return
+        if roll < server.reset_rate + server.error_rate:
+            with server.lock:
+                server.errors += 1
+            self.send_body(server.error_status, JSON_CONTENT_TYPE, error_body("桩服务器注入的错误"))
+            return
+
+        if server.fixtures is None:
+            self.send_body(200, JSON_CONTENT_TYPE, STUB_BODY)
+            return
+        fixture = server.fixtures.lookup(api_path(url.path), request_params(url.query))
+        if fixture is None:
+            self.send_body(404, JSON_CONTENT_TYPE, error_body(f"没有录制的响应: {url.path}"))
+        else:
+            self.send_body(fixture.status, fixture.content_type, fixture.body)
+
+    def send_body(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def reset_connection(self):
+        """不发送响应直接以 RST 关闭连接，客户端得到 ConnectionError"""
+        with self.server.lock:
+            self.server.resets += 1
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    # 默认的监听队列只有 5，大量并发建连时会被丢弃并等待 SYN 重传
+    request_queue_size = 128
+
+
+class StubServer:
+    """在后台线程运行的本地桩服务器"""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503,
+                 reset_rate=0.0, fixtures=None, seed=0):
+        """
+        latency: 每个请求的固定响应延迟（秒）
+        jitter: 在 latency 上叠加的均匀分布随机抖动幅度（秒），实际延迟不小于 0
+        error_rate: 返回 error_status 的请求比例
+        reset_rate: 不返回响应、直接重置连接的请求比例
+        fixtures: 回放的 FixtureStore 或录制目录，None 表示对所有接口返回 STUB_RESPONSE
+        seed: 抖动与错误注入的随机数种子
+        """
+        if isinstance(fixtures, str):
+            fixtures = FixtureStore.load(fixtures)
+        self.httpd = StubHTTPServer((host, port), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.jitter = jitter
+        self.httpd.error_rate = error_rate
+        self.httpd.error_status = error_status
+        self.httpd.reset_rate = reset_rate
+        self.httpd.fixtures = fixtures
+        self.httpd.rng = random.Random(seed)
+        self.httpd.requests = 0  # 收到的接口请求数
+        self.httpd.errors = 0  # 注入的错误响应数
+        self.httpd.resets = 0  # 注入的连接重置数
+        self.httpd.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v3"
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    def stats(self):
+        with self.httpd.lock:
+            return {"requests": self.httpd.requests, "errors": self.httpd.errors, "resets": self.httpd.resets}
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.stub_server", description="离线压测用的心知天气桩服务器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", nargs="?", const=DEFAULT_FIXTURES_DIR,
+                        help=f"回放录制的响应，默认目录 {DEFAULT_FIXTURES_DIR}")
+    parser.add_argument("--latency", type=float, default=0.0, help="固定延迟（毫秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="随机抖动幅度（毫秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回错误状态码的请求比例")
+    parser.add_argument("--error-status", type=int, default=503, help="注入的错误状态码，默认 503")
+    parser.add_argument("--reset-rate", type=float, default=0.0, help="直接重置连接的请求比例")
+    parser.add_argument("--seed", type=int, default=0, help="随机数种子")
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port, latency=args.latency / 1000, jitter=args.jitter / 1000,
+                        error_rate=args.error_rate, error_status=args.error_status, reset_rate=args.reset_rate,
+                        fixtures=args.fixtures, seed=args.seed)
+    with server:
+        fixtures = server.httpd.fixtures
+        print(f"桩服务器已启动: {server.base_url}" + (f"，回放 {len(fixtures)} 条录制响应" if fixtures else ""))
+        try:
+            server.thread.join()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""
+端到端基准测试套件：请求吞吐与延迟分位数、各接口 JSON 解析与规范化、
+各图表窗口的绘图方法（offscreen Qt）以及冷启动耗时。结果写为 JSON，可与之前的结果比较，
+超过阈值的退化会被标出，并以退出码 1 结束，便于在提交前或 CI 中检查。
+
+全部离线运行：请求发往本地桩服务器，回放 benchmarks/fixtures 中的录制响应，
+未录制的图表接口使用 benchmarks.payloads 的合成数据。
+
+用法:
+    python -m benchmarks.suite run -o before.json
+    python -m benchmarks.suite run -o after.json --cases fetch parse
+    python -m benchmarks.suite compare before.json after.json --threshold 10
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from benchmarks import bench_startup
+from benchmarks.payloads import fill_missing
+from benchmarks.replay import DEFAULT_FIXTURES_DIR, FixtureStore
+from benchmarks.stub_server import StubServer
+from utils.api_client import ApiClient
+from utils.cli import target_param
+from utils.endpoints import ENDPOINTS
+from utils.timeseries import TimeSeries, clock_to_hours, normalize_hourly
+
+
+def metric(value, unit="ms", higher_is_better=False):
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def percentile(samples, q):
+    """最近秩法分位数，q 取 0-100"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+def repeat_timing(fn, min_time=0.2, min_runs=5, max_runs=10000):
+    """反复调用 fn，直到总耗时达到 min_time 且至少 min_runs 次，返回每次耗时（秒）"""
+    samples = []
+    total = 0.0
+    while (total < min_time or len(samples) < min_runs) and len(samples) < max_runs:
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed)
+        total += elapsed
+    return samples
+
+
+def sample_params(endpoint):
+    """基准测试中各接口使用的请求参数：目标参数取固定值，其余取默认值"""
+    name = target_param(endpoint)
+    targets = {"location": "beijing", "port": "永兴岛", "query": "beijing"}
+    return endpoint.bind(**({name: targets[name]} if name else {}))
+
+
+def sample_body(store, endpoint):
+    fixture = store.lookup(endpoint.path, sample_params(endpoint))
+    return fixture.body if fixture is not None and fixture.status == 200 else None
+
+
+# 与各图表窗口获取数据后的解析、规范化相同的处理，接口名 -> 函数(提取后的数据)
+NORMALIZERS = {
+    "fetch_hourly_history": lambda data: normalize_hourly(TimeSeries.from_records(
+        data['results'][0]['hourly_history'], 'last_update',
+        fields=('temperature', 'feels_like', 'pressure', 'humidity', 'visibility', 'wind_speed', 'clouds',
+                'dew_point'),
+        texts=('wind_direction', 'text'),
+    )),
+    "fetch_daily_air_quality": lambda data: TimeSeries.from_records(
+        data['results'][0]['daily'], 'date', fields=("aqi", "pm25", "pm10", "so2", "no2", "co", "o3")),
+    "fetch_hourly_air_quality_forecast": lambda data: normalize_hourly(TimeSeries.from_records(
+        data['results'][0]['hourly'], 'time', fields=("aqi", "pm25", "pm10", "so2", "no2", "co", "o3"))),
+    "fetch_moon_times": lambda data: TimeSeries.from_records(
+        data['moon'], 'date', fields=('rise', 'set', 'fraction', 'phase'), texts=('phase_name',),
+        converters={'rise': clock_to_hours, 'set': clock_to_hours}),
+}
+
+
+def bench_fetch(store, args):
+    """经由桩服务器的请求：顺序请求的延迟分位数、内存缓存命中的延迟与 fetch_many 的吞吐量"""
+    cities = [f"city{i}" for i in range(args.requests)]
+    results = {}
+    with StubServer(fixtures=store) as server:
+        with ApiClient(cache=False, base_url=server.base_url) as api_client:
+            api_client.set_api_key("bench")
+            api_client.fetch_current_weather("warmup")  # 建立连接不计入
+            samples = []
+            for city in cities:
+                start = time.perf_counter()
+                api_client.fetch_current_weather(city)
+                samples.append(time.perf_counter() - start)
+            for q in (50, 95, 99):
+                results[f"fetch.latency_p{q}"] = metric(percentile(samples, q) * 1000)
+
+            start = time.perf_counter()
+            batch = api_client.fetch_current_weather_many(cities, max_workers=8)
+            elapsed = time.perf_counter() - start
+            assert all(result.ok for result in batch), "批量请求失败"
+            results["fetch.many_throughput"] = metric(len(cities) / elapsed, "req/s", higher_is_better=True)
+
+        with ApiClient(base_url=server.base_url) as api_client:
+            api_client.set_api_key("bench")
+            api_client.fetch_current_weather("beijing")
+            samples = repeat_timing(lambda: api_client.fetch_current_weather("beijing"))
+            results["fetch.cached_p50"] = metric(percentile(samples, 50) * 1000)
+    return results
+
+
+def bench_parse(store, args):
+    """各接口响应的 JSON 解析与结果提取，以及图表接口转换为 TimeSeries 的规范化"""
+    results = {}
+    for endpoint in ENDPOINTS.values():
+        body = sample_body(store, endpoint)
+        if body is None:
+            continue  # 没有该接口的成功响应
+
+        def parse():
+            data = json.loads(body)
+            return endpoint.extract(data) if endpoint.extract else data
+
+        results[f"parse.{endpoint.name}"] = metric(statistics.median(repeat_timing(parse)) * 1000)
+
+        normalize = NORMALIZERS.get(endpoint.name)
+        if normalize is not None:
+            data = parse()
+            results[f"normalize.{endpoint.name}"] = metric(
+                statistics.median(repeat_timing(lambda: normalize(data))) * 1000)
+    return results
+
+
+def bench_charts(store, args):
+    """各图表窗口的绘图方法：先以获取回调加载数据并完成首次绘制，再计时重复调用"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    logging.getLogger("matplotlib.font_manager").setLevel(logging.ERROR)  # 缺少中文字体时的回退提示
+    from PyQt6.QtWidgets import QApplication
+
+    from air_quality_class.daily_air_quality_ui import DailyAirQuality
+    from air_quality_class.hourly_air_quality_ui import HourlyAirQualityForecast
+    from geo_class.moon_times_ui import MoonTimes
+    from weather_class.hourly_history_ui import HourlyHistory
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    def load(window_class, endpoint_name, callback):
+        endpoint = ENDPOINTS[endpoint_name]
+        data = json.loads(sample_body(store, endpoint))
+        window = window_class(None)
+        window.show()
+        getattr(window, callback)(endpoint.extract(data) if endpoint.extract else data)
+        app.processEvents()
+        return window
+
+    def timed(fn):
+        def run():
+            fn()
+            app.processEvents()
+        return statistics.median(repeat_timing(run, min_runs=args.chart_runs)) * 1000
+
+    results = {}
+    cases = [
+        (HourlyHistory, "fetch_hourly_history", "on_hourly_history_fetched", "plot_weather_data"),
+        (DailyAirQuality, "fetch_daily_air_quality", "on_daily_air_quality_fetched", "plot_air_quality_data"),
+        (MoonTimes, "fetch_moon_times", "on_moon_times_fetched", "plot_moon_times"),
+    ]
+    for window_class, endpoint_name, callback, method in cases:
+        window = load(window_class, endpoint_name, callback)
+        results[f"charts.{window_class.__name__}.{method}"] = metric(timed(getattr(window, method)))
+        window.close()
+
+    # 逐小时空气质量按页切换：cold 每轮先清空位图缓存，warm 直接贴回缓存的位图
+    window = load(HourlyAirQualityForecast, "fetch_hourly_air_quality_forecast", "on_hourly_air_quality_fetched")
+    pages = len(window.chart_fields)
+
+    def flip_pages(clear):
+        if clear:
+            window.canvas.clear_bitmaps()
+        for page in range(pages):
+            window.current_chart = page
+            window.update_chart()
+
+    for label, clear in (("cold", True), ("warm", False)):
+        per_page = timed(lambda: flip_pages(clear)) / pages
+        results[f"charts.HourlyAirQualityForecast.update_chart_{label}"] = metric(per_page)
+    window.close()
+    return results
+
+
+def bench_startup_case(store, args):
+    """冷启动：每次在新的解释器进程中导入 Main、完成首次绘制并打开第一个图表窗口"""
+    result = bench_startup.measure(eager=False, repeat=args.startup_runs)
+    return {f"startup.{key}": metric(result[key] * 1000) for key in ("import", "first_paint", "first_chart")}
+
+
+CASES = {
+    "fetch": bench_fetch,
+    "parse": bench_parse,
+    "charts": bench_charts,
+    "startup": bench_startup_case,
+}
+
+
+def run(args):
+    store = FixtureStore.load(args.fixtures)
+    recorded = len(store)
+    synthetic = fill_missing(store)
+
+    metrics = {}
+    for name in args.cases:
+        start = time.perf_counter()
+        metrics.update(CASES[name](store, args))
+        print(f"{name}: {time.perf_counter() - start:.1f} s", file=sys.stderr)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "fixtures": {"recorded": recorded, "synthetic": synthetic},
+        "metrics": metrics,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+    for name, item in metrics.items():
+        print(f"{name:<56}{item['value']:>12.3f} {item['unit']}")
+    return 0
+
+
+def compare(args):
+    """比较两次结果，变化超过阈值的指标标为退化或改进，存在退化时返回 1"""
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    if baseline.get("fixtures") != current.get("fixtures"):
+        print("注意: 两次运行使用的录制数据不同，解析与图表指标不可直接比较", file=sys.stderr)
+    if baseline.get("platform") != current.get("platform"):
+        print("注意: 两次运行的平台不同", file=sys.stderr)
+
+    threshold = args.threshold / 100
+    regressions = 0
+    print(f"{'指标':<54}{'基准':>12}{'当前':>12}{'变化':>9}")
+    for name, new in current["metrics"].items():
+        old = baseline["metrics"].get(name)
+        if old is None:
+            print(f"{name:<56}{'-':>12}{new['value']:>12.3f}{'新增':>9}")
+            continue
+        change = (new["value"] - old["value"]) / old["value"] if old["value"] else 0.0
+        worse = -change if new["higher_is_better"] else change  # 正值表示变差
+        flag = ""
+        if worse > threshold:
+            flag = "  << 退化"
+            regressions += 1
+        elif worse < -threshold:
+            flag = "  改进"
+        print(f"{name:<56}{old['value']:>12.3f}{new['value']:>12.3f}{change:>+9.1%}{flag}")
+    for name in baseline["metrics"].keys() - current["metrics"].keys():
+        print(f"{name:<56}{baseline['metrics'][name]['value']:>12.3f}{'-':>12}{'缺失':>9}")
+
+    if regressions:
+        print(f"{regressions} 项指标退化超过 {args.threshold:g}%", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description="SkyTracker 端到端基准测试套件")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="运行基准测试")
+    run_parser.add_argument("-o", "--output", help="结果 JSON 文件")
+    run_parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES), help="运行的测试项，默认全部")
+    run_parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR, help="录制响应目录")
+    run_parser.add_argument("--requests", type=int, default=300, help="请求测试的请求数，默认 300")
+    run_parser.add_argument("--chart-runs", type=int, default=20, help="每个绘图方法至少调用的次数，默认 20")
+    run_parser.add_argument("--startup-runs", type=int, default=3, help="冷启动测量次数（取中位数），默认 3")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="比较两次运行的结果")
+    compare_parser.add_argument("baseline", help="基准结果 JSON")
+    compare_parser.add_argument("current", help="当前结果 JSON")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="判定为退化的变化百分比，默认 10")
+    compare_parser.set_defaults(handler=compare)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,7 @@
 import sys
 from PyQt6.QtWidgets import QMainWindow, QVBoxLayout, QPushButton, QWidget, QGroupBox, QApplication
-from geo_class.sun_times_ui import SunriseSunset
-from geo_class.moon_times_ui import MoonTimes
+
+# 子功能窗口在首次打开时才导入，启动时不加载 matplotlib 等重量级依赖
 
 class GeoClass(QMainWindow):
     def __init__(self, api_client, parent=None):
@@ -77,11 +77,13 @@ class GeoClass(QMainWindow):
 
     def open_sunrise_sunset(self):
         if not self.sunrise_sunset_window:
+            from geo_class.sun_times_ui import SunriseSunset
             self.sunrise_sunset_window = SunriseSunset(self.api_client)
         self.sunrise_sunset_window.show()
 
     def open_moonrise_moonset(self):
         if not self.moonrise_moonset_window:
+            from geo_class.moon_times_ui import MoonTimes
             self.moonrise_moonset_window = MoonTimes(self.api_client)
         self.moonrise_moonset_window.show()
 
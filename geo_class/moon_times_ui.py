@@ -1,14 +1,12 @@
 import sys
 
-import matplotlib
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLineEdit, QPushButton, QMessageBox
 )
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 
-matplotlib.rcParams['font.sans-serif'] = ['SimHei']
-matplotlib.rcParams['axes.unicode_minus'] = False
+from utils.async_fetch import AsyncFetcher
+from utils.charts import ChartCanvas
+from utils.timeseries import TimeSeries, clock_to_hours
 
 class MoonTimes(QWidget):
     def __init__(self, api_client, parent=None):
@@ -17,7 +15,8 @@ class MoonTimes(QWidget):
         self.setWindowTitle("月出月落和月相查询")
         self.setFixedSize(800, 800)
 
-        self.data = []
+        self.series = None  # 月出月落和月相时间序列，时刻以小时计
+        self.fetcher = AsyncFetcher(self)
 
         self.init_ui()
 
@@ -36,12 +35,18 @@ class MoonTimes(QWidget):
         self.fetch_button.clicked.connect(self.fetch_moon_times)
         layout.addWidget(self.fetch_button)
 
-        self.canvas = FigureCanvas(Figure(figsize=(8, 10)))
+        self.canvas = ChartCanvas(figsize=(8, 10))
         layout.addWidget(self.canvas)
-        self.ax_rise = self.canvas.figure.add_subplot(411)
-        self.ax_set = self.canvas.figure.add_subplot(412)
-        self.ax_fraction = self.canvas.figure.add_subplot(413)
-        self.ax_phase = self.canvas.figure.add_subplot(414)
+        self.rise_chart = self.canvas.add_chart(
+            411, "月出时间", "日期", "时间 (HH:MM)", [("月出时间", None)], yformatter=self.format_time
+        )
+        self.set_chart = self.canvas.add_chart(
+            412, "月落时间", "日期", "时间 (HH:MM)", [("月落时间", 'orange')], yformatter=self.format_time
+        )
+        self.fraction_chart = self.canvas.add_chart(
+            413, "月亮被照明比例", "日期", "比例 (0-1)", [("月亮被照明比例", 'green')]
+        )
+        self.phase_chart = self.canvas.add_chart(414, "月相", "日期", "月相 (0-1)", [("月相", 'purple')], annotate=True)
         self.canvas.figure.tight_layout(pad=5.0)  # 增加图表间距
 
         self.setLayout(layout)
@@ -58,78 +63,42 @@ class MoonTimes(QWidget):
             QMessageBox.warning(self, "警告", "天数必须为1到15之间的数字！")
             return
 
-        try:
-            data = self.api_client.fetch_moon_times(location, days=int(days))
-            if not data:
-                QMessageBox.information(self, "提示", "当前暂无月出月落和月相数据！")
-                return
+        self.fetcher.run(
+            self.api_client.fetch_moon_times, location, days=int(days),
+            on_result=self.on_moon_times_fetched, error_message="获取月出月落和月相数据失败",
+        )
 
-            self.data = data.get('moon', [])
-            if not self.data:
-                QMessageBox.information(self, "提示", "当前城市暂无月出月落和月相数据！")
-                return
+    def on_moon_times_fetched(self, data):
+        if not data:
+            QMessageBox.information(self, "提示", "当前暂无月出月落和月相数据！")
+            return
+
+        moon = data.get('moon', [])
+        if not moon:
+            QMessageBox.information(self, "提示", "当前城市暂无月出月落和月相数据！")
+            return
 
-            self.plot_moon_times()
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"获取月出月落和月相数据失败: {e}")
+        # 当天没有月出或月落时为 NaN，折线在此断开
+        self.series = TimeSeries.from_records(
+            moon, 'date', fields=('rise', 'set', 'fraction', 'phase'), texts=('phase_name',),
+            converters={'rise': clock_to_hours, 'set': clock_to_hours},
+        )
+        self.plot_moon_times()
 
     def plot_moon_times(self):
-        if not self.data:
+        if not self.series:
             return
 
-        dates = [day['date'][5:] for day in self.data]  # 去掉年份，仅显示月-日
-        rises = [self.safe_time_to_float(day['rise']) for day in self.data]
-        sets = [self.safe_time_to_float(day['set']) for day in self.data]
-        fractions = [float(day['fraction']) for day in self.data]
-        phases = [float(day['phase']) for day in self.data]
-        phase_names = [day['phase_name'] for day in self.data]
-
-        self.ax_rise.clear()
-        self.ax_set.clear()
-        self.ax_fraction.clear()
-        self.ax_phase.clear()
-
-        # 月出时间
-        self.ax_rise.plot(dates, rises, marker='o', label="月出时间")
-        self.ax_rise.set_title("月出时间")
-        self.ax_rise.set_xlabel("日期")
-        self.ax_rise.set_ylabel("时间 (HH:MM)")
-        self.ax_rise.yaxis.set_major_formatter(matplotlib.ticker.FuncFormatter(self.format_time))
-        self.ax_rise.grid(True)
-
-        # 月落时间
-        self.ax_set.plot(dates, sets, marker='o', label="月落时间", color='orange')
-        self.ax_set.set_title("月落时间")
-        self.ax_set.set_xlabel("日期")
-        self.ax_set.set_ylabel("时间 (HH:MM)")
-        self.ax_set.yaxis.set_major_formatter(matplotlib.ticker.FuncFormatter(self.format_time))
-        self.ax_set.grid(True)
-
-        # 月亮被照明比例
-        self.ax_fraction.plot(dates, fractions, marker='o', label="月亮被照明比例", color='green')
-        self.ax_fraction.set_title("月亮被照明比例")
-        self.ax_fraction.set_xlabel("日期")
-        self.ax_fraction.set_ylabel("比例 (0-1)")
-        self.ax_fraction.grid(True)
-
-        # 月相
-        self.ax_phase.plot(dates, phases, marker='o', label="月相", color='purple')
-        for i, txt in enumerate(phase_names):
-            self.ax_phase.annotate(txt, (dates[i], phases[i]), textcoords="offset points", xytext=(0, 10), ha='center')
-        self.ax_phase.set_title("月相")
-        self.ax_phase.set_xlabel("日期")
-        self.ax_phase.set_ylabel("月相 (0-1)")
-        self.ax_phase.grid(True)
-
-        self.canvas.draw()
+        series = self.series
+        dates = series.strftime("%m-%d")  # 去掉年份，仅显示月-日
 
-    @staticmethod
-    def safe_time_to_float(time_str):
-        """安全地将时间字符串 (HH:MM) 转换为浮点数表示的小时，处理空值"""
-        if not time_str or ':' not in time_str:
-            return 0.0  # 如果时间无效，返回默认值 0.0
-        hours, minutes = map(int, time_str.split(':'))
-        return hours + minutes / 60
+        x = range(len(dates))
+        ticks = {"xticks": x, "xticklabels": dates}
+        self.rise_chart.set_data(x, [series['rise']], **ticks)
+        self.set_chart.set_data(x, [series['set']], **ticks)
+        self.fraction_chart.set_data(x, [series['fraction']], **ticks)
+        self.phase_chart.set_data(x, [series['phase']], annotations=series['phase_name'], **ticks)
+        self.canvas.render()
 
     @staticmethod
     def format_time(value, pos):
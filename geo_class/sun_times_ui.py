@@ -1,14 +1,12 @@
 import sys
 
-import matplotlib
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLineEdit, QPushButton, QMessageBox
 )
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 
-matplotlib.rcParams['font.sans-serif'] = ['SimHei']
-matplotlib.rcParams['axes.unicode_minus'] = False
+from utils.async_fetch import AsyncFetcher
+from utils.charts import ChartCanvas
+from utils.timeseries import TimeSeries, clock_to_hours
 
 class SunriseSunset(QWidget):
     def __init__(self, api_client, parent=None):
@@ -17,7 +15,8 @@ class SunriseSunset(QWidget):
         self.setWindowTitle("日出日落时间查询")
         self.setFixedSize(800, 600)
 
-        self.data = []
+        self.series = None  # 日出日落时间序列，时刻以小时计
+        self.fetcher = AsyncFetcher(self)
 
         self.init_ui()
 
@@ -36,10 +35,14 @@ class SunriseSunset(QWidget):
         self.fetch_button.clicked.connect(self.fetch_sun_times)
         layout.addWidget(self.fetch_button)
 
-        self.canvas = FigureCanvas(Figure(figsize=(8, 6)))
+        self.canvas = ChartCanvas(figsize=(8, 6))
         layout.addWidget(self.canvas)
-        self.ax_sunrise = self.canvas.figure.add_subplot(211)
-        self.ax_sunset = self.canvas.figure.add_subplot(212)
+        self.sunrise_chart = self.canvas.add_chart(
+            211, "日出时间", "日期", "时间 (24小时制)", [("日出时间", None)], legend=True, yformatter=self.format_time
+        )
+        self.sunset_chart = self.canvas.add_chart(
+            212, "日落时间", "日期", "时间 (24小时制)", [("日落时间", 'orange')], legend=True, yformatter=self.format_time
+        )
         self.canvas.figure.tight_layout(pad=5.0)  # 增加图表间距
 
         self.setLayout(layout)
@@ -56,58 +59,39 @@ class SunriseSunset(QWidget):
             QMessageBox.warning(self, "警告", "天数必须为1到15之间的数字！")
             return
 
-        try:
-            data = self.api_client.fetch_sun_times(location, days=int(days))
-            if not data:
-                QMessageBox.information(self, "提示", "当前暂无日出日落数据！")
-                return
+        self.fetcher.run(
+            self.api_client.fetch_sun_times, location, days=int(days),
+            on_result=self.on_sun_times_fetched, error_message="获取日出日落数据失败",
+        )
 
-            self.data = data.get('sun', [])
-            if not self.data:
-                QMessageBox.information(self, "提示", "当前城市暂无日出日落数据！")
-                return
-
-            self.plot_sun_times()
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"获取日出日落数据失败: {e}")
+    def on_sun_times_fetched(self, data):
+        if not data:
+            QMessageBox.information(self, "提示", "当前暂无日出日落数据！")
+            return
 
-    def plot_sun_times(self):
-        if not self.data:
+        sun = data.get('sun', [])
+        if not sun:
+            QMessageBox.information(self, "提示", "当前城市暂无日出日落数据！")
             return
 
-        dates = [day['date'] for day in self.data]
-        sunrises = [self.time_to_float(day['sunrise']) for day in self.data]
-        sunsets = [self.time_to_float(day['sunset']) for day in self.data]
+        self.series = TimeSeries.from_records(
+            sun, 'date', fields=('sunrise', 'sunset'),
+            converters={'sunrise': clock_to_hours, 'sunset': clock_to_hours},
+        )
+        self.plot_sun_times()
 
-        self.ax_sunrise.clear()
-        self.ax_sunset.clear()
+    def plot_sun_times(self):
+        if not self.series:
+            return
 
         # 格式化日期，仅显示月-日
-        dates_formatted = [date[5:] for date in dates]
-
-        self.ax_sunrise.plot(dates_formatted, sunrises, marker='o', label="日出时间")
-        self.ax_sunrise.set_title("日出时间")
-        self.ax_sunrise.set_xlabel("日期")
-        self.ax_sunrise.set_ylabel("时间 (24小时制)")
-        self.ax_sunrise.yaxis.set_major_formatter(matplotlib.ticker.FuncFormatter(self.format_time))
-        self.ax_sunrise.legend()
-        self.ax_sunrise.grid(True)
-
-        self.ax_sunset.plot(dates_formatted, sunsets, marker='o', label="日落时间", color='orange')
-        self.ax_sunset.set_title("日落时间")
-        self.ax_sunset.set_xlabel("日期")
-        self.ax_sunset.set_ylabel("时间 (24小时制)")
-        self.ax_sunset.yaxis.set_major_formatter(matplotlib.ticker.FuncFormatter(self.format_time))
-        self.ax_sunset.legend()
-        self.ax_sunset.grid(True)
-
-        self.canvas.draw()
+        dates_formatted = self.series.strftime("%m-%d")
 
-    @staticmethod
-    def time_to_float(time_str):
-        """将时间字符串 (HH:MM) 转换为浮点数表示的小时"""
-        hours, minutes = map(int, time_str.split(':'))
-        return hours + minutes / 60
+        x = range(len(dates_formatted))
+        ticks = {"xticks": x, "xticklabels": dates_formatted}
+        self.sunrise_chart.set_data(x, [self.series['sunrise']], **ticks)
+        self.sunset_chart.set_data(x, [self.series['sunset']], **ticks)
+        self.canvas.render()
 
     @staticmethod
     def format_time(value, pos):
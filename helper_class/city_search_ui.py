@@ -5,6 +5,8 @@ from PyQt6.QtWidgets import (
     QApplication, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QWidget, QMessageBox
 )
 
+from utils.async_fetch import AsyncFetcher
+
 
 class CitySearch(QWidget):
     def __init__(self, api_client, parent=None):
@@ -15,6 +17,7 @@ class CitySearch(QWidget):
 
         self.results = []
         self.current_index = 0
+        self.fetcher = AsyncFetcher(self)
 
         self.init_ui()
 
@@ -61,23 +64,25 @@ class CitySearch(QWidget):
             QMessageBox.warning(self, "警告", "城市名称不能为空！")
             return
 
-        try:
-            data = self.api_client.search_city(city_name)
-            self.results = data.get('results', [])
+        self.fetcher.run(
+            self.api_client.search_city, city_name,
+            on_result=self.on_search_city_fetched, error_message="搜索城市失败",
+        )
 
-            if not self.results:
-                QMessageBox.information(self, "提示", "未找到任何结果！")
-                self.label_info.setText("未找到任何结果！")
-                self.button_previous.setEnabled(False)
-                self.button_next.setEnabled(False)
-                return
+    def on_search_city_fetched(self, data):
+        self.results = data.get('results', [])
 
-            self.current_index = 0
-            self.display_result()
-            self.button_previous.setEnabled(True)
-            self.button_next.setEnabled(True)
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"搜索城市失败: {e}")
+        if not self.results:
+            QMessageBox.information(self, "提示", "未找到任何结果！")
+            self.label_info.setText("未找到任何结果！")
+            self.button_previous.setEnabled(False)
+            self.button_next.setEnabled(False)
+            return
+
+        self.current_index = 0
+        self.display_result()
+        self.button_previous.setEnabled(True)
+        self.button_next.setEnabled(True)
 
     def display_result(self):
         if not self.results:
@@ -1,6 +1,7 @@
 import sys
 from PyQt6.QtWidgets import QMainWindow, QVBoxLayout, QPushButton, QWidget, QGroupBox, QApplication
-from helper_class.city_search_ui import CitySearch
+
+# 子功能窗口在首次打开时才导入，缩短启动时间
 
 class HelperClass(QMainWindow):
     def __init__(self, api_client, parent=None):
@@ -70,6 +71,7 @@ class HelperClass(QMainWindow):
 
     def open_city_search(self):
         if not self.city_search_window:
+            from helper_class.city_search_ui import CitySearch
             self.city_search_window = CitySearch(self.api_client)
         self.city_search_window.show()
 
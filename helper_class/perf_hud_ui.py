@@ -0,0 +1,220 @@
+import os
+import sys
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QFormLayout, QGroupBox, QLabel, QTableWidget, QTableWidgetItem
+)
+
+from utils.async_fetch import fetch_stats
+from utils.resilience import CircuitBreaker
+
+HUD_REFRESH_INTERVAL = 1000  # 刷新间隔（毫秒），只在窗口可见时刷新
+
+
+def process_rss():
+    """当前进程占用的物理内存（字节），无法获取时返回 None"""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage",
+                )
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        get_current_process = ctypes.windll.kernel32.GetCurrentProcess
+        get_current_process.restype = wintypes.HANDLE
+        get_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+        get_memory_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters), wintypes.DWORD]
+        if not get_memory_info(get_current_process(), ctypes.byref(counters), counters.cb):
+            return None
+        return counters.WorkingSetSize
+    try:
+        # Linux：第二项为常驻内存页数
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def format_seconds(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:.1f} ms"
+
+
+def format_limit(value):
+    return "不限" if value is None else str(value)
+
+
+class PerfHud(QWidget):
+    """
+    性能监控窗口：从进程内的指标注册表读取各接口的延迟分位数、缓存命中率与各图表的渲染耗时，
+    连同调用预算、熔断状态与内存占用定时刷新。读取只是汇总几组计数，窗口本身几乎没有开销。
+    """
+
+    def __init__(self, api_client, metrics, parent=None):
+        """metrics: 注册了 MetricsHook 与 CHART_RENDER_SECONDS 的 MetricsRegistry"""
+        super().__init__(parent)
+        self.api_client = api_client
+        self.metrics = metrics
+        self.setWindowTitle("性能监控")
+        self.resize(620, 640)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        # 概览
+        summary_group = QGroupBox("概览")
+        summary_layout = QFormLayout()
+        self.label_in_flight = QLabel()
+        self.label_hit_ratio = QLabel()
+        self.label_budget = QLabel()
+        self.label_breakers = QLabel()
+        self.label_fetches = QLabel()
+        self.label_rss = QLabel()
+        summary_layout.addRow("进行中的请求：", self.label_in_flight)
+        summary_layout.addRow("缓存命中率：", self.label_hit_ratio)
+        summary_layout.addRow("调用预算：", self.label_budget)
+        summary_layout.addRow("熔断中的接口：", self.label_breakers)
+        summary_layout.addRow("界面请求：", self.label_fetches)
+        summary_layout.addRow("内存占用：", self.label_rss)
+        summary_group.setLayout(summary_layout)
+        layout.addWidget(summary_group)
+
+        # 各接口的调用次数、命中率与延迟分位数
+        endpoint_group = QGroupBox("接口延迟")
+        endpoint_layout = QVBoxLayout()
+        self.endpoint_table = self.create_table(["接口", "调用次数", "命中率", "p50", "p95"])
+        endpoint_layout.addWidget(self.endpoint_table)
+        endpoint_group.setLayout(endpoint_layout)
+        layout.addWidget(endpoint_group)
+
+        # 各窗口图表的渲染耗时
+        chart_group = QGroupBox("图表渲染")
+        chart_layout = QVBoxLayout()
+        self.chart_table = self.create_table(["窗口", "渲染次数", "平均", "p50", "p95"])
+        chart_layout.addWidget(self.chart_table)
+        chart_group.setLayout(chart_layout)
+        layout.addWidget(chart_group)
+
+        self.setLayout(layout)
+
+    @staticmethod
+    def create_table(headers):
+        table = QTableWidget()
+        table.setColumnCount(len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setStretchLastSection(True)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)  # 禁止编辑
+        table.verticalHeader().setVisible(False)  # 隐藏行号
+        return table
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start(HUD_REFRESH_INTERVAL)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        requests = self.metrics.get("skytracker_api_requests_total")
+        latency = self.metrics.get("skytracker_api_request_seconds")
+        in_flight = self.metrics.get("skytracker_api_in_flight")
+        render = self.metrics.get("skytracker_chart_render_seconds")
+
+        self.label_in_flight.setText(str(in_flight.value()) if in_flight else "-")
+        self.label_hit_ratio.setText(self.format_hit_ratio(requests))
+        self.label_budget.setText(self.format_budget())
+        self.label_breakers.setText(self.format_breakers())
+        stats = fetch_stats()
+        self.label_fetches.setText(f"累计 {stats['requests']} 次，取消 {stats['cancelled']} 次")
+        rss = process_rss()
+        self.label_rss.setText("无法获取" if rss is None else f"{rss / 1024 / 1024:.1f} MB")
+
+        rows = []
+        if latency is not None:
+            for labels in sorted(latency.labels(), key=lambda labels: labels["endpoint"]):
+                endpoint = labels["endpoint"]
+                total = requests.total(endpoint=endpoint) if requests else 0
+                rows.append([
+                    endpoint, str(total), self.format_ratio(requests, total, endpoint=endpoint),
+                    format_seconds(latency.quantile(0.5, endpoint=endpoint)),
+                    format_seconds(latency.quantile(0.95, endpoint=endpoint)),
+                ])
+        self.fill_table(self.endpoint_table, rows)
+
+        rows = []
+        if render is not None:
+            for labels in sorted(render.labels(), key=lambda labels: labels["widget"]):
+                _, total, count = render.snapshot(**labels)
+                rows.append([
+                    labels["widget"], str(count), format_seconds(total / count if count else None),
+                    format_seconds(render.quantile(0.5, **labels)), format_seconds(render.quantile(0.95, **labels)),
+                ])
+        self.fill_table(self.chart_table, rows)
+
+    @staticmethod
+    def fill_table(table, rows):
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                table.setItem(row, column, QTableWidgetItem(value))
+
+    @staticmethod
+    def format_ratio(requests, total, **labels):
+        """未访问网络的调用（内存、磁盘、旧数据与合并）所占比例"""
+        if not total:
+            return "-"
+        misses = requests.total(cache="miss", **labels)
+        return f"{(total - misses) / total:.1%}"
+
+    def format_hit_ratio(self, requests):
+        text = self.format_ratio(requests, requests.total()) if requests else "-"
+        cache = self.api_client.cache
+        if cache is not None:
+            stats = cache.stats()
+            text += f"（内存缓存 {stats['entries']} 条，{stats['bytes'] / 1024:.0f} KB）"
+        return text
+
+    def format_budget(self):
+        remaining = self.api_client.remaining_budget()
+        if remaining is None:
+            return "未限流"
+        return (f"本分钟 {format_limit(remaining['per_minute'])}，"
+                f"今日剩余 {format_limit(remaining['daily'])}（已用 {remaining['daily_used']}）")
+
+    def format_breakers(self):
+        opened = [
+            f"{path}（{state['retry_in']:.0f} 秒后重试）"
+            for path, state in self.api_client.breaker_states().items() if state["state"] == CircuitBreaker.OPEN
+        ]
+        return "，".join(opened) if opened else "无"
+
+
+if __name__ == "__main__":
+    from PyQt6.QtWidgets import QApplication
+    from utils.api_client import ApiClient
+    from utils.instrumentation import CHART_RENDER_SECONDS, MetricsHook
+    from utils.metrics import MetricsRegistry
+
+    app = QApplication(sys.argv)
+    metrics = MetricsRegistry()
+    metrics.register(CHART_RENDER_SECONDS)
+    api_client = ApiClient(hooks=[MetricsHook(metrics)])
+    api_client.set_api_key("your_api_key_here")  # 替换为实际的 API Key
+
+    window = PerfHud(api_client, metrics)
+    window.show()
+    sys.exit(app.exec())
@@ -1,8 +1,7 @@
 import sys
 from PyQt6.QtWidgets import QMainWindow, QVBoxLayout, QPushButton, QWidget, QGroupBox, QApplication
-from life_class.life_index_ui import LifestyleIndex
-from life_class.lunar_calendar_ui import LunarCalendar
-from life_class.vehicle_restriction_ui import VehicleRestriction
+
+# 子功能窗口在首次打开时才导入，缩短启动时间
 
 class LifestyleClass(QMainWindow):
     def __init__(self, api_client, parent=None):
@@ -84,16 +83,19 @@ class LifestyleClass(QMainWindow):
 
     def open_lifestyle_index(self):
         if not self.lifestyle_index_window:
+            from life_class.life_index_ui import LifestyleIndex
             self.lifestyle_index_window = LifestyleIndex(self.api_client)
         self.lifestyle_index_window.show()
 
     def open_lunar_calendar(self):
         if not self.lunar_calendar_window:
+            from life_class.lunar_calendar_ui import LunarCalendar
             self.lunar_calendar_window = LunarCalendar(self.api_client)
         self.lunar_calendar_window.show()
 
     def open_traffic_restriction(self):
         if not self.traffic_restriction_window:
+            from life_class.vehicle_restriction_ui import VehicleRestriction
             self.traffic_restriction_window = VehicleRestriction(self.api_client)
         self.traffic_restriction_window.show()
 
@@ -4,6 +4,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 
+from utils.async_fetch import AsyncFetcher
+
 class LifestyleIndex(QWidget):
     def __init__(self, api_client, parent=None):
         super().__init__(parent)
@@ -13,6 +15,7 @@ class LifestyleIndex(QWidget):
 
         self.data = []  # 保存生活指数数据
         self.current_index = 0  # 当前显示的生活指数索引
+        self.fetcher = AsyncFetcher(self)
 
         self.init_ui()
 
@@ -58,24 +61,25 @@ class LifestyleIndex(QWidget):
             QMessageBox.warning(self, "警告", "城市名称不能为空！")
             return
 
-        try:
-            # 获取生活指数数据
-            life_data = self.api_client.fetch_lifestyle_index(location=city)
-            if not life_data:
-                QMessageBox.information(self, "提示", "当前城市暂无生活指数数据！")
-                self.life_index_info.setText("当前城市暂无生活指数数据！")
-                self.prev_button.setEnabled(False)
-                self.next_button.setEnabled(False)
-                return
-
-            # 将生活指数转换为列表形式（排除日期字段）
-            self.data = [(key, value) for key, value in life_data.items() if key != "date"]
-            self.current_index = 0
-            self.update_life_index_info()
-            self.prev_button.setEnabled(True)
-            self.next_button.setEnabled(True)
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"获取生活指数数据失败: {e}")
+        self.fetcher.run(
+            self.api_client.fetch_lifestyle_index, location=city,
+            on_result=self.on_lifestyle_index_fetched, error_message="获取生活指数数据失败",
+        )
+
+    def on_lifestyle_index_fetched(self, life_data):
+        if not life_data:
+            QMessageBox.information(self, "提示", "当前城市暂无生活指数数据！")
+            self.life_index_info.setText("当前城市暂无生活指数数据！")
+            self.prev_button.setEnabled(False)
+            self.next_button.setEnabled(False)
+            return
+
+        # 将生活指数转换为列表形式（排除日期字段）
+        self.data = [(key, value) for key, value in life_data.items() if key != "date"]
+        self.current_index = 0
+        self.update_life_index_info()
+        self.prev_button.setEnabled(True)
+        self.next_button.setEnabled(True)
 
     def update_life_index_info(self):
         if not self.data:
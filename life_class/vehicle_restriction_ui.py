@@ -4,12 +4,15 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 
+from utils.async_fetch import AsyncFetcher
+
 class VehicleRestriction(QWidget):
     def __init__(self, api_client, parent=None):
         super().__init__(parent)
         self.api_client = api_client
         self.setWindowTitle("机动车尾号限行查询")
         self.setFixedSize(500, 550)
+        self.fetcher = AsyncFetcher(self)
 
         self.init_ui()
 
@@ -45,45 +48,46 @@ class VehicleRestriction(QWidget):
         self.setLayout(layout)
 
     def fetch_restriction_data(self, location_id):
-        try:
-            # 调用 API 获取数据
-            data = self.api_client.fetch_vehicle_restriction(location=location_id)
-            if not data:
-                QMessageBox.information(self, "提示", "当前城市暂无机动车尾号限行信息！")
-                self.info_label.setText("当前城市暂无机动车尾号限行信息！")
-                return
-
-            # 解析数据
-            restriction = data.get('restriction', {})
-            penalty = restriction.get('penalty', '暂无数据')
-            region = restriction.get('region', '暂无数据')
-            remarks = restriction.get('remarks', '暂无数据')
-            limits = restriction.get('limits', [])
-
-            # 格式化限行信息
-            limit_info = ""
-            for limit in limits:
-                date = limit.get('date', '暂无数据')
-                plates = ", ".join(limit.get('plates', []))
-                memo = limit.get('memo', '暂无数据')
-                limit_info += (
-                    f"<p><b>日期:</b> {date}<br>"
-                    f"<b>限行尾号:</b> {plates}<br>"
-                    f"<b>类型:</b> {memo}</p><hr>"
-                )
-
-            info = (
-                f"<p><b>处罚规定:</b> {penalty}</p>"
-                f"<p><b>限行区域:</b> {region}</p>"
-                f"<p><b>详细说明:</b> {remarks}</p>"
-                f"<h3>限行详情:</h3>"
-                f"{limit_info}"
+        self.fetcher.run(
+            self.api_client.fetch_vehicle_restriction, location=location_id,
+            on_result=self.on_restriction_data_fetched, error_message="获取机动车尾号限行数据失败",
+        )
+
+    def on_restriction_data_fetched(self, data):
+        if not data:
+            QMessageBox.information(self, "提示", "当前城市暂无机动车尾号限行信息！")
+            self.info_label.setText("当前城市暂无机动车尾号限行信息！")
+            return
+
+        # 解析数据
+        restriction = data.get('restriction', {})
+        penalty = restriction.get('penalty', '暂无数据')
+        region = restriction.get('region', '暂无数据')
+        remarks = restriction.get('remarks', '暂无数据')
+        limits = restriction.get('limits', [])
+
+        # 格式化限行信息
+        limit_info = ""
+        for limit in limits:
+            date = limit.get('date', '暂无数据')
+            plates = ", ".join(limit.get('plates', []))
+            memo = limit.get('memo', '暂无数据')
+            limit_info += (
+                f"<p><b>日期:</b> {date}<br>"
+                f"<b>限行尾号:</b> {plates}<br>"
+                f"<b>类型:</b> {memo}</p><hr>"
             )
 
-            self.info_label.setTextFormat(Qt.TextFormat.RichText)
-            self.info_label.setText(info)
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"获取机动车尾号限行数据失败: {e}")
+        info = (
+            f"<p><b>处罚规定:</b> {penalty}</p>"
+            f"<p><b>限行区域:</b> {region}</p>"
+            f"<p><b>详细说明:</b> {remarks}</p>"
+            f"<h3>限行详情:</h3>"
+            f"{limit_info}"
+        )
+
+        self.info_label.setTextFormat(Qt.TextFormat.RichText)
+        self.info_label.setText(info)
 
 if __name__ == "__main__":
     from PyQt6.QtWidgets import QApplication
@@ -1,6 +1,7 @@
 import sys
 from PyQt6.QtWidgets import QMainWindow, QVBoxLayout, QPushButton, QWidget, QGroupBox, QApplication
-from ocean_class.tide_forecast_ui import HourlyTides
+
+# 子功能窗口在首次打开时才导入，启动时不加载 matplotlib 等重量级依赖
 
 class OceanClass(QMainWindow):
     def __init__(self, api_client, parent=None):
@@ -70,6 +71,7 @@ class OceanClass(QMainWindow):
 
     def open_hourly_tides(self):
         if not self.hourly_tides_window:
+            from ocean_class.tide_forecast_ui import HourlyTides
             self.hourly_tides_window = HourlyTides(self.api_client)
         self.hourly_tides_window.show()
 
@@ -1,14 +1,13 @@
 import sys
 
-import matplotlib
+import numpy as np
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLineEdit, QPushButton, QMessageBox, QHBoxLayout
 )
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 
-matplotlib.rcParams['font.sans-serif'] = ['SimHei']
-matplotlib.rcParams['axes.unicode_minus'] = False
+from utils.async_fetch import AsyncFetcher
+from utils.charts import ChartCanvas
+from utils.timeseries import TimeSeries, to_float32
 
 class HourlyTides(QWidget):
     def __init__(self, api_client, parent=None):
@@ -17,8 +16,11 @@ class HourlyTides(QWidget):
         self.setWindowTitle("逐小时潮汐预报")
         self.setFixedSize(800, 800)
 
-        self.data = []
+        self.series = None  # 所有天的逐小时潮高拼接成的时间序列
+        self.day_bounds = []  # 每天在 series 中的起止位置
         self.current_day_index = 0
+        self.ylim = None  # 所有天共用的潮高范围，翻页时坐标轴不变，只需重绘折线
+        self.fetcher = AsyncFetcher(self)
 
         self.init_ui()
 
@@ -33,9 +35,9 @@ class HourlyTides(QWidget):
         self.fetch_button.clicked.connect(self.fetch_tides_data)
         layout.addWidget(self.fetch_button)
 
-        self.canvas = FigureCanvas(Figure(figsize=(8, 4)))
+        self.canvas = ChartCanvas(figsize=(8, 4))
         layout.addWidget(self.canvas)
-        self.ax = self.canvas.figure.add_subplot(111)
+        self.tide_chart = self.canvas.add_chart(111, "逐小时潮汐高度", "时间 (小时)", "潮高 (cm)", [("潮高", None)])
 
         button_layout = QHBoxLayout()
         # 上一天按钮
@@ -58,48 +60,66 @@ class HourlyTides(QWidget):
             QMessageBox.warning(self, "警告", "港口名称不能为空！")
             return
 
-        try:
-            # 调用 API 获取数据
-            data = self.api_client.fetch_tides_forecast(port)
-            if not data:
-                QMessageBox.information(self, "提示", "当前暂无潮汐预报数据！")
-                return
-
-            # 解析数据
-            self.data = data.get('data', [])
-            if not self.data:
-                QMessageBox.information(self, "提示", "当前港口暂无潮汐数据！")
-                return
-
-            self.current_day_index = 0
-            self.display_tides_for_day()
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"获取潮汐预报数据失败: {e}")
+        self.fetcher.run(
+            self.api_client.fetch_tides_forecast, port,
+            on_result=self.on_tides_data_fetched, error_message="获取潮汐预报数据失败",
+        )
 
-    def display_tides_for_day(self):
-        if not self.data:
+    def on_tides_data_fetched(self, data):
+        if not data:
+            QMessageBox.information(self, "提示", "当前暂无潮汐预报数据！")
             return
 
-        day_data = self.data[self.current_day_index]
-        tide_heights = day_data.get('tide', [])
+        # 解析数据
+        days = data.get('data', [])
+        if not days:
+            QMessageBox.information(self, "提示", "当前港口暂无潮汐数据！")
+            return
 
-        # 转换潮汐高度为浮点数
+        # 转换潮汐高度为浮点数，只在获取后解析一次
         try:
-            tide_heights = [float(height) for height in tide_heights]
+            self.series, self.day_bounds = self.build_tide_series(days)
         except ValueError:
             QMessageBox.critical(self, "错误", "潮汐高度数据格式有误，无法转换为数值！")
             return
 
-        self.plot_tide_chart(tide_heights)
+        self.current_day_index = 0
+        self.ylim = self.tide_range()
+        self.display_tides_for_day()
+
+    @staticmethod
+    def build_tide_series(days):
+        """将每天的逐小时潮高拼接为一个时间序列，返回 (序列, 每天的起止位置)"""
+        timestamps, heights, day_bounds = [], [], []
+        for day in days:
+            tide = day.get('tide', [])
+            start = np.datetime64(day['date'][:10], "h") if day.get('date') else np.datetime64("NaT", "h")
+            timestamps.append(start + np.arange(len(tide)))
+            heights.append(to_float32(tide))
+            offset = day_bounds[-1][1] if day_bounds else 0
+            day_bounds.append((offset, offset + len(tide)))
+        series = TimeSeries(np.concatenate(timestamps), {"height": np.concatenate(heights)})
+        return series, day_bounds
+
+    def tide_range(self):
+        """所有天潮高的公共显示范围，没有有效数据时返回 None（按当天数据自动缩放）"""
+        heights = self.series['height']
+        if not np.isfinite(heights).any():
+            return None
+        low, high = float(np.nanmin(heights)), float(np.nanmax(heights))
+        margin = (high - low) * 0.05 or 1
+        return low - margin, high + margin
+
+    def display_tides_for_day(self):
+        if not self.series:
+            return
+
+        start, end = self.day_bounds[self.current_day_index]
+        self.plot_tide_chart(self.series['height'][start:end])
 
     def plot_tide_chart(self, tide_heights):
-        self.ax.clear()
-        self.ax.plot(range(len(tide_heights)), tide_heights, marker='o')
-        self.ax.set_title("逐小时潮汐高度")
-        self.ax.set_xlabel("时间 (小时)")
-        self.ax.set_ylabel("潮高 (cm)")
-        self.ax.grid(True)
-        self.canvas.draw()
+        self.tide_chart.set_data(range(len(tide_heights)), [tide_heights], ylim=self.ylim)
+        self.canvas.render()
 
     def show_previous_day(self):
         if self.current_day_index > 0:
@@ -109,7 +129,7 @@ class HourlyTides(QWidget):
             QMessageBox.information(self, "提示", "已经是第一天的数据！")
 
     def show_next_day(self):
-        if self.current_day_index < len(self.data) - 1:
+        if self.current_day_index < len(self.day_bounds) - 1:
             self.current_day_index += 1
             self.display_tides_for_day()
         else:
@@ -0,0 +1,42 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+import requests
+
+from utils.api_client import ApiClient
+from utils.disk_cache import DiskCache
+from utils.response_cache import DEFAULT_TTL
+
+
+def make_response(data, status=200):
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(data).encode("utf-8")
+    response.elapsed = timedelta(milliseconds=1)
+    return response
+
+
+class DiskCacheStoreTest(unittest.TestCase):
+    def test_unregistered_path_without_memory_cache(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        disk_cache = DiskCache(os.path.join(directory.name, "cache.sqlite3"))
+        api_client = ApiClient(cache=False, disk_cache=disk_cache)
+        api_client.set_api_key("test")
+        self.addCleanup(api_client.close)
+
+        data = {"results": [{"value": 1}]}
+        with mock.patch.object(api_client.session, "get", return_value=make_response(data)):
+            self.assertEqual(api_client.get("/custom/unregistered.json", {"q": "a"}), data)
+
+        body, _, ttl, _ = disk_cache.get("/custom/unregistered.json", {"q": "a"})
+        self.assertEqual(body, data)
+        self.assertEqual(ttl, DEFAULT_TTL)
+
+
+if __name__ == "__main__":
+    unittest.main()
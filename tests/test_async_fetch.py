@@ -0,0 +1,56 @@
+import os
+import time
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from utils.async_fetch import AsyncFetcher
+
+
+class AsyncFetcherTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.window = QWidget()
+        self.window.setWindowTitle("测试")
+        self.thread_pool = QThreadPool()
+        self.fetcher = AsyncFetcher(self.window, self.thread_pool)
+        self.results = []
+
+    def tearDown(self):
+        self.thread_pool.waitForDone()
+        self.app.processEvents()
+
+    def run_fetch(self, value):
+        return self.fetcher.run(lambda: value, on_result=self.results.append, error_message="失败")
+
+    def test_cancel_after_worker_finished(self):
+        self.run_fetch(1)
+        self.thread_pool.waitForDone()
+        time.sleep(0.3)  # run 已返回，finished 信号尚未送达
+
+        self.run_fetch(2)  # 取代上一个请求时不应访问已结束的 worker
+        self.thread_pool.waitForDone()
+        self.app.processEvents()
+
+        self.assertEqual(self.results, [2])
+        self.assertEqual(self.fetcher.stats()["in_flight"], 0)
+        self.assertEqual(self.window.windowTitle(), "测试")
+
+    def test_close_cancels_pending_results(self):
+        self.run_fetch(1)
+        self.thread_pool.waitForDone()
+        self.window.close()
+        self.app.processEvents()
+
+        self.assertEqual(self.results, [])
+        self.assertEqual(self.fetcher.stats()["in_flight"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import threading
+import unittest
+from unittest import mock
+
+from utils.api_client import ApiClient
+
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        self.api_client = ApiClient(cache=False)
+        self.api_client.set_api_key("test")
+        self.addCleanup(self.api_client.close)
+        self.last_done = threading.Event()
+
+    def fake_call(self, name, location, **kwargs):
+        # a 等到 c 完成后才返回，使完成顺序与输入顺序不同
+        if location == "a":
+            self.assertTrue(self.last_done.wait(5))
+        if location == "b":
+            raise ValueError("bad location")
+        if location == "c":
+            self.last_done.set()
+        return {"name": name, "location": location, **kwargs}
+
+    def test_iter_many_yields_in_completion_order(self):
+        with mock.patch.object(self.api_client, "call", side_effect=self.fake_call):
+            results = list(self.api_client.iter_many(
+                "fetch_current_weather", [{"location": "a"}, {"location": "b"}, {"location": "c"}], max_workers=3))
+
+        self.assertEqual(results[-1].index, 0)
+        self.assertEqual(sorted(result.index for result in results), [0, 1, 2])
+        for result in results:
+            self.assertEqual(result.params["location"], "abc"[result.index])
+
+    def test_fetch_many_keeps_input_order_and_captures_errors(self):
+        with mock.patch.object(self.api_client, "call", side_effect=self.fake_call):
+            results = self.api_client.fetch_current_weather_many(["a", "b", "c"], max_workers=3, unit="f")
+
+        self.assertEqual([result.index for result in results], [0, 1, 2])
+        self.assertEqual([result.ok for result in results], [True, False, True])
+        self.assertEqual(results[0].data, {"name": "fetch_current_weather", "location": "a", "unit": "f"})
+        self.assertIsNone(results[1].data)
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertEqual(results[1].params, {"location": "b", "unit": "f"})
+        self.assertEqual(results[2].data["location"], "c")
+
+    def test_unknown_endpoint_fails_the_whole_batch(self):
+        with self.assertRaises(ValueError):
+            self.api_client.fetch_many("fetch_nothing", [{"location": "a"}])
+
+    def test_empty_batch(self):
+        self.assertEqual(self.api_client.fetch_many("fetch_current_weather", []), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import io
+import json
+import os
+import socket
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from unittest import mock
+
+from utils import cli
+
+
+def unused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class CliOutputTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output = os.path.join(directory.name, "out.jsonl")
+
+    def test_error_records_do_not_contain_api_key(self):
+        argv = ["fetch_current_weather", "beijing", "-k", "secret-key", "-o", self.output,
+                "--base-url", f"http://127.0.0.1:{unused_port()}/v3"]
+        with mock.patch("utils.resilience.RetryPolicy.delay", return_value=0):
+            self.assertEqual(cli.main(argv), 1)
+
+        with open(self.output, encoding="utf-8") as f:
+            record = json.loads(f.readline())
+        self.assertFalse(record["ok"])
+        self.assertIn("ConnectionError", record["error"])
+        self.assertIn("key=***", record["error"])
+        self.assertNotIn("secret-key", json.dumps(record))
+
+
+class CliArgumentsTest(unittest.TestCase):
+    def assertUsageError(self, argv, message=None):
+        """参数有误时应在发起任何请求前以退出码 2 结束"""
+        stderr = io.StringIO()
+        with redirect_stderr(stderr), mock.patch.object(cli, "ApiClient") as api_client, \
+                self.assertRaises(SystemExit) as raised:
+            cli.main(["-k", "test", *argv])
+        self.assertEqual(raised.exception.code, 2)
+        api_client.assert_not_called()
+        if message:
+            self.assertIn(message, stderr.getvalue())
+
+    def test_workers_must_be_positive_int(self):
+        for value in ("0", "-1", "x", "1.5"):
+            with self.subTest(value=value):
+                self.assertUsageError(["fetch_current_weather", "beijing", "-j", value])
+
+    def test_target_param_rejected_via_param(self):
+        self.assertUsageError(["fetch_current_weather", "beijing", "-p", "location=shanghai"],
+                              "location 应作为目标传入")
+
+    def test_invalid_params(self):
+        self.assertUsageError(["fetch_current_weather", "beijing", "-p", "days=3"], "不支持参数: days")
+        self.assertUsageError(["fetch_current_weather", "beijing", "-p", "unit"], "name=value")
+        self.assertUsageError(["fetch_current_weather"], "需要至少一个 location")
+        self.assertUsageError(["fetch_nothing", "beijing"], "未知的接口")
+
+    def test_offline_requires_cache_db(self):
+        self.assertUsageError(["fetch_current_weather", "beijing", "--offline"], "--cache-db")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import inspect
+import unittest
+
+from utils.api_client import ApiClient
+from utils.batch import many_method_name
+from utils.endpoints import ENDPOINTS, ENDPOINTS_BY_PATH, REQUIRED, get_endpoint, redact_api_key
+
+
+class EndpointTest(unittest.TestCase):
+    def test_bind_applies_defaults(self):
+        endpoint = get_endpoint("fetch_current_weather")
+        self.assertEqual(endpoint.bind("beijing"), {"location": "beijing", "language": "zh-Hans", "unit": "c"})
+        self.assertEqual(endpoint.bind("beijing", unit="f")["unit"], "f")
+
+    def test_bind_renames_to_wire_names(self):
+        self.assertEqual(get_endpoint("search_city").bind("北京"), {"q": "北京"})
+        self.assertEqual(get_endpoint("search_city").bind(query="北京"), {"q": "北京"})
+
+    def test_bind_rejects_invalid_arguments(self):
+        endpoint = get_endpoint("fetch_current_weather")
+        for args, kwargs in [((), {}), (("beijing",), {"days": 3}), (("a", "b", "c", "d"), {})]:
+            with self.subTest(args=args, kwargs=kwargs), self.assertRaises(TypeError):
+                endpoint.bind(*args, **kwargs)
+
+    def test_normalize_fills_defaults_and_keeps_explicit_values(self):
+        endpoint = ENDPOINTS_BY_PATH["/weather/daily.json"]
+        self.assertEqual(endpoint.normalize({"location": "beijing", "days": 3}), {
+            "location": "beijing", "days": 3, "language": "zh-Hans", "unit": "c", "start": 0,
+        })
+        self.assertEqual(endpoint.normalize({"location": "beijing"}),
+                         endpoint.normalize(endpoint.bind("beijing")))
+        self.assertEqual(ENDPOINTS_BY_PATH["/location/search.json"].normalize({"q": "北京"}), {"q": "北京"})
+
+    def test_family_defaults_to_first_path_segment(self):
+        self.assertEqual(get_endpoint("fetch_current_air_quality").family, "air")
+        self.assertEqual(get_endpoint("search_city").family, "location")
+
+    def test_unknown_endpoint(self):
+        with self.assertRaises(ValueError):
+            get_endpoint("fetch_nothing")
+
+    def test_redact_api_key(self):
+        text = "400 Client Error for url: http://h/v3/weather/now.json?location=x&key=SECRET&unit=c"
+        self.assertEqual(redact_api_key(text),
+                         "400 Client Error for url: http://h/v3/weather/now.json?location=x&key=***&unit=c")
+
+
+class GeneratedMethodTest(unittest.TestCase):
+    def test_methods_match_registry_signatures(self):
+        for name, endpoint in ENDPOINTS.items():
+            with self.subTest(name=name):
+                method = getattr(ApiClient, name)
+                parameters = list(inspect.signature(method).parameters.values())
+                self.assertEqual(parameters[0].name, "self")
+                self.assertEqual(inspect.Signature(parameters[1:]), endpoint.signature)
+                self.assertEqual(method.__doc__, endpoint.doc)
+
+    def test_many_methods_only_for_location_endpoints(self):
+        for name, endpoint in ENDPOINTS.items():
+            with self.subTest(name=name):
+                has_location = any(param == "location" and default is REQUIRED for param, default in endpoint.params)
+                self.assertEqual(hasattr(ApiClient, f"{name}_many"), has_location)
+                self.assertEqual(many_method_name(endpoint), f"{name}_many" if has_location else None)
+        self.assertEqual(list(inspect.signature(ApiClient.fetch_current_weather_many).parameters),
+                         ["self", "locations", "max_workers", "kwargs"])
+
+
+if __name__ == "__main__":
+    unittest.main()
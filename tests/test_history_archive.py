@@ -0,0 +1,37 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from utils.history_archive import HistoryArchive
+from utils.timeseries import TimeSeries
+
+
+def hourly(start, hours):
+    timestamps = np.datetime64(start, "s") + np.arange(hours) * np.timedelta64(1, "h")
+    return TimeSeries(timestamps, {"temperature": np.arange(hours, dtype=np.float32)})
+
+
+class HistoryArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        self.archive = HistoryArchive(self.root.name, chunk_rows=5)
+
+    def test_first_append_longer_than_chunk_rows(self):
+        added = self.archive.append("weather", "beijing", hourly("2025-01-01T00:00:00", 12))
+        self.assertEqual(added, 12)
+
+        series = self.archive.query("weather", "beijing")
+        self.assertEqual(len(series), 12)
+        np.testing.assert_array_equal(series["temperature"], np.arange(12, dtype=np.float32))
+
+    def test_duplicate_hours_are_ignored(self):
+        self.archive.append("weather", "beijing", hourly("2025-01-01T00:00:00", 3))
+        added = self.archive.append("weather", "beijing", hourly("2025-01-01T02:00:00", 3))
+        self.assertEqual(added, 2)
+        self.assertEqual(len(self.archive.query("weather", "beijing")), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
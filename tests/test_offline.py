@@ -0,0 +1,39 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from utils.api_client import ApiClient
+from utils.disk_cache import DiskCache
+
+WEATHER = {"results": [{"location": {"name": "北京"}, "now": {"temperature": "3"}, "last_update": "2025-01-01T08:00:00+08:00"}]}
+
+
+class OfflineModeTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.now = [1_000_000.0]
+        self.disk_cache = DiskCache(os.path.join(directory.name, "cache.sqlite3"), clock=lambda: self.now[0])
+        self.api_client = ApiClient(cache=False, disk_cache=self.disk_cache, offline=True)
+        self.api_client.set_api_key("test")
+        self.addCleanup(self.api_client.close)
+
+        self.disk_cache.put("/weather/now.json", {"location": "beijing", "language": "zh-Hans", "unit": "c"},
+                            json.dumps(WEATHER), 60, None)
+        self.now[0] += 3600  # 条目早已过期
+
+    def test_serves_stale_entry_without_network(self):
+        with mock.patch.object(self.api_client.session, "get", side_effect=AssertionError("不应访问网络")):
+            data = self.api_client.fetch_current_weather("beijing")
+        self.assertEqual(data, WEATHER)
+
+    def test_missing_entry_raises_without_network(self):
+        with mock.patch.object(self.api_client.session, "get", side_effect=AssertionError("不应访问网络")):
+            with self.assertRaises(RuntimeError):
+                self.api_client.fetch_current_weather("shanghai")
+
+
+if __name__ == "__main__":
+    unittest.main()
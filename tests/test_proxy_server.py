@@ -0,0 +1,69 @@
+import json
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+from tests.test_api_client import make_response
+from utils.api_client import ApiClient
+from utils.metrics import MetricsRegistry
+from utils.proxy_server import ProxyServer
+
+WEATHER = {"results": [{"location": {"name": "北京"}, "now": {"temperature": "3"}}]}
+
+
+class ProxyServerTest(unittest.TestCase):
+    def setUp(self):
+        self.api_client = ApiClient()
+        self.api_client.set_api_key("upstream-key")
+        self.addCleanup(self.api_client.close)
+        patcher = mock.patch.object(self.api_client.session, "get", return_value=make_response(WEATHER))
+        self.upstream = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def start_proxy(self, access_keys=()):
+        server = ProxyServer(self.api_client, port=0, access_keys=access_keys, metrics=MetricsRegistry())
+        server.start()
+        self.addCleanup(server.stop)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    def get(self, url):
+        try:
+            with urllib.request.urlopen(url) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+    def test_explicit_defaults_share_one_upstream_call(self):
+        base = self.start_proxy()
+        for query in ("location=beijing", "location=beijing&language=zh-Hans", "unit=c&location=beijing"):
+            status, body = self.get(f"{base}/v3/weather/now.json?{query}")
+            self.assertEqual(status, 200)
+            self.assertEqual(json.loads(body), WEATHER)
+        self.assertEqual(self.upstream.call_count, 1)
+
+        self.get(f"{base}/v3/weather/now.json?location=beijing&unit=f")
+        self.assertEqual(self.upstream.call_count, 2)
+
+    def test_client_key_is_not_forwarded(self):
+        base = self.start_proxy()
+        self.get(f"{base}/v3/weather/now.json?location=beijing&key=client-key")
+        self.assertEqual(self.upstream.call_args.kwargs["params"]["key"], "upstream-key")
+
+    def test_access_keys_guard_every_route(self):
+        base = self.start_proxy(access_keys=["allowed"])
+        for route in ("/stats", "/metrics", "/v3/weather/now.json?location=beijing"):
+            separator = "&" if "?" in route else "?"
+            self.assertEqual(self.get(f"{base}{route}")[0], 403, route)
+            self.assertEqual(self.get(f"{base}{route}{separator}key=wrong")[0], 403, route)
+            self.assertEqual(self.get(f"{base}{route}{separator}key=allowed")[0], 200, route)
+        self.assertEqual(self.upstream.call_count, 1)
+
+    def test_unknown_path(self):
+        base = self.start_proxy()
+        self.assertEqual(self.get(f"{base}/v3/unknown.json")[0], 404)
+        self.upstream.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from utils.rate_limiter import DailyQuota, QuotaExceededError, RateLimiter, TokenBucket, family_for
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_reserve_queues_callers_in_order(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, capacity=2, clock=clock)
+        self.assertEqual([bucket.reserve() for _ in range(4)], [0.0, 0.0, 1.0, 2.0])
+        self.assertEqual(bucket.available(), 0.0)
+
+        clock.now = 10  # 补充后不超过容量
+        self.assertEqual(bucket.available(), 2.0)
+
+
+class RateLimiterTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.waits = []
+
+    def limiter(self, **kwargs):
+        return RateLimiter(clock=self.clock, sleep=self.waits.append, **kwargs)
+
+    def test_per_minute_limit(self):
+        limiter = self.limiter(per_minute=2)
+        waits = [limiter.reserve("k", "/weather/now.json") for _ in range(3)]
+        self.assertEqual(waits, [0.0, 0.0, 30.0])
+        self.assertEqual(limiter.queued, 1)
+        self.assertEqual(limiter.reserve("other", "/weather/now.json"), 0.0)  # 按 Key 分别限流
+
+    def test_acquire_sleeps_for_reserved_wait(self):
+        limiter = self.limiter(per_minute=1)
+        limiter.acquire("k", "/weather/now.json")
+        limiter.acquire("k", "/weather/now.json")
+        self.assertEqual(self.waits, [60.0])
+
+    def test_family_limit_applies_to_its_family_only(self):
+        limiter = self.limiter(family_limits={"air": 1})
+        self.assertEqual(family_for("/air/now.json"), "air")
+        self.assertEqual(limiter.reserve("k", "/air/now.json"), 0.0)
+        self.assertEqual(limiter.reserve("k", "/air/now.json"), 60.0)
+        self.assertEqual(limiter.reserve("k", "/weather/now.json"), 0.0)
+
+    def test_remaining_reports_unlimited_as_none(self):
+        limiter = self.limiter(per_minute=10, family_limits={"air": 5, "weather": None}, daily_quota=3)
+        limiter.reserve("k", "/air/now.json")
+        self.assertEqual(limiter.remaining("k"), {
+            "per_minute": 9,
+            "families": {"air": 4, "weather": None},
+            "daily": 2,
+            "daily_used": 1,
+        })
+        self.assertEqual(self.limiter().remaining("k"),
+                         {"per_minute": None, "families": {}, "daily": None, "daily_used": 0})
+
+    def test_daily_quota_exceeded(self):
+        limiter = self.limiter(daily_quota=2)
+        limiter.reserve("k", "/weather/now.json")
+        limiter.reserve("k", "/weather/now.json")
+        with self.assertRaises(QuotaExceededError):
+            limiter.reserve("k", "/weather/now.json")
+        self.assertEqual(limiter.remaining("k")["daily"], 0)
+        self.assertEqual(limiter.remaining("other")["daily"], 2)
+
+
+class DailyQuotaTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "quota.json")
+        self.day = [date(2025, 1, 1)]
+
+    def quota(self, limit=2, flush_every=1):
+        return DailyQuota(limit, self.path, flush_every=flush_every, today=lambda: self.day[0])
+
+    def test_rollover_resets_counts(self):
+        quota = self.quota()
+        quota.consume("k")
+        quota.consume("k")
+        with self.assertRaises(QuotaExceededError):
+            quota.consume("k")
+
+        self.day[0] = date(2025, 1, 2)
+        self.assertEqual(quota.remaining("k"), 2)
+        quota.consume("k")
+        self.assertEqual(quota.used("k"), 1)
+
+    def test_counts_persist_for_the_same_day_only(self):
+        quota = self.quota(flush_every=20)
+        quota.consume("k")
+        quota.flush()
+        self.assertEqual(self.quota().used("k"), 1)
+
+        with open(self.path, encoding="utf-8") as f:
+            self.assertNotIn("k", json.load(f)["counts"])  # 只保存 Key 的摘要
+
+        self.day[0] = date(2025, 1, 2)
+        self.assertEqual(self.quota().used("k"), 0)
+
+    def test_unlimited_quota_only_counts(self):
+        quota = self.quota(limit=None)
+        for _ in range(5):
+            quota.consume("k")
+        self.assertIsNone(quota.remaining("k"))
+        self.assertEqual(quota.used("k"), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import socket
+import unittest
+
+import requests
+
+from utils.api_client import ApiClient
+from utils.rate_limiter import QuotaExceededError, RateLimiter
+from utils.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+def unused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_release_trial_allows_next_probe(self):
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=lambda: now[0])
+        breaker.record_failure()
+        now[0] = 10.0
+
+        breaker.before_call()  # 半开状态下的试探请求
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        breaker.release_trial()
+        breaker.before_call()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+
+class HalfOpenProbeTest(unittest.TestCase):
+    def test_quota_exceeded_during_half_open_probe(self):
+        rate_limiter = RateLimiter(daily_quota=1)
+        api_client = ApiClient(cache=False, rate_limiter=rate_limiter, retry_policy=RetryPolicy(max_retries=0),
+                               failure_threshold=1, recovery_timeout=0, base_url=f"http://127.0.0.1:{unused_port()}/v3")
+        api_client.set_api_key("test")
+        self.addCleanup(api_client.close)
+
+        # 连接失败使熔断器打开，同时用完当日配额
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            api_client.fetch_current_weather("beijing")
+
+        # 半开状态下的试探请求因配额用尽而中止，不应一直占用试探名额
+        with self.assertRaises(QuotaExceededError):
+            api_client.fetch_current_weather("beijing")
+
+        rate_limiter.quota.limit = None  # 配额重置
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            api_client.fetch_current_weather("beijing")
+        self.assertEqual(api_client.breaker_states()["/weather/now.json"]["rejected"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+from unittest import mock
+
+from tests.test_api_client import make_response
+from utils.api_client import ApiClient
+from utils.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ResponseCache(ttls={"/a.json": 60}, default_ttl=30, max_bytes=100, clock=self.clock)
+
+    def test_make_key_ignores_order_value_types_and_api_key(self):
+        key = ResponseCache.make_key("/a.json", {"location": "beijing", "days": 3, "key": "secret"})
+        self.assertEqual(key, ResponseCache.make_key("/a.json", {"days": "3", "location": "beijing"}))
+        self.assertNotEqual(key, ResponseCache.make_key("/b.json", {"days": "3", "location": "beijing"}))
+        self.assertNotIn("secret", repr(key))
+
+    def test_entries_expire_after_ttl(self):
+        self.cache.put("/a.json", {"q": 1}, "a", 10)
+        self.cache.put("/other.json", {"q": 1}, "b", 10)  # 未配置的接口使用 default_ttl
+
+        self.clock.now = 29.9
+        self.assertEqual(self.cache.get("/a.json", {"q": 1}), "a")
+        self.assertEqual(self.cache.get("/other.json", {"q": 1}), "b")
+        self.clock.now = 30
+        self.assertIsNone(self.cache.get("/other.json", {"q": 1}))
+        self.clock.now = 60
+        self.assertIsNone(self.cache.get("/a.json", {"q": 1}))
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_stale_entries_within_grace(self):
+        cache = ResponseCache(ttls={"/a.json": 60}, stale_grace=30, clock=self.clock)
+        cache.put("/a.json", {}, "a", 10)
+        self.clock.now = 70
+        self.assertIsNone(cache.get("/a.json", {}))
+        self.assertEqual(cache.get_stale("/a.json", {}), "a")
+        self.clock.now = 90
+        self.assertIsNone(cache.get_stale("/a.json", {}))
+
+    def test_evicts_least_recently_used_over_max_bytes(self):
+        for name in "abcd":
+            self.cache.put("/a.json", {"q": name}, name, 30)
+        self.assertEqual(self.cache.stats()["entries"], 3)
+        self.assertIsNone(self.cache.get("/a.json", {"q": "a"}))
+
+        self.cache.get("/a.json", {"q": "b"})  # b 变为最近使用
+        self.cache.put("/a.json", {"q": "e"}, "e", 30)
+        self.assertEqual(self.cache.get("/a.json", {"q": "b"}), "b")
+        self.assertIsNone(self.cache.get("/a.json", {"q": "c"}))
+        self.assertEqual(self.cache.stats()["evictions"], 2)
+        self.assertLessEqual(self.cache.stats()["bytes"], 100)
+
+    def test_oversized_and_zero_ttl_entries_are_not_stored(self):
+        self.cache.put("/a.json", {"q": 1}, "big", 101)
+        self.cache.put("/a.json", {"q": 2}, "x", 10, ttl=0)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_overwrite_updates_size(self):
+        self.cache.put("/a.json", {}, "a", 40)
+        self.cache.put("/a.json", {}, "b", 20)
+        self.assertEqual(self.cache.stats()["bytes"], 20)
+        self.assertEqual(self.cache.get("/a.json", {}), "b")
+
+    def test_invalidate_by_path(self):
+        self.cache.put("/a.json", {}, "a", 10)
+        self.cache.put("/b.json", {}, "b", 10)
+        self.cache.invalidate("/a.json")
+        self.assertIsNone(self.cache.get("/a.json", {}))
+        self.assertEqual(self.cache.get("/b.json", {}), "b")
+
+
+class ApiClientCacheTest(unittest.TestCase):
+    def test_equivalent_calls_share_one_entry(self):
+        api_client = ApiClient()
+        api_client.set_api_key("test")
+        self.addCleanup(api_client.close)
+        with mock.patch.object(api_client.session, "get", return_value=make_response({"results": []})) as get:
+            api_client.fetch_current_weather("beijing")
+            api_client.fetch_current_weather(location="beijing", language="zh-Hans")
+            api_client.fetch_current_weather("beijing", unit="f")
+        self.assertEqual(get.call_count, 2)
+        self.assertEqual(api_client.cache.stats()["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from tests.test_api_client import make_response
+from utils.api_client import ApiClient
+from utils.single_flight import AsyncSingleFlight, SingleFlight
+
+CALLERS = 5
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("等待超时")
+        time.sleep(0.001)
+
+
+class SingleFlightTest(unittest.TestCase):
+    def setUp(self):
+        self.flight = SingleFlight()
+        self.release = threading.Event()
+        self.executions = 0
+
+    def run_concurrently(self, fn):
+        """CALLERS 个线程同时以同一 key 调用，全部到达后才让执行中的 fn 返回"""
+        def call():
+            try:
+                return self.flight.do("key", fn)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(CALLERS) as executor:
+            futures = [executor.submit(call) for _ in range(CALLERS)]
+            wait_until(lambda: self.flight.stats()["coalesced"] == CALLERS - 1)
+            self.release.set()
+            return [future.result() for future in futures]
+
+    def test_concurrent_callers_share_one_call(self):
+        def fn():
+            self.executions += 1
+            self.release.wait()
+            return object()
+
+        results = self.run_concurrently(fn)
+        self.assertEqual(self.executions, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(self.flight.stats(), {"calls": 1, "coalesced": CALLERS - 1, "in_flight": 0})
+
+    def test_error_propagates_to_every_caller(self):
+        error = ValueError("上游错误")
+
+        def fn():
+            self.executions += 1
+            self.release.wait()
+            raise error
+
+        results = self.run_concurrently(fn)
+        self.assertEqual(self.executions, 1)
+        self.assertTrue(all(result is error for result in results))
+
+    def test_completed_call_is_not_reused(self):
+        self.assertEqual(self.flight.do("key", lambda: 1), 1)
+        self.assertEqual(self.flight.do("key", lambda: 2), 2)
+        with self.assertRaises(KeyError):
+            self.flight.do("key", lambda: {}["missing"])
+        self.assertEqual(self.flight.do("key", lambda: 3), 3)
+        self.assertEqual(self.flight.stats()["calls"], 4)
+
+    def test_different_keys_do_not_coalesce(self):
+        self.assertEqual([self.flight.do(key, lambda key=key: key) for key in "ab"], ["a", "b"])
+        self.assertEqual(self.flight.stats()["coalesced"], 0)
+
+
+class AsyncSingleFlightTest(unittest.TestCase):
+    def test_concurrent_tasks_share_one_call(self):
+        executions = []
+
+        async def fetch():
+            executions.append(1)
+            await asyncio.sleep(0.01)
+            return "data"
+
+        async def main():
+            flight = AsyncSingleFlight()
+            results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(CALLERS)))
+            return results, flight.stats()
+
+        results, stats = asyncio.run(main())
+        self.assertEqual(results, ["data"] * CALLERS)
+        self.assertEqual(len(executions), 1)
+        self.assertEqual(stats["coalesced"], CALLERS - 1)
+
+
+class ApiClientCoalescingTest(unittest.TestCase):
+    def test_concurrent_identical_calls_reach_upstream_once(self):
+        api_client = ApiClient()
+        api_client.set_api_key("test")
+        self.addCleanup(api_client.close)
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            release.wait()
+            return make_response({"results": []})
+
+        with mock.patch.object(api_client.session, "get", side_effect=slow_get) as get:
+            with ThreadPoolExecutor(CALLERS) as executor:
+                futures = [executor.submit(api_client.fetch_current_weather, "beijing") for _ in range(CALLERS)]
+                wait_until(lambda: api_client.single_flight.stats()["coalesced"] == CALLERS - 1)
+                release.set()
+                results = [future.result() for future in futures]
+
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(results, [{"results": []}] * CALLERS)
+
+
+if __name__ == "__main__":
+    unittest.main()
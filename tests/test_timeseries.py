@@ -0,0 +1,119 @@
+import math
+import unittest
+
+import numpy as np
+
+from utils.timeseries import TimeSeries, clock_to_hours, normalize_hourly, to_datetime64, to_float32
+
+
+def stamps(*values):
+    return np.array(values, dtype="datetime64[s]")
+
+
+class ConvertersTest(unittest.TestCase):
+    def test_to_datetime64_drops_offset_and_keeps_local_time(self):
+        result = to_datetime64(["2025-01-01T08:00:00+08:00", "2025-01-01T09:30:00Z", "2025-01-02", None])
+        self.assertEqual(result.tolist()[:3], stamps("2025-01-01T08:00", "2025-01-01T09:30", "2025-01-02").tolist())
+        self.assertTrue(np.isnat(result[3]))
+
+    def test_to_float32(self):
+        result = to_float32(["1.5", 2, None, ""])
+        self.assertEqual(result.dtype, np.float32)
+        self.assertEqual(result[:2].tolist(), [1.5, 2.0])
+        self.assertTrue(np.isnan(result[2:]).all())
+        with self.assertRaises(ValueError):
+            to_float32(["abc"])
+
+    def test_clock_to_hours(self):
+        result = clock_to_hours(["06:30", "", "bad", "18:00"])
+        self.assertEqual(result[0], 6.5)
+        self.assertTrue(np.isnan(result[1:3]).all())
+        self.assertEqual(result[3], 18.0)
+
+
+class TimeSeriesTest(unittest.TestCase):
+    def setUp(self):
+        self.series = TimeSeries.from_records(
+            [
+                {"time": "2025-01-01T00:00:00+08:00", "temp": "1", "text": "晴"},
+                {"time": "2025-01-01T01:00:00+08:00", "temp": None, "text": "多云"},
+                {"time": "2025-01-02T00:00:00+08:00", "temp": "5", "text": "阴"},
+            ],
+            "time", fields=("temp",), texts=("text",),
+        )
+
+    def test_from_records(self):
+        self.assertEqual(len(self.series), 3)
+        self.assertEqual(self.series.columns, ["temp", "text"])
+        self.assertTrue(math.isnan(self.series["temp"][1]))
+        self.assertEqual(self.series["text"].tolist(), ["晴", "多云", "阴"])
+        self.assertEqual(self.series.max("temp"), 5.0)
+        self.assertEqual(self.series.strftime("%m-%d %H"), ["01-01 00", "01-01 01", "01-02 00"])
+
+    def test_column_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            TimeSeries(stamps("2025-01-01"), {"temp": [1, 2]})
+
+    def test_slicing_and_between(self):
+        self.assertEqual(self.series[1:]["text"].tolist(), ["多云", "阴"])
+        self.assertEqual(self.series[self.series["temp"] > 2]["text"].tolist(), ["阴"])
+        self.assertEqual(self.series.between("2025-01-01T01:00", "2025-01-02")["text"].tolist(), ["多云"])
+
+    def test_concat(self):
+        merged = TimeSeries.concat([self.series[:1], self.series[2:]])
+        self.assertEqual(merged["text"].tolist(), ["晴", "阴"])
+        self.assertEqual(len(TimeSeries.concat([])), 0)
+
+    def test_resample_ignores_missing_values(self):
+        daily = self.series.resample("D")
+        self.assertEqual(daily.timestamps.tolist(), stamps("2025-01-01", "2025-01-02").tolist())
+        self.assertEqual(daily["temp"].tolist(), [1.0, 5.0])
+        self.assertEqual(daily["text"].tolist(), ["晴", "阴"])
+        self.assertEqual(self.series.resample("D", how="max")["temp"].tolist(), [1.0, 5.0])
+
+        missing = TimeSeries(stamps("2025-01-01", "2025-01-01T01:00"), {"temp": [np.nan, np.nan]})
+        for how in ("mean", "min", "max", "first", "last"):
+            with self.subTest(how=how):
+                self.assertTrue(np.isnan(missing.resample("D", how=how)["temp"]).all())
+        with self.assertRaises(ValueError):
+            self.series.resample("D", how="median")
+
+
+class NormalizeHourlyTest(unittest.TestCase):
+    def setUp(self):
+        # 乱序、同一小时重复、缺失 02 时，且含一条无效时间
+        self.series = TimeSeries(
+            stamps("2025-01-01T03:00", "2025-01-01T00:10", "NaT", "2025-01-01T01:00", "2025-01-01T00:40"),
+            {"temp": [4, 1, 99, 2, 1.5]},
+            {"text": ["d", "a", "x", "b", "a2"]},
+        )
+
+    def test_fills_gaps_and_keeps_last_duplicate(self):
+        result = normalize_hourly(self.series)
+        self.assertEqual(result.timestamps.tolist(), stamps(
+            "2025-01-01T00:00", "2025-01-01T01:00", "2025-01-01T02:00", "2025-01-01T03:00").tolist())
+        self.assertEqual(result["temp"][[0, 1, 3]].tolist(), [1.5, 2.0, 4.0])
+        self.assertTrue(np.isnan(result["temp"][2]))
+        self.assertEqual(result["text"].tolist(), ["a2", "b", None, "d"])
+
+    def test_keep_first_without_gap_filling(self):
+        result = normalize_hourly(self.series, keep="first", fill_gaps=False)
+        self.assertEqual(result.timestamps.tolist(), stamps(
+            "2025-01-01T00:00", "2025-01-01T01:00", "2025-01-01T03:00").tolist())
+        self.assertEqual(result["text"].tolist(), ["a", "b", "d"])
+
+    def test_same_hour_on_different_days_is_not_merged(self):
+        series = TimeSeries(stamps("2025-01-02T05:00", "2025-01-01T05:00"), {"temp": [2, 1]})
+        result = normalize_hourly(series, fill_gaps=False)
+        self.assertEqual(result["temp"].tolist(), [1.0, 2.0])
+        self.assertEqual(len(normalize_hourly(series)), 25)
+
+    def test_empty_and_invalid_input(self):
+        self.assertEqual(len(normalize_hourly(TimeSeries([], {"temp": []}))), 0)
+        self.assertEqual(len(normalize_hourly(TimeSeries(stamps("NaT"), {"temp": [1]}))), 0)
+        with self.assertRaises(ValueError):
+            normalize_hourly(self.series, keep="max")
+
+
+if __name__ == "__main__":
+    unittest.main()
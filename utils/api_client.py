@@ -1,380 +1,486 @@
+import inspect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import requests
 
+from utils.batch import BatchResult, many_method_name, many_param_sets
+from utils.disk_cache import extract_last_update
+from utils.endpoints import DEFAULT_BASE_URL, ENDPOINTS, ENDPOINTS_BY_PATH, get_endpoint
+from utils.instrumentation import (RequestEvent, TimedHTTPAdapter, connect_timing, queued, reset_connect_timing,
+                                   take_queue_wait)
+from utils.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from utils.response_cache import DEFAULT_TTL, DEFAULT_TTLS, ResponseCache
+from utils.single_flight import SingleFlight
+
+
 class ApiClient:
-    def __init__(self):
+    def __init__(self, pool_connections=4, pool_maxsize=16, pool_block=False, keep_alive=True, cache=True,
+                 disk_cache=None, stale_grace=0, on_refresh=None, rate_limiter=None, timeout=(3.05, 10),
+                 retry_policy=None, failure_threshold=5, recovery_timeout=30.0, base_url=None, hooks=(),
+                 offline=False):
+        """
+        pool_connections: 缓存的主机连接池数量
+        pool_maxsize: 每个主机连接池保留的最大连接数
+        pool_block: 连接池耗尽时是否阻塞等待空闲连接
+        keep_alive: 是否复用 TCP/TLS 连接
+        cache: True 使用默认内存缓存，False/None 关闭缓存，也可传入 ResponseCache 实例
+        disk_cache: 可选的 DiskCache 实例，用于跨重启持久化响应及离线时兜底
+        stale_grace: 缓存过期后的宽限时长（秒），宽限期内先返回旧数据并在后台刷新；0 表示关闭
+        on_refresh: 后台刷新完成时的回调 callback(path, params, data)，也可通过 add_refresh_listener 添加
+        rate_limiter: 可选的 RateLimiter 实例，按 Key 与接口族限流并统计每日配额
+        timeout: (连接超时, 读取超时) 秒数，避免挂起的连接卡死界面
+        retry_policy: 重试策略，默认 RetryPolicy()；传入 RetryPolicy(max_retries=0) 关闭重试
+        failure_threshold: 单个接口连续失败多少次后熔断
+        recovery_timeout: 熔断后多久（秒）放行试探请求
+        base_url: 接口地址，如本地缓存代理 http://127.0.0.1:8780/v3，默认为心知天气官方地址
+        hooks: 请求钩子（utils.instrumentation.RequestHook），每次调用结束后收到一个 RequestEvent
+        offline: 离线模式，未过期的缓存之外只返回磁盘缓存中的旧数据，不访问网络；可随时修改 offline 属性
+        """
         self.api_key = None
-        self.base_url = "https://api.seniverse.com/v3"
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+
+        # 复用同一个 Session，避免每次请求都重新建立 TCP+TLS 连接
+        self.session = requests.Session()
+        # 与 HTTPAdapter 相同，另外记录新建连接与 TLS 握手的耗时
+        adapter = TimedHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+        if cache is True:
+            cache = ResponseCache(stale_grace=stale_grace)
+        self.cache = cache or None
+        self.disk_cache = disk_cache
+
+        # stale-while-revalidate：后台刷新线程池与正在刷新的请求
+        self.stale_grace = stale_grace
+        self._refresh_listeners = [on_refresh] if on_refresh else []
+        self._refresh_executor = None
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+
+        self.single_flight = SingleFlight()
+        self.rate_limiter = rate_limiter
+
+        # 超时、重试与按接口的熔断器
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers = {}  # 接口路径 -> CircuitBreaker
+        self._breakers_lock = threading.Lock()
+
+        # 离线模式下只读取磁盘缓存，不访问网络
+        self.offline = offline
+
+        self.hooks = list(hooks)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """关闭连接池，释放所有连接"""
+        if self._refresh_executor is not None:
+            self._refresh_executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+        if self.rate_limiter is not None:
+            self.rate_limiter.flush()
 
     def set_api_key(self, api_key):
         """设置 API Key"""
         self.api_key = api_key
 
-    def test_api_key(self):
-        """验证 API Key 是否有效"""
-        if not self.api_key:
-            raise RuntimeError("API Key 未设置！")
-
+    def call(self, name, *args, **kwargs):
+        """按接口名调用注册表中的接口，参数与同名方法一致"""
+        endpoint = get_endpoint(name)
+        data = self._get(endpoint.path, endpoint.bind(*args, **kwargs))
+        return endpoint.extract(data) if endpoint.extract else data
+
+    def get(self, path, params):
+        """
+        按接口路径与请求参数获取完整 JSON，参数名与心知天气接口一致（不含 key）。
+        与按接口名调用一样经过缓存、合并与限流，供缓存代理转发任意请求使用。
+        """
+        return self._get(path, dict(params))
+
+    def iter_many(self, name, param_sets, max_workers=8):
+        """
+        以最多 max_workers 个并发请求批量调用同一接口，按完成顺序逐个产出 BatchResult。
+        param_sets: 每项调用的关键字参数字典
+        每次请求仍经过缓存、限流与熔断；单项失败记录在结果中，不影响其余项。
+        提前停止迭代时，尚未开始的请求不再发起。
+        """
+        get_endpoint(name)  # 接口名有误时整批报错，而不是每项各自失败
+        param_sets = list(param_sets)
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ApiClientBatch")
         try:
-            # 测试请求示例：获取一个默认位置的当前天气
-            endpoint = f"{self.base_url}/weather/now.json"
-            params = {
-                "key": self.api_key,
-                "location": "beijing",  # 使用一个默认位置
-                "language": "zh-Hans",
-                "unit": "c",
+            futures = {
+                executor.submit(self._call_queued, time.perf_counter(), name, params): (index, params)
+                for index, params in enumerate(param_sets)
             }
-
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-
-            # 检查返回数据是否包含预期的 "results" 字段
-            data = response.json()
-            if "results" in data and data["results"]:
-                return True  # API Key 验证成功
-            return False  # 数据结构不匹配，可能无效
-        except requests.exceptions.RequestException as e:
-            print(f"API Key 验证失败: {e}")
-            return False
-
-    def fetch_current_weather(self, location, language="zh-Hans", unit="c"):
-        """获取天气实况数据"""
-        if not self.api_key:
-            raise RuntimeError("API Key 未设置！")
-
-        endpoint = f"{self.base_url}/weather/now.json"
-        params = {
-            "key": self.api_key,
-            "location": location,
-            "language": language,
-            "unit": unit,
-        }
-
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        return response.json()
-
-    def fetch_daily_forecast(self, location, days=5, language="zh-Hans", unit="c", start=0):
-        """获取逐日天气预报数据"""
-        if not self.api_key:
-            raise RuntimeError("API Key 未设置！")
-
-        endpoint = f"{self.base_url}/weather/daily.json"
-        params = {
-            "key": self.api_key,
-            "location": location,
-            "language": language,
-            "unit": unit,
-            "start": start,
-            "days": days,
-        }
-
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        return response.json()
-
-    def fetch_hourly_forecast(self, location, hours=24, language="zh-Hans", unit="c", start=0):
-        """获取逐小时天气预报数据"""
-        if not self.api_key:
-            raise RuntimeError("API Key 未设置！")
-
-        endpoint = f"{self.base_url}/weather/hourly.json"
-        params = {
-            "key": self.api_key,
-            "location": location,
-            "language": language,
-            "unit": unit,
-            "start": start,
-            "hours": hours,
-        }
-
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        return response.json()
-
-    def fetch_hourly_history(self, location, language="zh-Hans", unit="c"):
-        """获取过去24小时历史天气数据"""
-        if not self.api_key:
-            raise RuntimeError("API Key 未设置！")
-
-        endpoint = f"{self.base_url}/weather/hourly_history.json"
-        params = {
-            "key": self.api_key,
-            "location": location,
-            "language": language,
-            "unit": unit,
-        }
-
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        return response.json()
-
-    def fetch_weather_alerts(self, location, detail="more"):
-        """获取气象灾害预警数据"""
-        if not self.api_key:
-            raise RuntimeError("API Key 未设置！")
-
-        endpoint = f"{self.base_url}/weather/alarm.json"
-        params = {
-            "key": self.api_key,
-            "location": location,
-            "detail": detail,
-        }
-
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        return response.json()
-
-    def fetch_current_air_quality(self, location, language="zh-Hans", scope="city"):
-        """获取空气质量实况数据"""
-        if not self.api_key:
-            raise RuntimeError("API Key 未设置！")
-
-        endpoint = f"{self.base_url}/air/now.json"
-        params = {
-            "key": self.api_key,
-            "location": location,
-            "language": language,
-            "scope": scope,
-        }
-
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        return response.json()
-
-    def fetch_air_quality_ranking(self, language="zh-Hans"):
-        """获取空气质量城市排名数据"""
-        if not self.api_key:
-            raise RuntimeError("API Key 未设置！")
-
-        endpoint = f"{self.base_url}/air/ranking.json"
-        params = {
-            "key": self.api_key,
-            "language": language,
-        }
-
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        return response.json()
-
-    def fetch_hourly_air_quality(self, location, language="zh-Hans", scope="city"):
-        """获取过去24小时空气质量历史数据"""
-        if not self.api_key:
-            raise RuntimeError("API Key 未设置！")
-
-        endpoint = f"{self.base_url}/air/hourly_history.json"
-        params = {
-            "key": self.api_key,
-            "location": location,
-            "language": language,
-            "scope": scope,
-        }
-
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        return response.json()
-
-    def fetch_daily_air_quality(self, location, language="zh-Hans"):
-        """获取逐日空气质量预报数据"""
-        if not self.api_key:
-            raise RuntimeError("API Key 未设置！")
-
-        endpoint = f"{self.base_url}/air/daily.json"
-        params = {
-            "key": self.api_key,
-            "location": location,
-            "language": language,
-        }
-
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        return response.json()
-
-    def fetch_hourly_air_quality_forecast(self, location, language="zh-Hans"):
-        """获取逐小时空气质量预报数据"""
-        if not self.api_key:
-            raise RuntimeError("API Key 未设置！")
-
-        endpoint = f"{self.base_url}/air/hourly.json"
-        params = {
-            "key": self.api_key,
-            "location": location,
-            "language": language,
-        }
-
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        return response.json()
-
-    def fetch_lifestyle_index(self, location, language="zh-Hans", days=1):
-        """获取生活指数数据"""
-        if not self.api_key:
-            raise RuntimeError("API Key 未设置！")
-
-        endpoint = f"{self.base_url}/life/suggestion.json"
-        params = {
-            "key": self.api_key,
-            "location": location,
-            "language": language,
-            "days": days,
-        }
-
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        result = response.json()
-
-        # 提取 results 数据
-        results = result.get('results', [])
-        if not results:
-            raise ValueError("API 响应中无结果数据")
-
-        # 获取 suggestion 列表
-        suggestion_list = results[0].get('suggestion', [])
-        if not suggestion_list or not isinstance(suggestion_list, list):
-            raise ValueError("suggestion 数据格式不正确")
-
-        # 返回 suggestion 列表的第一个元素
-        first_suggestion = suggestion_list[0]
-        if not isinstance(first_suggestion, dict):
-            raise ValueError("第一天的生活指数数据格式不正确")
-
-        return first_suggestion
-
-    def fetch_lunar_calendar(self, start=0, days=1):
-        """获取农历节气生肖数据"""
-        if not self.api_key:
-            raise RuntimeError("API Key 未设置！")
-
-        endpoint = f"{self.base_url}/life/chinese_calendar.json"
-        params = {
-            "key": self.api_key,
-            "start": start,
-            "days": days,
-        }
-
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        result = response.json()
-
-        # 提取 chinese_calendar 数据
-        chinese_calendar = result.get('results', {}).get('chinese_calendar', [])
-        if not chinese_calendar:
-            raise ValueError("No chinese_calendar data found")
-
-        return chinese_calendar[0]  # 返回第一天的数据
-
-    def fetch_vehicle_restriction(self, location):
-        """获取机动车尾号限行数据"""
+            for future in as_completed(futures):
+                index, params = futures[future]
+                try:
+                    yield BatchResult(index, params, data=future.result())
+                except Exception as e:
+                    yield BatchResult(index, params, error=e)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _call_queued(self, submitted_at, name, params):
+        """在线程池中执行的调用，请求事件中记录排队时长"""
+        with queued(submitted_at):
+            return self.call(name, **params)
+
+    def fetch_many(self, name, param_sets, max_workers=8):
+        """同 iter_many，等待全部完成后按输入顺序返回 BatchResult 列表"""
+        param_sets = list(param_sets)
+        results = [None] * len(param_sets)
+        for result in self.iter_many(name, param_sets, max_workers):
+            results[result.index] = result
+        return results
+
+    def remaining_budget(self):
+        """返回当前 API Key 的剩余调用预算，未配置限流时返回 None"""
+        if self.rate_limiter is None:
+            return None
+        return self.rate_limiter.remaining(self.api_key)
+
+    def breaker_states(self):
+        """返回各接口熔断器的状态，用于监控面板"""
+        with self._breakers_lock:
+            breakers = dict(self._breakers)
+        return {path: breaker.snapshot() for path, breaker in breakers.items()}
+
+    def _breaker(self, path):
+        with self._breakers_lock:
+            breaker = self._breakers.get(path)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.recovery_timeout)
+                self._breakers[path] = breaker
+            return breaker
+
+    def add_hook(self, hook):
+        """添加请求钩子，见 utils.instrumentation.RequestHook"""
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        if hook in self.hooks:
+            self.hooks.remove(hook)
+
+    def _notify(self, hooks, method, arg):
+        for hook in hooks:
+            try:
+                getattr(hook, method)(arg)
+            except Exception as e:
+                print(f"请求钩子执行失败: {e}")
+
+    def add_refresh_listener(self, callback):
+        """添加后台刷新回调 callback(path, params, data)，回调在后台线程中执行；重复添加同一回调无效"""
+        if callback not in self._refresh_listeners:
+            self._refresh_listeners.append(callback)
+
+    def remove_refresh_listener(self, callback):
+        if callback in self._refresh_listeners:
+            self._refresh_listeners.remove(callback)
+
+    def _get(self, path, params, refresh=False):
+        """发起 GET 请求并返回解析后的 JSON，refresh 为 True 时跳过缓存读取；结束后将请求事件交给钩子"""
+        started = time.perf_counter()
+        endpoint = ENDPOINTS_BY_PATH.get(path)
+        event = RequestEvent(endpoint.name if endpoint else path, path, queue_wait=take_queue_wait(started))
+        hooks = list(self.hooks)
+        self._notify(hooks, "request_started", event.endpoint)
+        try:
+            return self._lookup(path, params, refresh, event)
+        except Exception as e:
+            event.error = type(e).__name__
+            raise
+        finally:
+            event.total = time.perf_counter() - started
+            self._notify(hooks, "request_finished", event)
+
+    def _lookup(self, path, params, refresh, event):
+        """依次查找缓存、宽限期内的旧数据，最后访问网络"""
         if not self.api_key:
             raise RuntimeError("API Key 未设置！")
 
-        endpoint = f"{self.base_url}/life/driving_restriction.json"
-        params = {
-            "key": self.api_key,
-            "location": location,
-        }
+        if not refresh:
+            data = self._get_cached(path, params, event)
+            if data is not None:
+                return data
+
+            # 宽限期内先返回旧数据，同时在后台刷新
+            data = self._get_revalidatable(path, params)
+            if data is not None:
+                event.cache = "stale"
+                self._schedule_refresh(path, params)
+                return data
+
+        if self.offline:
+            event.cache = "stale"
+            return self._get_stale(path, params, RuntimeError("离线模式下无可用的缓存数据！"))
+
+        # 并发的相同请求只发起一次，只有实际发起请求的调用记为 miss
+        def fetch():
+            event.cache = "miss"
+            return self._fetch(path, params, event)
+
+        event.cache = "coalesced"
+        return self.single_flight.do(ResponseCache.make_key(path, params), fetch)
+
+    def _fetch(self, path, params, event=None):
+        """访问网络获取数据并写入缓存"""
+        breaker = self._breaker(path)
+        try:
+            breaker.before_call()
+        except CircuitOpenError as e:
+            # 熔断期间直接使用磁盘中的旧数据，不访问网络
+            return self._fallback(path, params, e, event)
 
-        response = requests.get(endpoint, params=params)
+        try:
+            response = self._request_with_retry(path, params, event)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            breaker.record_failure()
+            # 网络不可用时退回到磁盘中的旧数据
+            return self._fallback(path, params, e, event)
+        except requests.exceptions.HTTPError:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # 配额用尽、响应正文读取失败等不说明上游是否可用，只释放试探名额，避免一直停在半开状态
+            breaker.release_trial()
+            raise
+
+        # 4xx 说明上游可用，只是请求本身有误，不计入熔断
+        breaker.record_success()
         response.raise_for_status()
-        result = response.json()
-
-        results = result.get('results', [{}])
-        if not results:
-            raise ValueError("No vehicle restriction data found")
-
-        return results[0]  # 返回第一条数据
-
-    def fetch_tides_forecast(self, port):
-        """获取逐小时潮汐预报数据"""
+        start = time.perf_counter()
+        data = response.json()
+        if event is not None:
+            event.decode = time.perf_counter() - start
+
+        self._store(path, params, data, response)
+        return data
+
+    def _fallback(self, path, params, error, event):
+        """访问网络失败时返回磁盘中的旧数据，请求事件中仍记录失败原因"""
+        if event is not None:
+            event.cache = "stale"
+            event.error = type(error).__name__
+        return self._get_stale(path, params, error)
+
+    def _request_with_retry(self, path, params, event=None):
+        """发起请求，连接失败、超时及可重试的状态码按指数退避重试"""
+        policy = self.retry_policy
+        for attempt in range(policy.max_retries + 1):
+            if event is not None:
+                event.retries = attempt
+            if self.rate_limiter is not None:
+                start = time.perf_counter()
+                self.rate_limiter.acquire(self.api_key, path)
+                if event is not None:
+                    event.throttle = (event.throttle or 0.0) + time.perf_counter() - start
+
+            last_attempt = attempt == policy.max_retries
+            reset_connect_timing()
+            start = time.perf_counter()
+            try:
+                response = self.session.get(
+                    f"{self.base_url}{path}", params={"key": self.api_key, **params}, timeout=self.timeout
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if last_attempt:
+                    raise
+            else:
+                if event is not None:
+                    self._record_response(event, response, time.perf_counter() - start)
+                if response.status_code not in policy.retry_statuses:
+                    return response
+                if last_attempt:
+                    response.raise_for_status()
+
+            time.sleep(policy.delay(attempt))
+
+    @staticmethod
+    def _record_response(event, response, elapsed):
+        """
+        记录最后一次尝试的各阶段耗时。response.elapsed 为发出请求到解析完响应头的时间，
+        其中包含新建连接的耗时，减去后即为 TTFB；其余时间为读取正文。
+        """
+        connect, tls = connect_timing()
+        headers_at = response.elapsed.total_seconds()
+        event.status = response.status_code
+        event.bytes = len(response.content)
+        event.connection_reused = connect is None
+        event.connect = connect
+        event.tls = tls
+        event.ttfb = max(0.0, headers_at - (connect or 0.0) - (tls or 0.0))
+        event.transfer = max(0.0, elapsed - headers_at)
+
+    def _get_cached(self, path, params, event=None):
+        """依次查找内存缓存与磁盘缓存中未过期的数据"""
+        if self.cache is not None:
+            data = self.cache.get(path, params)
+            if data is not None:
+                if event is not None:
+                    event.cache = "hit"
+                return data
+
+        if self.disk_cache is not None:
+            entry = self.disk_cache.get(path, params)
+            if entry is not None:
+                data, fetched_at, ttl, size = entry
+                if self.cache is not None:
+                    self.cache.put(path, params, data, size, ttl=fetched_at + ttl - self.disk_cache.clock())
+                if event is not None:
+                    event.cache = "disk"
+                return data
+        return None
+
+    def _get_revalidatable(self, path, params):
+        """返回已过期但仍在宽限期内的缓存数据"""
+        if self.stale_grace <= 0 or self.offline:
+            return None
+
+        if self.cache is not None:
+            data = self.cache.get_stale(path, params)
+            if data is not None:
+                return data
+
+        if self.disk_cache is not None:
+            entry = self.disk_cache.get(path, params, allow_stale=True)
+            if entry is not None:
+                data, fetched_at, ttl, _ = entry
+                if fetched_at + ttl + self.stale_grace > self.disk_cache.clock():
+                    return data
+        return None
+
+    def _schedule_refresh(self, path, params):
+        key = ResponseCache.make_key(path, params)
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return  # 同一请求已在刷新中
+            self._refreshing.add(key)
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ApiClientRefresh")
+        self._refresh_executor.submit(self._refresh, key, path, params)
+
+    def _refresh(self, key, path, params):
+        try:
+            data = self._get(path, params, refresh=True)
+        except Exception as e:
+            print(f"后台刷新失败 {path}: {e}")
+            return
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(key)
+
+        for listener in list(self._refresh_listeners):
+            try:
+                listener(path, params, data)
+            except Exception as e:
+                print(f"刷新回调执行失败: {e}")
+
+    def _get_stale(self, path, params, error):
+        """返回磁盘缓存中的数据（忽略有效期），没有则抛出原始错误"""
+        if self.disk_cache is not None:
+            entry = self.disk_cache.get(path, params, allow_stale=True)
+            if entry is not None:
+                return entry[0]
+        raise error
+
+    def _store(self, path, params, data, response):
+        if self.cache is not None:
+            self.cache.put(path, params, data, len(response.content))
+        if self.disk_cache is not None:
+            ttl = self.cache.ttl_for(path) if self.cache is not None else DEFAULT_TTLS.get(path, DEFAULT_TTL)
+            self.disk_cache.put(path, params, response.text, ttl, extract_last_update(data))
+
+    def verify_api_key(self):
+        """
+        联网验证 API Key：有效返回 True，被服务端拒绝返回 False，网络不可用时抛出异常。
+        不使用任何缓存数据，验证得到的响应写入缓存供后续请求使用。
+        """
         if not self.api_key:
             raise RuntimeError("API Key 未设置！")
 
-        endpoint = f"{self.base_url}/tide/daily.json"
+        # 测试请求示例：获取一个默认位置的当前天气
+        path = "/weather/now.json"
         params = {
-            "key": self.api_key,
-            "port": port,
+            "location": "beijing",  # 使用一个默认位置
+            "language": "zh-Hans",
+            "unit": "c",
         }
-
-        response = requests.get(endpoint, params=params)
+        response = self._request_with_retry(path, params)
+        if 400 <= response.status_code < 500:
+            return False  # Key 无效或无权限
         response.raise_for_status()
-        result = response.json()
-
-        # 提取潮汐数据
-        results = result.get('results', [{}])
-        if not results:
-            raise ValueError("No tide data found")
+        data = response.json()
 
-        return results[0]  # 返回第一条数据
-
-    def fetch_sun_times(self, location, days=1, language="zh-Hans", start=0):
-        """获取日出日落时间数据"""
-        if not self.api_key:
-            raise RuntimeError("API Key 未设置！")
-
-        endpoint = f"{self.base_url}/geo/sun.json"
-        params = {
-            "key": self.api_key,
-            "location": location,
-            "language": language,
-            "start": start,
-            "days": days,
-        }
+        # 检查返回数据是否包含预期的 "results" 字段
+        if not data.get("results"):
+            return False  # 数据结构不匹配，可能无效
 
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        result = response.json()
+        self._store(path, params, data, response)
+        return True
 
-        # 提取 sun 数据
-        results = result.get('results', [{}])
-        if not results:
-            raise ValueError("No sun times data found")
+    def test_api_key(self):
+        """验证 API Key 是否有效"""
+        try:
+            return self.verify_api_key()
+        except requests.exceptions.RequestException as e:
+            print(f"API Key 验证失败: {e}")
+            return False
 
-        return results[0]  # 返回第一条数据
 
-    def fetch_moon_times(self, location, days=1, language="zh-Hans", start=0):
-        """获取月出月落和月相数据"""
-        if not self.api_key:
-            raise RuntimeError("API Key 未设置！")
+def _make_endpoint_method(endpoint):
+    """为注册表中的接口生成 ApiClient 上的同名方法"""
+    def method(self, *args, **kwargs):
+        return self.call(endpoint.name, *args, **kwargs)
 
-        endpoint = f"{self.base_url}/geo/moon.json"
-        params = {
-            "key": self.api_key,
-            "location": location,
-            "language": language,
-            "start": start,
-            "days": days,
-        }
+    method.__name__ = method.__qualname__ = endpoint.name
+    method.__doc__ = endpoint.doc
+    method.__signature__ = endpoint.signature.replace(parameters=[
+        inspect.Parameter("self", inspect.Parameter.POSITIONAL_OR_KEYWORD),
+        *endpoint.signature.parameters.values(),
+    ])
+    return method
 
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        result = response.json()
 
-        # 提取 moon 数据
-        results = result.get('results', [{}])
-        if not results:
-            raise ValueError("No moon times data found")
+def _make_many_method(endpoint):
+    """为带 location 参数的接口生成按城市批量调用的方法，如 fetch_current_weather_many"""
+    def method(self, locations, max_workers=8, **kwargs):
+        return self.fetch_many(endpoint.name, many_param_sets(locations, kwargs), max_workers)
 
-        return results[0]  # 返回第一条数据
+    method.__name__ = method.__qualname__ = many_method_name(endpoint)
+    method.__doc__ = f"批量{endpoint.doc}，按 locations 的顺序返回 BatchResult 列表，其余参数同 {endpoint.name}"
+    return method
 
-    def search_city(self, query):
-        """搜索城市"""
-        if not self.api_key:
-            raise RuntimeError("API Key 未设置！")
 
-        endpoint = f"{self.base_url}/location/search.json"
-        params = {
-            "key": self.api_key,
-            "q": query,
-        }
+for _endpoint in ENDPOINTS.values():
+    setattr(ApiClient, _endpoint.name, _make_endpoint_method(_endpoint))
+    if many_method_name(_endpoint):
+        setattr(ApiClient, many_method_name(_endpoint), _make_many_method(_endpoint))
 
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-        return response.json()
 
 if __name__ == "__main__":
-    api_client = ApiClient()
-    api_client.set_api_key("your_api_key_here")  # 替换为实际的 API Key
-    try:
-        result = api_client.fetch_lifestyle_index(location="shanghai")
-        print(result)
-    except Exception as e:
-        print(f"Error: {e}")
+    with ApiClient() as api_client:
+        api_client.set_api_key("your_api_key_here")  # 替换为实际的 API Key
+        try:
+            result = api_client.fetch_lifestyle_index(location="shanghai")
+            print(result)
+        except Exception as e:
+            print(f"Error: {e}")
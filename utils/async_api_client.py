@@ -0,0 +1,249 @@
+import asyncio
+import inspect
+
+import aiohttp
+
+from utils.batch import BatchResult, many_method_name, many_param_sets
+from utils.endpoints import DEFAULT_BASE_URL, ENDPOINTS, get_endpoint
+from utils.resilience import CircuitBreaker, RetryPolicy
+from utils.response_cache import ResponseCache
+from utils.single_flight import AsyncSingleFlight
+
+
+class AsyncApiClient:
+    """基于 asyncio 的 API 客户端，接口与 ApiClient 一一对应"""
+
+    def __init__(self, max_concurrency=100, limit_per_host=100, keepalive_timeout=30, rate_limiter=None,
+                 timeout=(3.05, 10), retry_policy=None, failure_threshold=5, recovery_timeout=30.0,
+                 base_url=None):
+        """
+        max_concurrency: 同时在途的最大请求数
+        limit_per_host: 每个主机连接池保留的最大连接数
+        keepalive_timeout: 空闲连接保活时长（秒）
+        rate_limiter: 可选的 RateLimiter 实例，可与同步 ApiClient 共用同一份预算
+        timeout: (连接超时, 读取超时) 秒数
+        retry_policy: 重试策略，默认 RetryPolicy()
+        failure_threshold: 单个接口连续失败多少次后熔断
+        recovery_timeout: 熔断后多久（秒）放行试探请求
+        base_url: 接口地址，默认为心知天气官方地址
+        """
+        self.api_key = None
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.single_flight = AsyncSingleFlight()
+        self.rate_limiter = rate_limiter
+
+        self.timeout = aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers = {}  # 接口路径 -> CircuitBreaker
+
+        # 连接池绑定到首次发起请求时所在的事件循环
+        self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """关闭连接池，释放所有连接"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        if self.rate_limiter is not None:
+            self.rate_limiter.flush()
+
+    def set_api_key(self, api_key):
+        """设置 API Key"""
+        self.api_key = api_key
+
+    async def call(self, name, *args, **kwargs):
+        """按接口名调用注册表中的接口，参数与同名方法一致"""
+        endpoint = get_endpoint(name)
+        data = await self._get(endpoint.path, endpoint.bind(*args, **kwargs))
+        return endpoint.extract(data) if endpoint.extract else data
+
+    async def iter_many(self, name, param_sets, max_concurrency=None):
+        """
+        批量并发调用同一接口，按完成顺序逐个产出 BatchResult（异步生成器）。
+        param_sets: 每项调用的关键字参数字典
+        max_concurrency: 本批次同时在途的最大请求数，None 表示只受客户端整体的并发上限约束
+        单项失败记录在结果中，不影响其余项；提前停止迭代时取消其余请求。
+        """
+        get_endpoint(name)  # 接口名有误时整批报错，而不是每项各自失败
+        limit = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+        async def run(index, params):
+            try:
+                if limit is None:
+                    data = await self.call(name, **params)
+                else:
+                    async with limit:
+                        data = await self.call(name, **params)
+            except Exception as e:
+                return BatchResult(index, params, error=e)
+            return BatchResult(index, params, data=data)
+
+        tasks = [asyncio.ensure_future(run(index, params)) for index, params in enumerate(param_sets)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def fetch_many(self, name, param_sets, max_concurrency=None):
+        """同 iter_many，等待全部完成后按输入顺序返回 BatchResult 列表"""
+        param_sets = list(param_sets)
+        results = [None] * len(param_sets)
+        async for result in self.iter_many(name, param_sets, max_concurrency):
+            results[result.index] = result
+        return results
+
+    def _get_session(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=0,  # 总并发由 semaphore 控制
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self.session
+
+    def breaker_states(self):
+        """返回各接口熔断器的状态"""
+        return {path: breaker.snapshot() for path, breaker in self._breakers.items()}
+
+    def _breaker(self, path):
+        breaker = self._breakers.get(path)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.recovery_timeout)
+            self._breakers[path] = breaker
+        return breaker
+
+    async def _get(self, path, params):
+        """发起 GET 请求并返回解析后的 JSON"""
+        if not self.api_key:
+            raise RuntimeError("API Key 未设置！")
+
+        # 并发的相同请求只发起一次
+        return await self.single_flight.do(ResponseCache.make_key(path, params), lambda: self._fetch(path, params))
+
+    async def _fetch(self, path, params):
+        breaker = self._breaker(path)
+        breaker.before_call()
+
+        try:
+            data = await self._request_with_retry(path, params)
+        except aiohttp.ClientResponseError as e:
+            # 4xx 说明上游可用，不计入熔断
+            if e.status >= 500 or e.status in self.retry_policy.retry_statuses:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # 配额用尽、JSON 解析失败或任务被取消时只释放试探名额，避免一直停在半开状态
+            breaker.release_trial()
+            raise
+
+        breaker.record_success()
+        return data
+
+    async def _request_with_retry(self, path, params):
+        policy = self.retry_policy
+        params = {"key": self.api_key, **params}
+        for attempt in range(policy.max_retries + 1):
+            if self.rate_limiter is not None:
+                # 排队等待不占用事件循环
+                wait = self.rate_limiter.reserve(self.api_key, path)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+            last_attempt = attempt == policy.max_retries
+            try:
+                async with self.semaphore:
+                    async with self._get_session().get(f"{self.base_url}{path}", params=params) as response:
+                        if response.status not in policy.retry_statuses or last_attempt:
+                            response.raise_for_status()
+                            return await response.json(content_type=None)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if last_attempt:
+                    raise
+
+            await asyncio.sleep(policy.delay(attempt))
+
+    async def test_api_key(self):
+        """验证 API Key 是否有效"""
+        if not self.api_key:
+            raise RuntimeError("API Key 未设置！")
+
+        try:
+            # 测试请求示例：获取一个默认位置的当前天气
+            data = await self._get("/weather/now.json", {
+                "location": "beijing",  # 使用一个默认位置
+                "language": "zh-Hans",
+                "unit": "c",
+            })
+
+            # 检查返回数据是否包含预期的 "results" 字段
+            if "results" in data and data["results"]:
+                return True  # API Key 验证成功
+            return False  # 数据结构不匹配，可能无效
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"API Key 验证失败: {e}")
+            return False
+
+
+def _make_endpoint_method(endpoint):
+    """为注册表中的接口生成 AsyncApiClient 上的同名协程方法"""
+    async def method(self, *args, **kwargs):
+        return await self.call(endpoint.name, *args, **kwargs)
+
+    method.__name__ = method.__qualname__ = endpoint.name
+    method.__doc__ = endpoint.doc
+    method.__signature__ = endpoint.signature.replace(parameters=[
+        inspect.Parameter("self", inspect.Parameter.POSITIONAL_OR_KEYWORD),
+        *endpoint.signature.parameters.values(),
+    ])
+    return method
+
+
+def _make_many_method(endpoint):
+    """为带 location 参数的接口生成按城市批量调用的协程方法，如 fetch_current_weather_many"""
+    async def method(self, locations, max_concurrency=None, **kwargs):
+        return await self.fetch_many(endpoint.name, many_param_sets(locations, kwargs), max_concurrency)
+
+    method.__name__ = method.__qualname__ = many_method_name(endpoint)
+    method.__doc__ = f"批量{endpoint.doc}，按 locations 的顺序返回 BatchResult 列表，其余参数同 {endpoint.name}"
+    return method
+
+
+for _endpoint in ENDPOINTS.values():
+    setattr(AsyncApiClient, _endpoint.name, _make_endpoint_method(_endpoint))
+    if many_method_name(_endpoint):
+        setattr(AsyncApiClient, many_method_name(_endpoint), _make_many_method(_endpoint))
+
+
+if __name__ == "__main__":
+    async def main():
+        async with AsyncApiClient() as api_client:
+            api_client.set_api_key("your_api_key_here")  # 替换为实际的 API Key
+            results = await asyncio.gather(
+                api_client.fetch_current_weather(location="beijing"),
+                api_client.fetch_current_air_quality(location="shanghai"),
+                return_exceptions=True,
+            )
+            for result in results:
+                print(result)
+
+    asyncio.run(main())
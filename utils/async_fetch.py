@@ -0,0 +1,181 @@
+import threading
+import time
+
+from PyQt6.QtCore import QEvent, QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt6.QtWidgets import QMessageBox
+
+from utils.instrumentation import queued
+
+_stats_lock = threading.Lock()
+_stats = {"requests": 0, "cancelled": 0}  # 所有窗口累计的请求数与取消数
+
+
+def fetch_stats():
+    """返回所有窗口累计发起的请求数和被取消（或结果被丢弃）的请求数"""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+class WorkerSignals(QObject):
+    result = pyqtSignal(object)
+    error = pyqtSignal(object)
+    finished = pyqtSignal()
+
+
+class FetchWorker(QRunnable):
+    """在线程池中执行一次请求，结果与异常通过信号回到 GUI 线程"""
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        # 由 AsyncFetcher 持有到信号送达为止；默认的自动删除会在 run 返回后立即销毁 C++ 对象，
+        # 此前对它调用 tryTake 会抛出 RuntimeError
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self.generation = 0
+        self.cancelled = False
+        self.started = False
+        self.queued_at = time.perf_counter()  # 请求事件中的排队时长从此刻算起
+
+    def run(self):
+        self.started = True
+        try:
+            # 开始执行前已被新请求取代，则不再发起请求，节省配额
+            if self.cancelled:
+                return
+            with queued(self.queued_at):
+                result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(e)
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+
+class AsyncFetcher(QObject):
+    """
+    窗口的异步请求助手：请求在 QThreadPool 中执行，不阻塞事件循环；
+    请求进行中窗口标题显示加载状态并使用忙碌光标。
+
+    每次 run 都会产生新的一代请求：尚在排队的旧请求直接从线程池中移除，
+    已在执行的旧请求结果被丢弃；窗口关闭时取消全部请求。
+    """
+
+    loading_changed = pyqtSignal(bool)
+
+    def __init__(self, window, thread_pool=None):
+        super().__init__(window)
+        self.window = window
+        self.thread_pool = thread_pool or QThreadPool.globalInstance()
+        self.title = None
+        self.workers = set()  # 持有引用，直到排队中的信号全部送达
+        self.generation = 0  # 最新一代请求的编号
+        self.requests = 0
+        self.cancelled = 0
+        window.installEventFilter(self)
+
+    @property
+    def loading(self):
+        return any(not worker.cancelled for worker in self.workers)
+
+    def run(self, fn, *args, on_result, error_message, on_error=None, **kwargs):
+        """
+        在后台执行 fn(*args, **kwargs)，并取代此前尚未完成的请求。
+        on_result: 成功时在 GUI 线程中以结果调用
+        error_message: 失败时错误对话框中的提示前缀
+        on_error: 可选，失败时以异常调用，代替错误对话框
+        """
+        self.cancel()
+
+        self.generation += 1
+        worker = FetchWorker(fn, *args, **kwargs)
+        worker.generation = self.generation
+        worker.signals.result.connect(lambda result: self._deliver(worker, on_result, result, error_message))
+        worker.signals.error.connect(lambda e: self._fail(worker, error_message, on_error, e))
+        worker.signals.finished.connect(lambda: self._finish(worker))
+
+        was_loading = self.loading
+        self.workers.add(worker)
+        if not was_loading:
+            self._set_loading(True)
+        self.requests += 1
+        _count("requests")
+        self.thread_pool.start(worker)
+        return worker
+
+    def cancel(self):
+        """取消所有未完成的请求，返回本次取消的数量"""
+        cancelled = 0
+        for worker in list(self.workers):
+            if worker.cancelled:
+                continue
+            worker.cancelled = True
+            cancelled += 1
+            if not worker.started and self.thread_pool.tryTake(worker):
+                # 仍在排队，直接移除，不会再有信号送达
+                self._finish(worker)
+
+        self.cancelled += cancelled
+        for _ in range(cancelled):
+            _count("cancelled")
+        if cancelled and not self.loading:
+            self._set_loading(False)
+        return cancelled
+
+    def stats(self):
+        return {"requests": self.requests, "cancelled": self.cancelled, "in_flight": len(self.workers)}
+
+    def _is_current(self, worker):
+        return not worker.cancelled and worker.generation == self.generation
+
+    def _deliver(self, worker, on_result, result, error_message):
+        if not self._is_current(worker):
+            return
+        # 结果处理（解析、绘图）中的异常与请求异常同样提示，避免在槽函数中抛出
+        try:
+            on_result(result)
+        except Exception as e:
+            self._show_error(error_message, e)
+
+    def _fail(self, worker, error_message, on_error, e):
+        if not self._is_current(worker):
+            return
+        if on_error is not None:
+            on_error(e)
+        else:
+            self._show_error(error_message, e)
+
+    def _show_error(self, error_message, e):
+        QMessageBox.critical(self.window, "错误", f"{error_message}: {e}")
+
+    def _finish(self, worker):
+        if worker not in self.workers:
+            return
+        was_loading = self.loading
+        self.workers.discard(worker)
+        if was_loading and not self.loading:
+            self._set_loading(False)
+
+    def _set_loading(self, loading):
+        if loading:
+            self.title = self.window.windowTitle()
+            self.window.setWindowTitle(f"{self.title}（加载中…）")
+            self.window.setCursor(Qt.CursorShape.BusyCursor)
+        else:
+            self.window.setWindowTitle(self.title)
+            self.window.unsetCursor()
+        self.loading_changed.emit(loading)
+
+    def eventFilter(self, obj, event):
+        # 窗口关闭后不再需要任何结果
+        if obj is self.window and event.type() == QEvent.Type.Close:
+            self.cancel()
+        return False
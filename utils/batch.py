@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class BatchResult:
+    """批量请求中一项的结果：成功时 data 为接口返回值，失败时 error 为异常，不影响其余项"""
+
+    index: int  # 该项在输入参数序列中的位置
+    params: dict
+    data: object = None
+    error: Exception = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def many_method_name(endpoint):
+    """按城市批量调用的方法名，仅为带 location 参数的接口生成，其余返回 None"""
+    if "location" not in endpoint.signature.parameters:
+        return None
+    return f"{endpoint.name}_many"
+
+
+def many_param_sets(locations, kwargs):
+    """为每个城市生成一组参数，其余参数各组相同"""
+    return [{"location": location, **kwargs} for location in locations]
@@ -0,0 +1,265 @@
+import time
+from collections import OrderedDict
+
+import matplotlib.ticker
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Patch
+
+from utils.instrumentation import CHART_RENDER_SECONDS
+from utils.mpl_config import configure_matplotlib
+
+configure_matplotlib()
+
+# AQI 分级：(下限, 上限, 颜色, 图例)，上限为 None 表示不封顶
+AQI_LEVELS = [
+    (0, 50, "green", "0-50：优"),
+    (50, 100, "yellow", "50-100：良"),
+    (100, 150, "orange", "100-150：轻度污染"),
+    (150, 200, "red", "150-200：中度污染"),
+    (200, 300, "purple", "200-300：重度污染"),
+    (300, None, "brown", ">300：严重污染"),
+]
+
+
+def aqi_upper(max_aqi):
+    """依据最大 AQI 取所在档位的上限作为 y 轴上限，超过 300 时留出 10 的余量"""
+    for _, high, _, _ in AQI_LEVELS:
+        if high is not None and max_aqi <= high:
+            return high
+    return max_aqi + 10
+
+
+class LineChart:
+    """
+    单个坐标轴上的折线图：标题、坐标轴标签与网格只在创建时设置一次，
+    更新数据时原地修改 Line2D 与标注文字，由 ChartCanvas 决定整图重绘还是只重绘数据。
+    """
+
+    def __init__(self, ax, title, xlabel, ylabel, lines, annotate=False, legend=False, yformatter=None):
+        """
+        lines: [(图例名称, 颜色), ...]，颜色为 None 时使用默认配色
+        annotate: 是否在第一条折线的数据点上方标注文字
+        legend: 是否显示折线图例
+        yformatter: 可选的 y 轴刻度格式化函数 (value, pos) -> str
+        """
+        self.ax = ax
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.grid(True)
+        if yformatter is not None:
+            ax.yaxis.set_major_formatter(matplotlib.ticker.FuncFormatter(yformatter))
+
+        # 数据相关的图形设为 animated，不进入缓存的背景，可单独重绘
+        self.lines = [
+            ax.plot([], [], marker='o', label=label, color=color, animated=True)[0]
+            for label, color in lines
+        ]
+        if legend:
+            ax.legend()
+        self.annotate = annotate
+        self.annotations = []  # 复用的标注文字对象
+        self.message = ax.text(0.5, 0.5, "", transform=ax.transAxes, ha='center', va='center',
+                               fontsize=12, color='red', visible=False)
+
+        self.xticklabels = None
+        self.drawn_layout = None  # 上次整图绘制时的坐标范围、刻度与提示文字
+        self.invalidated = True
+
+    def set_data(self, x, ys, annotations=None, xticks=None, xticklabels=None, rotation=0, ylim=None):
+        """
+        x: 横坐标数值序列
+        ys: 与 lines 一一对应的纵坐标序列
+        annotations: 与 x 等长的标注文字，元素为 None 的数据点不标注
+        xticks/xticklabels: 横轴刻度位置与文字，None 表示自动刻度
+        ylim: 固定的纵轴范围，None 表示按数据自动缩放
+        """
+        self.message.set_visible(False)
+        for line, y in zip(self.lines, ys):
+            line.set_data(x, y)
+            line.set_visible(True)
+        self._set_annotations(x, ys[0] if self.annotate and ys else None, annotations)
+
+        ax = self.ax
+        if xticks is not None:
+            ax.set_xticks(xticks)
+            ax.set_xticklabels(xticklabels, rotation=rotation, ha='right' if rotation else 'center')
+            self.xticklabels = tuple(xticklabels)
+        ax.set_autoscale_on(True)
+        ax.relim(visible_only=True)  # 忽略隐藏的图形，如暂不显示的 AQI 背景色
+        ax.autoscale_view()
+        if ylim is not None:
+            ax.set_ylim(*ylim)
+
+    def show_message(self, text):
+        """隐藏数据，在坐标轴中央显示提示文字"""
+        for artist in self.lines + self.annotations:
+            artist.set_visible(False)
+        self.message.set_text(text)
+        self.message.set_visible(True)
+
+    def set_labels(self, title=None, ylabel=None):
+        if title is not None and title != self.ax.get_title():
+            self.ax.set_title(title)
+            self.invalidate()
+        if ylabel is not None and ylabel != self.ax.get_ylabel():
+            self.ax.set_ylabel(ylabel)
+            self.invalidate()
+
+    def invalidate(self):
+        """坐标轴的静态装饰有变化，下次渲染时整图重绘"""
+        self.invalidated = True
+
+    def _set_annotations(self, x, y, texts):
+        texts = texts if y is not None and texts is not None else []
+        while len(self.annotations) < len(texts):
+            self.annotations.append(self.ax.annotate(
+                "", (0, 0), textcoords="offset points", xytext=(0, 10), ha='center', animated=True
+            ))
+        for i, annotation in enumerate(self.annotations):
+            visible = i < len(texts) and texts[i] is not None and not _is_nan(y[i])
+            annotation.set_visible(visible)
+            if visible:
+                annotation.set_text(texts[i])
+                annotation.xy = (x[i], y[i])
+
+    def animated_artists(self):
+        return [artist for artist in self.lines + self.annotations if artist.get_visible()]
+
+    def layout(self):
+        return (
+            tuple(self.ax.get_xlim()), tuple(self.ax.get_ylim()), self.xticklabels,
+            self.message.get_visible(), self.message.get_text(),
+        )
+
+    def needs_full_draw(self):
+        return self.invalidated or self.layout() != self.drawn_layout
+
+    def mark_drawn(self):
+        self.drawn_layout = self.layout()
+        self.invalidated = False
+
+
+class AqiBands:
+    """AQI 折线图的分级背景色与图例，y 轴上限不变时不重建，切换图表时只隐藏"""
+
+    def __init__(self, chart, legend_loc):
+        self.chart = chart
+        self.legend_loc = legend_loc
+        self.upper = None
+        self.artists = []
+
+    def update(self, max_aqi):
+        """按最大 AQI 绘制背景色与图例，返回 y 轴上限"""
+        upper = aqi_upper(max_aqi)
+        if upper == self.upper:
+            self.set_visible(True)
+            return upper
+
+        self.clear()
+        ax = self.chart.ax
+        patches = []
+        for low, high, color, label in AQI_LEVELS:
+            if low >= upper:
+                break  # 超过 y 轴上限的档位不再绘制
+            self.artists.append(ax.axhspan(low, min(high or upper, upper), facecolor=color, alpha=0.15))
+            patches.append(Patch(facecolor=color, alpha=0.15, label=label))
+        self.artists.append(ax.legend(handles=patches, loc=self.legend_loc, title="污染等级", fancybox=True))
+        self.upper = upper
+        self.chart.invalidate()
+        return upper
+
+    def set_visible(self, visible):
+        """隐藏或重新显示背景色与图例，不重建"""
+        for artist in self.artists:
+            if artist.get_visible() != visible:
+                artist.set_visible(visible)
+                self.chart.invalidate()
+
+    def clear(self):
+        for artist in self.artists:
+            artist.remove()
+        if self.artists:
+            self.chart.invalidate()
+        self.artists = []
+        self.upper = None
+
+
+class ChartCanvas(FigureCanvasQTAgg):
+    """
+    支持 blit 的图表画布：整图重绘时缓存不含数据的背景，
+    之后仅数据变化（坐标范围与刻度不变）时恢复背景并只重绘折线与标注。
+
+    render 可传入缓存键，渲染结果按键缓存为位图，再次渲染同一键时直接贴回；
+    窗口缩放后位图全部失效。
+    """
+
+    def __init__(self, figsize, max_bitmaps=8, widget_name=None):
+        """widget_name: 记录渲染耗时时使用的名称，默认为所在窗口的类名"""
+        super().__init__(Figure(figsize=figsize))
+        self.charts = []
+        self.background = None
+        self.bitmaps = OrderedDict()  # 缓存键 -> 渲染完成的整图位图，按最近使用排序
+        self.max_bitmaps = max_bitmaps
+        self.full_draws = 0
+        self.blits = 0
+        self.bitmap_hits = 0
+        self.last_render_time = 0.0  # 最近一次渲染耗时（秒）
+        self.widget_name = widget_name
+        self.mpl_connect("draw_event", self._on_draw)
+        self.mpl_connect("resize_event", lambda event: self.clear_bitmaps())
+
+    def add_chart(self, position, *args, **kwargs):
+        """添加一个子图，参数同 LineChart"""
+        chart = LineChart(self.figure.add_subplot(position), *args, **kwargs)
+        self.charts.append(chart)
+        return chart
+
+    def render(self, cache_key=None):
+        """
+        数据更新后调用。
+        cache_key: 可选，命中缓存时直接贴回该键之前渲染好的位图，调用方需保证同一键对应的图表内容不变
+        """
+        start = time.perf_counter()
+        bitmap = self.bitmaps.get(cache_key) if cache_key is not None else None
+        if bitmap is not None:
+            self.bitmap_hits += 1
+            self.bitmaps.move_to_end(cache_key)
+            self.restore_region(bitmap)
+            self.blit(self.figure.bbox)
+        else:
+            if self.background is None or any(chart.needs_full_draw() for chart in self.charts):
+                self.full_draws += 1
+                self.draw()
+            else:
+                self.blits += 1
+                self.restore_region(self.background)
+                self._draw_animated()
+                self.blit(self.figure.bbox)
+            if cache_key is not None:
+                self.bitmaps[cache_key] = self.copy_from_bbox(self.figure.bbox)
+                while len(self.bitmaps) > self.max_bitmaps:
+                    self.bitmaps.popitem(last=False)
+        self.last_render_time = time.perf_counter() - start
+        CHART_RENDER_SECONDS.observe(self.last_render_time, widget=self.widget_name or type(self.window()).__name__)
+
+    def clear_bitmaps(self):
+        """数据或画布尺寸变化后，丢弃全部缓存的位图"""
+        self.bitmaps.clear()
+
+    def _on_draw(self, event):
+        # 整图重绘（包括窗口缩放）后重新缓存背景，再画上数据
+        self.background = self.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+        for chart in self.charts:
+            chart.mark_drawn()
+
+    def _draw_animated(self):
+        for chart in self.charts:
+            for artist in chart.animated_artists():
+                self.figure.draw_artist(artist)
+
+
+def _is_nan(value):
+    return value != value  # NaN 不等于自身
@@ -0,0 +1,226 @@
+"""
+无界面的命令行批量拉取：对一组城市（或港口等）调用任意接口，结果写为 JSON Lines 或 CSV。
+与桌面程序共用 ApiClient 的并发、缓存与限流，不导入 PyQt6 与 matplotlib，可在无显示环境中由 cron 调用。
+
+用法示例:
+    python -m utils.cli --list
+    python -m utils.cli fetch_current_weather beijing shanghai -k YOUR_KEY
+    python -m utils.cli fetch_daily_forecast -f cities.txt -p days=3 --format csv -o daily.csv
+    python -m utils.cli fetch_tides_forecast 永兴岛 --cache-db ~/.cache/skytracker.sqlite3
+
+API Key 也可通过环境变量 SKYTRACKER_API_KEY 传入。
+全部成功时退出码为 0，有任一项失败时为 1。
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+from utils.api_client import ApiClient
+from utils.disk_cache import DiskCache
+from utils.endpoints import API_KEY_ENV, ENDPOINTS, REQUIRED, redact_api_key
+from utils.instrumentation import MetricsHook
+from utils.metrics import MetricsRegistry
+from utils.rate_limiter import RateLimiter
+
+
+def target_param(endpoint):
+    """接口的目标参数名（第一个必填参数，如 location、port、query），没有必填参数时返回 None"""
+    for name, default in endpoint.params:
+        if default is REQUIRED:
+            return name
+    return None
+
+
+def parse_params(pairs):
+    """将 name=value 形式的参数列表解析为字典"""
+    params = {}
+    for pair in pairs:
+        name, sep, value = pair.partition("=")
+        if not sep or not name:
+            raise ValueError(f"参数格式应为 name=value: {pair}")
+        params[name] = value
+    return params
+
+
+def positive_int(value):
+    """argparse 的参数类型：正整数"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"应为正整数: {value}")
+    return number
+
+
+def read_targets(args):
+    """命令行与文件中的目标，文件每行一个，忽略空行与 # 开头的注释，'-' 表示标准输入"""
+    targets = list(args.targets)
+    for path in args.targets_file or []:
+        f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        with f:
+            targets.extend(line.strip() for line in f if line.strip() and not line.lstrip().startswith("#"))
+    return targets
+
+
+def flatten(data, prefix=""):
+    """将嵌套的 JSON 展平为 {"a.b.0.c": 值}，用于 CSV 列"""
+    if isinstance(data, dict):
+        items = data.items()
+    elif isinstance(data, list):
+        items = enumerate(data)
+    else:
+        return {prefix: data}
+
+    flat = {}
+    for key, value in items:
+        flat.update(flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+    return flat
+
+
+def result_record(result, name):
+    """BatchResult 转为输出记录"""
+    return {
+        "index": result.index,
+        "target": result.params.get(name) if name else None,
+        "params": result.params,
+        "ok": result.ok,
+        "data": result.data,
+        # requests 的异常信息含完整 URL，其中的 Key 不能写入输出
+        "error": None if result.ok else f"{type(result.error).__name__}: {redact_api_key(result.error)}",
+    }
+
+
+def write_jsonl(records, out):
+    """按完成顺序逐行写出，每写一行立即刷新，便于管道下游流式处理"""
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+
+
+def write_csv(records, out):
+    """按输入顺序写出，每项一行，data 展平为列"""
+    records = sorted(records, key=lambda record: record["index"])
+    rows = []
+    columns = {"target": None, "ok": None, "error": None}  # 按首次出现顺序保留列名
+    for record in records:
+        row = {"target": record["target"], "ok": record["ok"], "error": record["error"]}
+        row.update(flatten(record["data"]) if record["data"] is not None else {})
+        columns.update(dict.fromkeys(row))
+        rows.append(row)
+
+    writer = csv.DictWriter(out, fieldnames=list(columns))
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def list_endpoints(out):
+    for endpoint in ENDPOINTS.values():
+        params = ", ".join(
+            name if default is REQUIRED else f"{name}={default}" for name, default in endpoint.params
+        )
+        out.write(f"{endpoint.name}({params})\n    {endpoint.doc}\n")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.cli",
+        description="无界面批量调用心知天气接口，结果写为 JSON Lines 或 CSV",
+    )
+    parser.add_argument("endpoint", nargs="?", help="接口名，如 fetch_current_weather，--list 查看全部")
+    parser.add_argument("targets", nargs="*", help="城市、港口等目标，对应接口的第一个必填参数")
+    parser.add_argument("-f", "--targets-file", action="append", help="目标列表文件，每行一个，'-' 表示标准输入")
+    parser.add_argument("-p", "--param", action="append", default=[], help="其余接口参数，name=value，可重复")
+    parser.add_argument("-k", "--key", help=f"API Key，默认读取环境变量 {API_KEY_ENV}")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl", help="输出格式，默认 jsonl")
+    parser.add_argument("-o", "--output", help="输出文件，默认标准输出")
+    parser.add_argument("-j", "--workers", type=positive_int, default=8, help="并发请求数，默认 8")
+    parser.add_argument("--per-minute", type=int, help="每分钟调用上限")
+    parser.add_argument("--daily-quota", type=int, help="每日调用上限")
+    parser.add_argument("--quota-file", help="每日调用计数文件，多次运行共享配额")
+    parser.add_argument("--cache-db", help="持久化响应缓存的 SQLite 文件，多次运行共享缓存")
+    parser.add_argument("--no-cache", action="store_true", help="不使用内存缓存")
+    parser.add_argument("--offline", action="store_true", help="只读取 --cache-db 中的数据（含已过期的），不访问网络")
+    parser.add_argument("--base-url", help="接口地址，如本地缓存代理 http://127.0.0.1:8780/v3，默认使用心知天气官方地址")
+    parser.add_argument("--metrics-file", help="结束时将各阶段耗时等指标以 Prometheus 文本格式写入该文件")
+    parser.add_argument("--list", action="store_true", help="列出全部接口及参数")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.list:
+        list_endpoints(sys.stdout)
+        return 0
+    if not args.endpoint:
+        parser.error("请指定接口名，或使用 --list 查看全部接口")
+    endpoint = ENDPOINTS.get(args.endpoint)
+    if endpoint is None:
+        parser.error(f"未知的接口: {args.endpoint}")
+
+    api_key = args.key or os.environ.get(API_KEY_ENV)
+    if not api_key:
+        parser.error(f"请通过 --key 或环境变量 {API_KEY_ENV} 提供 API Key")
+    if args.offline and not args.cache_db:
+        parser.error("--offline 需要与 --cache-db 一起使用")
+
+    try:
+        extra = parse_params(args.param)
+        targets = read_targets(args)
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+
+    name = target_param(endpoint)
+    if name is None:
+        param_sets = [extra]  # 无必填参数的接口只调用一次
+    elif not targets:
+        parser.error(f"接口 {endpoint.name} 需要至少一个 {name}")
+    elif name in extra:
+        parser.error(f"{name} 应作为目标传入，不能通过 -p 指定")
+    else:
+        param_sets = [{name: target, **extra} for target in targets]
+
+    # 提前校验参数，避免每项都以相同的参数错误失败
+    unknown = set(extra) - {param for param, _ in endpoint.params}
+    if unknown:
+        parser.error(f"接口 {endpoint.name} 不支持参数: {', '.join(sorted(unknown))}")
+
+    rate_limiter = None
+    if args.per_minute or args.daily_quota or args.quota_file:
+        rate_limiter = RateLimiter(per_minute=args.per_minute, daily_quota=args.daily_quota,
+                                   quota_path=args.quota_file)
+    disk_cache = DiskCache(args.cache_db) if args.cache_db else None
+    metrics = MetricsRegistry() if args.metrics_file else None
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    failed = 0
+    try:
+        with ApiClient(cache=not args.no_cache, disk_cache=disk_cache, rate_limiter=rate_limiter,
+                       pool_maxsize=args.workers, base_url=args.base_url,
+                       hooks=[MetricsHook(metrics)] if metrics else (), offline=args.offline) as api_client:
+            api_client.set_api_key(api_key)
+
+            records = []
+            for result in api_client.iter_many(endpoint.name, param_sets, max_workers=args.workers):
+                record = result_record(result, name)
+                failed += not record["ok"]
+                if args.format == "jsonl":
+                    write_jsonl([record], out)
+                else:
+                    records.append(record)
+            if args.format == "csv":
+                write_csv(records, out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if metrics is not None:
+            metrics.write_prometheus(args.metrics_file)
+
+    if failed:
+        print(f"{failed}/{len(param_sets)} 项失败", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
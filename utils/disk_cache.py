@@ -0,0 +1,144 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from utils.response_cache import ResponseCache
+
+
+def extract_last_update(data):
+    """提取响应中上游的 last_update 字段，不存在时返回 None"""
+    results = data.get('results') if isinstance(data, dict) else None
+    if isinstance(results, list) and results and isinstance(results[0], dict):
+        return results[0].get('last_update')
+    return None
+
+
+class DiskCache:
+    """基于 SQLite（WAL 模式）的持久化响应缓存，重启后仍可使用"""
+
+    def __init__(self, path, max_bytes=64 * 1024 * 1024, max_age=7 * 24 * 60 * 60, clock=time.time):
+        """
+        path: SQLite 数据库文件路径
+        max_bytes: 缓存响应体的总字节数上限
+        max_age: 超过该时长（秒）的条目在压缩时删除
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._compacting = False
+        self._closed = False
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_update TEXT,
+                ttl REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_fetched_at ON responses (fetched_at)")
+
+    @staticmethod
+    def make_key(path, params):
+        return json.dumps(ResponseCache.make_key(path, params), ensure_ascii=False)
+
+    def close(self):
+        """关闭连接；正在进行的清理会被中断（VACUUM 自动回滚），不必等待其完成"""
+        self._closed = True
+        while not self._lock.acquire(timeout=0.05):
+            if self._compacting:
+                self._conn.interrupt()
+        try:
+            self._conn.close()
+        finally:
+            self._lock.release()
+
+    def get(self, path, params, allow_stale=False):
+        """
+        返回 (data, fetched_at, ttl, size)，未命中时返回 None。
+        allow_stale 为 True 时忽略有效期（用于离线模式）。
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, fetched_at, ttl, size FROM responses WHERE key = ?",
+                (self.make_key(path, params),)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        body, fetched_at, ttl, size = row
+        if not allow_stale and fetched_at + ttl <= self.clock():
+            return None
+        return json.loads(body), fetched_at, ttl, size
+
+    def put(self, path, params, body, ttl, last_update=None):
+        """写入原始 JSON 响应文本"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, path, body, size, fetched_at, last_update, ttl) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.make_key(path, params), path, body, len(body.encode("utf-8")), self.clock(), last_update, ttl)
+            )
+
+    def compact(self, vacuum_ratio=0.25):
+        """
+        删除过旧的条目，并按最早写入顺序淘汰直到总大小低于上限。
+        vacuum_ratio: 空闲页超过文件总页数的该比例时才执行 VACUUM 回收空间，大文件的 VACUUM 较慢
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._compacting = True
+            try:
+                self._compact(vacuum_ratio)
+            except sqlite3.OperationalError:
+                # 被 close 中断时放弃本次清理
+                if not self._closed:
+                    raise
+            finally:
+                self._compacting = False
+
+    def _compact(self, vacuum_ratio):
+        """compact 的实现，调用时需持有锁"""
+        self._conn.execute("DELETE FROM responses WHERE fetched_at < ?", (self.clock() - self.max_age,))
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total > self.max_bytes:
+            rows = self._conn.execute("SELECT key, size FROM responses ORDER BY fetched_at").fetchall()
+            expired_keys = []
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                expired_keys.append((key,))
+                total -= size
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", expired_keys)
+
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        pages = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if free_pages > pages * vacuum_ratio and not self._closed:
+            self._conn.execute("VACUUM")
+            # WAL 模式下 VACUUM 的结果先写入 WAL，检查点后文件才会缩小
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def stats(self):
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {"entries": entries, "bytes": total}
@@ -0,0 +1,181 @@
+import inspect
+import re
+from dataclasses import dataclass, field
+from functools import partial
+
+REQUIRED = inspect.Parameter.empty  # 必填参数
+DEFAULT_BASE_URL = "https://api.seniverse.com/v3"  # 心知天气官方接口地址
+API_KEY_ENV = "SKYTRACKER_API_KEY"  # 命令行工具与缓存代理读取 API Key 的环境变量
+
+_KEY_PARAM = re.compile(r"([?&]key=)[^&\s'\"]*")
+
+
+def redact_api_key(text):
+    """隐去文本（如 requests 异常信息中的 URL）里 key 参数的值"""
+    return _KEY_PARAM.sub(r"\1***", str(text))
+
+
+def extract_first_result(result, message):
+    """提取 results 中的第一条数据"""
+    results = result.get('results', [{}])
+    if not results:
+        raise ValueError(message)
+
+    return results[0]  # 返回第一条数据
+
+
+def extract_lifestyle_index(result):
+    """提取第一天的生活指数数据"""
+    # 提取 results 数据
+    results = result.get('results', [])
+    if not results:
+        raise ValueError("API 响应中无结果数据")
+
+    # 获取 suggestion 列表
+    suggestion_list = results[0].get('suggestion', [])
+    if not suggestion_list or not isinstance(suggestion_list, list):
+        raise ValueError("suggestion 数据格式不正确")
+
+    # 返回 suggestion 列表的第一个元素
+    first_suggestion = suggestion_list[0]
+    if not isinstance(first_suggestion, dict):
+        raise ValueError("第一天的生活指数数据格式不正确")
+
+    return first_suggestion
+
+
+def extract_lunar_calendar(result):
+    """提取第一天的农历节气生肖数据"""
+    chinese_calendar = result.get('results', {}).get('chinese_calendar', [])
+    if not chinese_calendar:
+        raise ValueError("No chinese_calendar data found")
+
+    return chinese_calendar[0]  # 返回第一天的数据
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """一个心知天气接口的声明：路径、参数及默认值、缓存有效期、限流接口族和结果提取函数"""
+
+    name: str  # ApiClient 上的方法名
+    path: str
+    params: tuple  # ((参数名, 默认值), ...)，默认值为 REQUIRED 表示必填
+    doc: str
+    ttl: int  # 缓存有效期（秒）
+    extract: object = None  # 结果提取函数，None 表示返回完整 JSON
+    family: str = None  # 限流接口族，默认取路径第一段
+    rename: tuple = ()  # ((方法参数名, 请求参数名), ...)，两者不一致时使用
+    signature: inspect.Signature = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.family is None:
+            object.__setattr__(self, "family", self.path.strip("/").split("/", 1)[0])
+        object.__setattr__(self, "signature", inspect.Signature([
+            inspect.Parameter(name, inspect.Parameter.POSITIONAL_OR_KEYWORD, default=default)
+            for name, default in self.params
+        ]))
+
+    def bind(self, *args, **kwargs):
+        """按方法签名将参数绑定为请求参数字典，参数不合法时抛出 TypeError"""
+        bound = self.signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        params = dict(bound.arguments)
+        for name, wire_name in self.rename:
+            params[wire_name] = params.pop(name)
+        return params
+
+    def normalize(self, params):
+        """
+        补齐未给出的默认值，params 与返回值均使用请求参数名。
+        只差显式给出默认值的请求（如 language=zh-Hans 与省略）由此得到相同的缓存键。
+        """
+        wire_names = dict(self.rename)
+        normalized = {
+            wire_names.get(name, name): default for name, default in self.params
+            if default is not REQUIRED and default is not None
+        }
+        normalized.update(params)
+        return normalized
+
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+ENDPOINTS = {endpoint.name: endpoint for endpoint in [
+    # 天气类
+    Endpoint("fetch_current_weather", "/weather/now.json",
+             (("location", REQUIRED), ("language", "zh-Hans"), ("unit", "c")),
+             "获取天气实况数据", 5 * MINUTE),
+    Endpoint("fetch_daily_forecast", "/weather/daily.json",
+             (("location", REQUIRED), ("days", 5), ("language", "zh-Hans"), ("unit", "c"), ("start", 0)),
+             "获取逐日天气预报数据", HOUR),
+    Endpoint("fetch_hourly_forecast", "/weather/hourly.json",
+             (("location", REQUIRED), ("hours", 24), ("language", "zh-Hans"), ("unit", "c"), ("start", 0)),
+             "获取逐小时天气预报数据", 30 * MINUTE),
+    Endpoint("fetch_hourly_history", "/weather/hourly_history.json",
+             (("location", REQUIRED), ("language", "zh-Hans"), ("unit", "c")),
+             "获取过去24小时历史天气数据", 30 * MINUTE),
+    Endpoint("fetch_weather_alerts", "/weather/alarm.json",
+             (("location", REQUIRED), ("detail", "more")),
+             "获取气象灾害预警数据", 5 * MINUTE),
+
+    # 空气类
+    Endpoint("fetch_current_air_quality", "/air/now.json",
+             (("location", REQUIRED), ("language", "zh-Hans"), ("scope", "city")),
+             "获取空气质量实况数据", 10 * MINUTE),
+    Endpoint("fetch_air_quality_ranking", "/air/ranking.json",
+             (("language", "zh-Hans"),),
+             "获取空气质量城市排名数据", 10 * MINUTE),
+    Endpoint("fetch_hourly_air_quality", "/air/hourly_history.json",
+             (("location", REQUIRED), ("language", "zh-Hans"), ("scope", "city")),
+             "获取过去24小时空气质量历史数据", 30 * MINUTE),
+    Endpoint("fetch_daily_air_quality", "/air/daily.json",
+             (("location", REQUIRED), ("language", "zh-Hans")),
+             "获取逐日空气质量预报数据", HOUR),
+    Endpoint("fetch_hourly_air_quality_forecast", "/air/hourly.json",
+             (("location", REQUIRED), ("language", "zh-Hans")),
+             "获取逐小时空气质量预报数据", 30 * MINUTE),
+
+    # 生活类
+    Endpoint("fetch_lifestyle_index", "/life/suggestion.json",
+             (("location", REQUIRED), ("language", "zh-Hans"), ("days", 1)),
+             "获取生活指数数据", HOUR, extract_lifestyle_index),
+    Endpoint("fetch_lunar_calendar", "/life/chinese_calendar.json",
+             (("start", 0), ("days", 1)),
+             "获取农历节气生肖数据", DAY, extract_lunar_calendar),
+    Endpoint("fetch_vehicle_restriction", "/life/driving_restriction.json",
+             (("location", REQUIRED),),
+             "获取机动车尾号限行数据", 6 * HOUR,
+             partial(extract_first_result, message="No vehicle restriction data found")),
+
+    # 海洋类
+    Endpoint("fetch_tides_forecast", "/tide/daily.json",
+             (("port", REQUIRED),),
+             "获取逐小时潮汐预报数据", 6 * HOUR,
+             partial(extract_first_result, message="No tide data found")),
+
+    # 地理类
+    Endpoint("fetch_sun_times", "/geo/sun.json",
+             (("location", REQUIRED), ("days", 1), ("language", "zh-Hans"), ("start", 0)),
+             "获取日出日落时间数据", DAY,
+             partial(extract_first_result, message="No sun times data found")),
+    Endpoint("fetch_moon_times", "/geo/moon.json",
+             (("location", REQUIRED), ("days", 1), ("language", "zh-Hans"), ("start", 0)),
+             "获取月出月落和月相数据", DAY,
+             partial(extract_first_result, message="No moon times data found")),
+
+    # 辅助类
+    Endpoint("search_city", "/location/search.json",
+             (("query", REQUIRED),),
+             "搜索城市", 7 * DAY, rename=(("query", "q"),)),
+]}
+
+ENDPOINTS_BY_PATH = {endpoint.path: endpoint for endpoint in ENDPOINTS.values()}
+
+
+def get_endpoint(name):
+    endpoint = ENDPOINTS.get(name)
+    if endpoint is None:
+        raise ValueError(f"未知的接口: {name}")
+    return endpoint
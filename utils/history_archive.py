@@ -0,0 +1,307 @@
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from utils.timeseries import TimeSeries, normalize_hourly
+
+
+def extract_weather_history(data):
+    """提取过去 24 小时历史天气的逐小时记录"""
+    return data.get('results', [{}])[0].get('hourly_history', [])
+
+
+def extract_air_history(data):
+    """提取过去 24 小时空气质量的逐小时记录，城市整体数据位于 city 字段"""
+    return [item.get('city', item) for item in data.get('results', [{}])[0].get('hourly_history', [])]
+
+
+@dataclass(frozen=True)
+class HistoryDataset:
+    """一类可归档的历史数据：获取方法、记录提取函数、时间字段与数值字段"""
+
+    name: str
+    fetch: str  # ApiClient 上的方法名
+    extract: object  # 响应 JSON -> 记录列表
+    time_key: str
+    fields: tuple
+
+
+DATASETS = {dataset.name: dataset for dataset in [
+    HistoryDataset("weather", "fetch_hourly_history", extract_weather_history, "last_update",
+                   ("temperature", "feels_like", "pressure", "humidity", "visibility",
+                    "wind_speed", "clouds", "dew_point")),
+    HistoryDataset("air", "fetch_hourly_air_quality", extract_air_history, "last_update",
+                   ("aqi", "pm25", "pm10", "so2", "no2", "co", "o3")),
+]}
+
+
+class HistoryArchive:
+    """
+    只追加、按小时去重的本地列式时间序列存储，每个数据集与城市一个目录：
+    - manifest.json：列名与已封存分块的时间范围
+    - open_<列名>.npy：正在写入的开放分块，每列一个文件，读取时内存映射
+    - chunk_<序号>.npz：累积到 chunk_rows 行后压缩封存的分块，之后不再修改
+
+    时间戳按小时取整后去重，已存在的小时保留先写入的数据；
+    早于最后一个封存分块的迟到数据直接丢弃。
+    """
+
+    def __init__(self, root, chunk_rows=24 * 7, cache_chunks=8):
+        """
+        root: 归档根目录
+        chunk_rows: 开放分块累积到多少行后封存，默认一周
+        cache_chunks: 在内存中保留的解压后封存分块数量
+        """
+        os.makedirs(root, exist_ok=True)
+        self.root = root
+        self.chunk_rows = chunk_rows
+        self.cache_chunks = cache_chunks
+
+        self._lock = threading.Lock()
+        self._chunk_cache = OrderedDict()  # 分块文件路径 -> TimeSeries
+
+    def append(self, dataset, city, series):
+        """写入一段数据，返回新增的行数"""
+        with self._lock:
+            directory = self._directory(dataset, city)
+            manifest = self._load_manifest(directory, dataset, city)
+            if not manifest["columns"]:
+                manifest["columns"] = list(series.values)
+            columns = manifest["columns"]
+
+            # 按小时取整去重（不补齐缺失的小时），丢弃早于封存分块的数据
+            series = normalize_hourly(series, fill_gaps=False)
+            open_start = self._open_start(manifest)
+            series = series.between(open_start)
+            incoming = TimeSeries(series.timestamps, {
+                name: series.values[name] if name in series.values
+                else np.full(len(series), np.nan, dtype=np.float32)
+                for name in columns
+            })
+
+            # 与开放分块合并：稳定排序后取每个小时的第一行，已写入的数据优先
+            current = self._read_open(directory, columns, copy=True).between(open_start)
+            merged = TimeSeries.concat([current, incoming])
+            order = np.argsort(merged.timestamps, kind="stable")
+            _, first = np.unique(merged.timestamps[order], return_index=True)
+            merged = merged[order[first]]
+            added = len(merged) - len(current)
+            if added == 0:
+                return 0
+
+            while len(merged) >= self.chunk_rows:
+                self._seal(directory, manifest, merged[:self.chunk_rows])
+                merged = merged[self.chunk_rows:]
+            # 先记录封存的分块再改写开放分块：中途退出时开放分块中已封存的行在读取时跳过
+            manifest["open_rows"] = len(merged)
+            self._write_manifest(directory, manifest)
+            self._write_open(directory, columns, merged)
+            return added
+
+    def query(self, dataset, city, start=None, end=None, resample=None, how="mean"):
+        """
+        返回时间在 [start, end) 内的数据（按时间排序的 TimeSeries），没有数据时返回空序列。
+        resample: 可选的降采样时间单位，如 'D'（天），数值按 how 聚合
+        """
+        with self._lock:
+            directory = self._directory(dataset, city)
+            manifest = self._load_manifest(directory, dataset, city)
+            columns = manifest["columns"]
+            lo = None if start is None else np.datetime64(start, "s")
+            hi = None if end is None else np.datetime64(end, "s")
+
+            parts = []
+            for chunk in manifest["chunks"]:
+                # 只读取与查询范围重叠的封存分块
+                if (hi is not None and np.datetime64(chunk["start"], "s") >= hi) or \
+                        (lo is not None and np.datetime64(chunk["end"], "s") < lo):
+                    continue
+                parts.append(self._load_chunk(os.path.join(directory, chunk["file"]), columns).between(lo, hi))
+            open_start = self._open_start(manifest)
+            if lo is None or (open_start is not None and open_start > lo):
+                lo = open_start
+            parts.append(self._read_open(directory, columns, copy=False).between(lo, hi))
+            # 复制出查询结果，释放内存映射后才允许写入替换开放分块的文件
+            series = TimeSeries.concat(parts)
+            del parts
+
+        return series.resample(resample, how) if resample else series
+
+    def cities(self, dataset):
+        """已归档的城市列表"""
+        root = os.path.join(self.root, dataset)
+        if not os.path.isdir(root):
+            return []
+        cities = []
+        for name in sorted(os.listdir(root)):
+            path = os.path.join(root, name, "manifest.json")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    cities.append(json.load(f)["city"])
+        return cities
+
+    def size_bytes(self):
+        """归档占用的磁盘空间（字节）"""
+        return sum(
+            os.path.getsize(os.path.join(directory, name))
+            for directory, _, names in os.walk(self.root) for name in names
+        )
+
+    def _directory(self, dataset, city):
+        if dataset not in DATASETS:
+            raise ValueError(f"未知的历史数据集: {dataset}")
+        # 城市名中的路径分隔符等字符替换为下划线
+        return os.path.join(self.root, dataset, re.sub(r"[^\w\-]", "_", city))
+
+    @staticmethod
+    def _open_start(manifest):
+        """开放分块中有效数据的起始时间：最后一个封存分块之后的下一小时，没有封存分块时为 None"""
+        if not manifest["chunks"]:
+            return None
+        return np.datetime64(manifest["chunks"][-1]["end"], "s") + np.timedelta64(1, "h")
+
+    @staticmethod
+    def _load_manifest(directory, dataset, city):
+        path = os.path.join(directory, "manifest.json")
+        if not os.path.exists(path):
+            return {"dataset": dataset, "city": city, "columns": [], "chunks": [], "open_rows": 0}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_manifest(directory, manifest):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, "manifest.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(path + ".tmp", path)  # 原子替换，写入中断时保留旧清单
+
+    @staticmethod
+    def _read_open(directory, columns, copy):
+        """读取开放分块；copy 为 False 时返回内存映射的只读数组"""
+        path = os.path.join(directory, "open_timestamps.npy")
+        if not os.path.exists(path):
+            return TimeSeries([], {name: [] for name in columns})
+        load = np.load if copy else lambda file: np.load(file, mmap_mode="r")
+        return TimeSeries(
+            load(path),
+            {name: load(os.path.join(directory, f"open_{name}.npy")) for name in columns},
+        )
+
+    @staticmethod
+    def _write_open(directory, columns, series):
+        os.makedirs(directory, exist_ok=True)
+        arrays = {"timestamps": series.timestamps, **{name: series[name] for name in columns}}
+        for name, array in arrays.items():
+            path = os.path.join(directory, f"open_{name}.npy")
+            with open(path + ".tmp", "wb") as f:
+                np.save(f, array)
+            os.replace(path + ".tmp", path)
+
+    def _seal(self, directory, manifest, series):
+        """压缩封存一个分块并记入清单"""
+        os.makedirs(directory, exist_ok=True)  # 新城市首次写入即超过 chunk_rows 时目录尚未创建
+        name = f"chunk_{len(manifest['chunks']):05d}.npz"
+        path = os.path.join(directory, name)
+        with open(path + ".tmp", "wb") as f:
+            np.savez_compressed(f, timestamps=series.timestamps, **series.values)
+        os.replace(path + ".tmp", path)
+        manifest["chunks"].append({
+            "file": name,
+            "start": str(series.timestamps[0]),
+            "end": str(series.timestamps[-1]),
+            "rows": len(series),
+        })
+
+    def _load_chunk(self, path, columns):
+        series = self._chunk_cache.get(path)
+        if series is None:
+            with np.load(path) as chunk:
+                series = TimeSeries(chunk["timestamps"], {name: chunk[name] for name in columns})
+            self._chunk_cache[path] = series
+            while len(self._chunk_cache) > self.cache_chunks:
+                self._chunk_cache.popitem(last=False)
+        else:
+            self._chunk_cache.move_to_end(path)
+        return series
+
+
+class HistoryCollector:
+    """
+    后台线程：定期为关注列表中的城市拉取历史接口并写入 HistoryArchive。
+    接口只提供最近 24 小时的数据，采集间隔需明显短于 24 小时才不会留下空档。
+    """
+
+    def __init__(self, api_client, archive, cities=(), datasets=tuple(DATASETS), interval=6 * 60 * 60):
+        """
+        cities: 关注的城市列表
+        datasets: 采集的数据集名称，见 DATASETS
+        interval: 两轮采集之间的间隔（秒）
+        """
+        self.api_client = api_client
+        self.archive = archive
+        self.datasets = [DATASETS[name] for name in datasets]
+        self.interval = interval
+
+        self._cities = list(dict.fromkeys(cities))
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def cities(self):
+        with self._lock:
+            return list(self._cities)
+
+    def add_city(self, city):
+        with self._lock:
+            if city not in self._cities:
+                self._cities.append(city)
+
+    def remove_city(self, city):
+        with self._lock:
+            if city in self._cities:
+                self._cities.remove(city)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="HistoryCollector", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """停止采集；正在进行的请求完成后线程退出"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def collect_once(self):
+        """采集一轮，返回 {(数据集, 城市): 新增行数}，失败的项不在结果中"""
+        added = {}
+        for city in self.cities:
+            for dataset in self.datasets:
+                if self._stop.is_set():
+                    return added
+                try:
+                    data = getattr(self.api_client, dataset.fetch)(location=city)
+                    series = TimeSeries.from_records(dataset.extract(data), dataset.time_key, fields=dataset.fields)
+                    added[dataset.name, city] = self.archive.append(dataset.name, city, series)
+                except Exception as e:
+                    print(f"归档 {city} 的 {dataset.name} 历史数据失败: {e}")
+        return added
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.collect_once()
+            self._stop.wait(self.interval)
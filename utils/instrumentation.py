@@ -0,0 +1,192 @@
+"""
+ApiClient 的请求计时：每次调用结束后生成一个 RequestEvent，交给注册的钩子处理。
+
+各阶段耗时（秒，未发生的阶段为 None）：
+- queue_wait：在线程池中排队等待执行的时间（iter_many 与界面的 AsyncFetcher）
+- throttle：等待限流器放行的时间，含各次重试
+- connect：建立 TCP 连接，含 DNS 解析；复用连接时为 None
+- tls：TLS 握手，仅 HTTPS 新建连接时有值
+- ttfb：发出请求到收到响应头，主要是服务端处理与网络往返
+- transfer：读取响应正文
+- decode：JSON 解析
+
+图表的渲染耗时由 utils.charts.ChartCanvas 记录到模块级的 CHART_RENDER_SECONDS，
+需要导出时用 MetricsRegistry.register 注册。
+"""
+import threading
+import time
+from dataclasses import dataclass
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from utils.metrics import Histogram, MetricsRegistry
+
+_local = threading.local()
+
+# 各窗口的图表渲染耗时，widget 为图表所在窗口的类名
+CHART_RENDER_SECONDS = Histogram("skytracker_chart_render_seconds", "图表渲染耗时", ("widget",))
+
+
+@dataclass
+class RequestEvent:
+    """一次 ApiClient 调用的计时与结果"""
+
+    endpoint: str  # 接口名，未注册的路径为路径本身
+    path: str
+    cache: str = "miss"  # hit（内存）/ disk / stale（返回旧数据）/ coalesced（合并到并发的相同请求）/ miss（访问网络）
+    status: int = None  # HTTP 状态码，未访问网络时为 None
+    error: str = None  # 失败时的异常类型名
+    retries: int = 0
+    bytes: int = 0  # 响应正文字节数
+    connection_reused: bool = None  # 未访问网络时为 None
+    total: float = 0.0
+    queue_wait: float = None
+    throttle: float = None
+    connect: float = None
+    tls: float = None
+    ttfb: float = None
+    transfer: float = None
+    decode: float = None
+
+    PHASES = ("queue_wait", "throttle", "connect", "tls", "ttfb", "transfer", "decode")
+
+    def phases(self):
+        """已发生的阶段及耗时"""
+        return {name: getattr(self, name) for name in self.PHASES if getattr(self, name) is not None}
+
+
+class RequestHook:
+    """请求钩子的接口，按需重写；钩子在发起请求的线程中调用，应尽快返回"""
+
+    def request_started(self, endpoint):
+        """一次调用开始（进入缓存查找之前）"""
+
+    def request_finished(self, event):
+        """一次调用结束，event 为 RequestEvent"""
+
+
+class MetricsHook(RequestHook):
+    """将请求事件记录到 MetricsRegistry，指标名以 skytracker_api_ 开头"""
+
+    def __init__(self, registry=None):
+        self.registry = registry or MetricsRegistry()
+        self.requests = self.registry.counter(
+            "skytracker_api_requests_total", "ApiClient 调用次数", ("endpoint", "cache", "status"))
+        self.latency = self.registry.histogram(
+            "skytracker_api_request_seconds", "ApiClient 调用的总耗时（含缓存命中）", ("endpoint",))
+        self.phases = self.registry.histogram(
+            "skytracker_api_phase_seconds", "访问网络的各阶段耗时", ("endpoint", "phase"))
+        self.bytes = self.registry.counter(
+            "skytracker_api_response_bytes_total", "从网络接收的响应正文字节数", ("endpoint",))
+        self.retries = self.registry.counter(
+            "skytracker_api_retries_total", "重试次数", ("endpoint",))
+        self.connections = self.registry.counter(
+            "skytracker_api_connections_total", "访问网络时新建或复用的连接数", ("endpoint", "reused"))
+        self.in_flight = self.registry.gauge(
+            "skytracker_api_in_flight", "正在进行的 ApiClient 调用数")
+
+    def request_started(self, endpoint):
+        self.in_flight.inc()
+
+    def request_finished(self, event):
+        self.in_flight.dec()
+        status = event.error or (str(event.status) if event.status is not None else "none")
+        self.requests.inc(endpoint=event.endpoint, cache=event.cache, status=status)
+        self.latency.observe(event.total, endpoint=event.endpoint)
+        for phase, seconds in event.phases().items():
+            self.phases.observe(seconds, endpoint=event.endpoint, phase=phase)
+        if event.bytes:
+            self.bytes.inc(event.bytes, endpoint=event.endpoint)
+        if event.retries:
+            self.retries.inc(event.retries, endpoint=event.endpoint)
+        if event.connection_reused is not None:
+            self.connections.inc(endpoint=event.endpoint, reused=str(event.connection_reused).lower())
+
+
+class queued:
+    """
+    标记当前线程中即将执行的调用是从何时开始排队的，ApiClient 据此计算 queue_wait：
+        with queued(submitted_at):
+            api_client.call(...)
+    submitted_at 为提交任务时的 time.perf_counter()
+    """
+
+    def __init__(self, since):
+        self.since = since
+
+    def __enter__(self):
+        self.previous = getattr(_local, "queued_at", None)
+        _local.queued_at = self.since
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _local.queued_at = self.previous
+
+
+def take_queue_wait(started):
+    """当前调用的排队时长，只由最外层的调用取走一次"""
+    queued_at = getattr(_local, "queued_at", None)
+    if queued_at is None:
+        return None
+    _local.queued_at = None
+    return max(0.0, started - queued_at)
+
+
+def reset_connect_timing():
+    _local.connect = None
+    _local.tls = None
+
+
+def connect_timing():
+    """本线程最近一次请求中新建连接的 (建立 TCP 连接耗时, TLS 握手耗时)，复用连接时为 (None, None)"""
+    return getattr(_local, "connect", None), getattr(_local, "tls", None)
+
+
+class _TimedConnectionMixin:
+    """记录新建连接的耗时：_new_conn 为 DNS 解析与 TCP 连接，connect 的其余时间为 TLS 握手"""
+
+    _timed_tls = False
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _local.connect = time.perf_counter() - start
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            new_conn = getattr(_local, "connect", None)
+            if self._timed_tls and new_conn is not None:
+                _local.tls = max(0.0, time.perf_counter() - start - new_conn)
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    _timed_tls = True
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """与 HTTPAdapter 相同，新建连接时记录连接与 TLS 握手耗时，供 connect_timing 读取"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
@@ -0,0 +1,14 @@
+import matplotlib
+
+_configured = False
+
+
+def configure_matplotlib():
+    """统一设置 matplotlib 的中文字体与负号显示，多次调用只生效一次"""
+    global _configured
+    if _configured:
+        return
+
+    matplotlib.rcParams['font.sans-serif'] = ['SimHei']  # 设置字体以支持中文显示
+    matplotlib.rcParams['axes.unicode_minus'] = False  # 正确显示负号
+    _configured = True
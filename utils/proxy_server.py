@@ -0,0 +1,206 @@
+"""
+局域网内共用的心知天气缓存代理：对外提供与官方相同的 /v3/... 路径，
+所有客户端共享一份响应缓存，相同的并发请求只向上游发起一次，并统一使用代理的 Key 与调用预算。
+
+用法示例:
+    python -m utils.proxy_server -k YOUR_KEY --port 8780 --per-minute 20 --cache-db proxy_cache.sqlite3
+
+客户端将接口地址设为 http://<代理主机>:8780/v3 即可（桌面程序为配置项 api_base_url，
+命令行为 --base-url）。客户端请求中的 key 不会转发给上游；指定 --access-key 时只接受列出的 Key。
+GET /stats 返回缓存命中率、合并次数与剩余配额等统计，GET /metrics 以 Prometheus 文本格式返回各阶段耗时等指标。
+指定 --access-key 时 /stats 与 /metrics 同样需要在查询参数中带上 key。
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from utils.api_client import ApiClient
+from utils.disk_cache import DiskCache
+from utils.endpoints import API_KEY_ENV, DEFAULT_BASE_URL, ENDPOINTS_BY_PATH, redact_api_key
+from utils.instrumentation import MetricsHook
+from utils.metrics import PROMETHEUS_CONTENT_TYPE, MetricsRegistry
+from utils.rate_limiter import QuotaExceededError, RateLimiter
+from utils.resilience import CircuitOpenError
+
+PATH_PREFIX = "/v3"
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 长连接，客户端的连接池可以复用到代理的连接
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query, keep_blank_values=True))
+        client_key = params.pop("key", None)
+        # 统计与指标同样需要 Key（如 /stats?key=...），其中含有配额与各接口的调用情况
+        if self.server.access_keys and client_key not in self.server.access_keys:
+            self.send_json(403, {"status": "API Key 无权访问此代理"})
+            return
+
+        if url.path == "/stats":
+            self.send_json(200, self.server.stats())
+            return
+        if url.path == "/metrics" and self.server.metrics is not None:
+            self.send_body(200, self.server.metrics.render_prometheus().encode("utf-8"), PROMETHEUS_CONTENT_TYPE)
+            return
+
+        path = url.path[len(PATH_PREFIX):] if url.path.startswith(PATH_PREFIX + "/") else None
+        if path not in ENDPOINTS_BY_PATH:
+            self.send_json(404, {"status": f"未知的接口: {url.path}"})
+            return
+
+        # 补齐默认参数，显式给出默认值与省略的请求共用缓存
+        params = ENDPOINTS_BY_PATH[path].normalize(params)
+        self.server.count("requests")
+        try:
+            data = self.server.api_client.get(path, params)
+        except requests.exceptions.HTTPError as e:
+            # 上游的错误响应原样转发，客户端按与直连时相同的方式处理
+            self.server.count("errors")
+            response = e.response
+            self.send_body(response.status_code, response.content,
+                           response.headers.get("Content-Type", "application/json; charset=utf-8"))
+        except QuotaExceededError as e:
+            self.server.count("errors")
+            self.send_json(429, {"status": str(e)})
+        except (CircuitOpenError, requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            # 异常信息只在代理端输出（隐去 Key），不返回给客户端
+            self.server.count("errors")
+            print(f"转发 {path} 失败: {redact_api_key(e)}", file=sys.stderr)
+            self.send_json(502, {"status": f"上游不可用: {type(e).__name__}"})
+        except Exception as e:
+            self.server.count("errors")
+            print(f"转发 {path} 失败: {redact_api_key(e)}", file=sys.stderr)
+            self.send_json(500, {"status": f"代理内部错误: {type(e).__name__}"})
+        else:
+            self.send_json(200, data)
+
+    def send_json(self, status, data):
+        self.send_body(status, json.dumps(data, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+
+    def send_body(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ProxyServer(ThreadingHTTPServer):
+    """缓存代理服务器，每个连接一个线程，共用同一个 ApiClient 的缓存、请求合并、限流与熔断"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, api_client, host="127.0.0.1", port=8780, access_keys=(), metrics=None):
+        """
+        api_client: 访问上游的 ApiClient，需已设置 Key
+        access_keys: 允许访问代理的客户端 Key，为空时不校验
+        metrics: 通过 /metrics 提供的 MetricsRegistry，为 None 时不提供
+        """
+        super().__init__((host, port), ProxyHandler)
+        self.api_client = api_client
+        self.access_keys = set(access_keys)
+        self.metrics = metrics
+        self._counters = {"requests": 0, "errors": 0}
+        self._counters_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{PATH_PREFIX}"
+
+    def count(self, name):
+        with self._counters_lock:
+            self._counters[name] += 1
+
+    def stats(self):
+        with self._counters_lock:
+            stats = dict(self._counters)
+        stats["upstream"] = self.api_client.single_flight.stats()
+        stats["cache"] = self.api_client.cache.stats() if self.api_client.cache is not None else None
+        stats["remaining_budget"] = self.api_client.remaining_budget()
+        return stats
+
+    def start(self):
+        """在后台线程中运行"""
+        self._thread = threading.Thread(target=self.serve_forever, name="ProxyServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.proxy_server",
+        description="局域网共用的心知天气缓存代理，共享缓存、合并相同请求并统一限流",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址，局域网共用时设为 0.0.0.0")
+    parser.add_argument("--port", type=int, default=8780, help="监听端口，默认 8780")
+    parser.add_argument("-k", "--key", help=f"访问上游使用的 API Key，默认读取环境变量 {API_KEY_ENV}")
+    parser.add_argument("--access-key", action="append", default=[], help="允许访问代理的客户端 Key，可重复")
+    parser.add_argument("--upstream", default=DEFAULT_BASE_URL, help="上游接口地址，默认为心知天气官方地址")
+    parser.add_argument("--per-minute", type=int, help="每分钟向上游的调用上限")
+    parser.add_argument("--daily-quota", type=int, help="每日向上游的调用上限")
+    parser.add_argument("--quota-file", help="每日调用计数文件，重启后保留计数")
+    parser.add_argument("--cache-db", help="持久化响应缓存的 SQLite 文件，重启后保留缓存")
+    parser.add_argument("--stale-grace", type=int, default=0, help="缓存过期后先返回旧数据并在后台刷新的宽限秒数")
+    parser.add_argument("--pool-size", type=int, default=32, help="到上游的最大连接数，默认 32")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    api_key = args.key or os.environ.get(API_KEY_ENV)
+    if not api_key:
+        parser.error(f"请通过 --key 或环境变量 {API_KEY_ENV} 提供 API Key")
+
+    rate_limiter = None
+    if args.per_minute or args.daily_quota or args.quota_file:
+        rate_limiter = RateLimiter(per_minute=args.per_minute, daily_quota=args.daily_quota,
+                                   quota_path=args.quota_file)
+    disk_cache = DiskCache(args.cache_db) if args.cache_db else None
+    metrics = MetricsRegistry()
+
+    with ApiClient(pool_maxsize=args.pool_size, disk_cache=disk_cache, stale_grace=args.stale_grace,
+                   rate_limiter=rate_limiter, base_url=args.upstream, hooks=[MetricsHook(metrics)]) as api_client:
+        api_client.set_api_key(api_key)
+        server = ProxyServer(api_client, args.host, args.port, args.access_key, metrics)
+        print(f"缓存代理已启动: {server.base_url} -> {api_client.base_url}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
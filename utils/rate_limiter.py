@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import date
+
+from utils.endpoints import ENDPOINTS_BY_PATH
+
+
+class QuotaExceededError(RuntimeError):
+    """当日调用次数已用完"""
+
+
+def family_for(path):
+    """由接口路径得到接口族，例如 /weather/now.json -> weather"""
+    endpoint = ENDPOINTS_BY_PATH.get(path)
+    if endpoint is not None:
+        return endpoint.family
+    return path.strip("/").split("/", 1)[0]
+
+
+class TokenBucket:
+    """令牌桶：每秒补充 rate 个令牌，最多积累 capacity 个"""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated_at = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self):
+        """预约一个令牌，返回需要等待的秒数；令牌可预支为负数，调用者按预约顺序排队"""
+        self._refill()
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def available(self):
+        self._refill()
+        return max(0.0, self.tokens)
+
+
+class DailyQuota:
+    """按自然日统计调用次数，并持久化到 JSON 文件"""
+
+    def __init__(self, limit, path=None, flush_every=20, today=date.today):
+        """
+        limit: 每日调用上限，None 表示只计数不限制
+        path: 计数文件路径，None 表示不持久化
+        flush_every: 每累计多少次调用写一次文件
+        """
+        self.limit = limit
+        self.path = path
+        self.flush_every = flush_every
+        self.today = today
+
+        self.day = self.today().isoformat()
+        self.counts = {}  # key 摘要 -> 当日调用次数
+        self._unflushed = 0
+        self._load()
+
+    @staticmethod
+    def key_id(api_key):
+        # 文件中只保存 API Key 的摘要
+        return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if saved.get("date") == self.day:
+            self.counts = saved.get("counts", {})
+
+    def _rollover(self):
+        day = self.today().isoformat()
+        if day != self.day:
+            self.day = day
+            self.counts = {}
+
+    def used(self, api_key):
+        self._rollover()
+        return self.counts.get(self.key_id(api_key), 0)
+
+    def remaining(self, api_key):
+        if self.limit is None:
+            return None
+        return max(0, self.limit - self.used(api_key))
+
+    def consume(self, api_key):
+        if self.limit is not None and self.used(api_key) >= self.limit:
+            raise QuotaExceededError(f"今日 API 调用次数已达上限（{self.limit} 次）！")
+
+        key_id = self.key_id(api_key)
+        self.counts[key_id] = self.counts.get(key_id, 0) + 1
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if not self.path or not self._unflushed:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"date": self.day, "counts": self.counts}, f)
+        os.replace(tmp_path, self.path)
+        self._unflushed = 0
+
+
+class RateLimiter:
+    """按 API Key 与接口族限流：超出速率的调用排队等待，超出每日配额的调用直接失败"""
+
+    def __init__(self, per_minute=None, family_limits=None, daily_quota=None, quota_path=None,
+                 clock=time.monotonic, sleep=time.sleep):
+        """
+        per_minute: 每个 API Key 每分钟的调用上限，None 表示不限
+        family_limits: 接口族（weather/air/life/geo/tide/location）到每分钟调用上限的映射
+        daily_quota: 每个 API Key 每日的调用上限，None 表示不限
+        quota_path: 每日计数的持久化文件路径
+        """
+        self.per_minute = per_minute
+        self.family_limits = family_limits or {}
+        self.clock = clock
+        self.sleep = sleep
+        self.quota = DailyQuota(daily_quota, quota_path)
+
+        self._buckets = {}  # (api_key, family 或 None) -> TokenBucket
+        self._lock = threading.Lock()
+        self.queued = 0  # 因限流而等待过的调用次数
+
+    def _bucket(self, api_key, family):
+        per_minute = self.per_minute if family is None else self.family_limits.get(family)
+        if per_minute is None:
+            return None
+
+        bucket = self._buckets.get((api_key, family))
+        if bucket is None:
+            bucket = TokenBucket(per_minute / 60, per_minute, self.clock)
+            self._buckets[(api_key, family)] = bucket
+        return bucket
+
+    def reserve(self, api_key, path):
+        """预约一次调用，返回需要等待的秒数；每日配额用完时抛出 QuotaExceededError"""
+        with self._lock:
+            self.quota.consume(api_key)
+
+            wait = 0.0
+            for family in (None, family_for(path)):
+                bucket = self._bucket(api_key, family)
+                if bucket is not None:
+                    wait = max(wait, bucket.reserve())
+            if wait > 0:
+                self.queued += 1
+            return wait
+
+    def acquire(self, api_key, path):
+        """阻塞直到允许发起调用"""
+        wait = self.reserve(api_key, path)
+        if wait > 0:
+            self.sleep(wait)
+
+    def remaining(self, api_key):
+        """返回剩余预算：本分钟可用次数、各接口族可用次数、当日剩余配额（None 表示不限）"""
+        with self._lock:
+            minute = self._bucket(api_key, None)
+            families = {family: self._bucket(api_key, family) for family in self.family_limits}
+            return {
+                "per_minute": None if minute is None else int(minute.available()),
+                "families": {
+                    family: None if bucket is None else int(bucket.available()) for family, bucket in families.items()
+                },
+                "daily": self.quota.remaining(api_key),
+                "daily_used": self.quota.used(api_key),
+            }
+
+    def flush(self):
+        with self._lock:
+            self.quota.flush()
@@ -0,0 +1,99 @@
+import random
+import threading
+import time
+
+
+class CircuitOpenError(RuntimeError):
+    """熔断器处于打开状态，请求被快速拒绝"""
+
+
+class RetryPolicy:
+    """幂等 GET 请求的重试策略：指数退避 + 全抖动"""
+
+    def __init__(self, max_retries=3, backoff_base=0.5, backoff_max=8.0,
+                 retry_statuses=(429, 500, 502, 503, 504)):
+        """
+        max_retries: 首次请求失败后的最大重试次数
+        backoff_base: 第一次重试的退避上限（秒），之后每次翻倍
+        backoff_max: 单次退避的最大时长（秒）
+        retry_statuses: 需要重试的 HTTP 状态码
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = set(retry_statuses)
+
+    def delay(self, attempt):
+        """第 attempt 次重试（从 0 开始）前的等待秒数"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    熔断器：连续失败达到阈值后打开，在恢复时间内直接拒绝请求；
+    恢复时间过后进入半开状态，只放行一个试探请求，成功则关闭，失败则重新打开。
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.clock = clock
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """请求前调用，熔断时抛出 CircuitOpenError"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if self.clock() - self.opened_at < self.recovery_timeout:
+                    self.rejected += 1
+                    raise CircuitOpenError("服务暂时不可用，请稍后重试！")
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+
+            if self.state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    self.rejected += 1
+                    raise CircuitOpenError("服务暂时不可用，请稍后重试！")
+                self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """请求因与上游可用性无关的原因（如配额用尽、取消）中止时调用，放行下一个试探请求，不改变状态"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "rejected": self.rejected,
+                "retry_in": (
+                    max(0.0, self.recovery_timeout - (self.clock() - self.opened_at))
+                    if self.state == self.OPEN else 0.0
+                ),
+            }
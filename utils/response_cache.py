@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import OrderedDict
+
+from utils.endpoints import ENDPOINTS
+
+# 各接口的缓存有效期（秒），由接口注册表声明
+DEFAULT_TTLS = {endpoint.path: endpoint.ttl for endpoint in ENDPOINTS.values()}
+DEFAULT_TTL = 5 * 60  # 未注册接口的缓存有效期（秒）
+
+# 不参与缓存键计算的参数
+EXCLUDED_PARAMS = {"key"}
+
+
+class ResponseCache:
+    """按接口与规范化参数缓存 JSON 响应的内存缓存（TTL + LRU）"""
+
+    def __init__(self, ttls=None, default_ttl=DEFAULT_TTL, max_bytes=16 * 1024 * 1024, stale_grace=0,
+                 clock=time.monotonic):
+        """
+        ttls: 接口路径到缓存有效期（秒）的映射，覆盖 DEFAULT_TTLS
+        default_ttl: 未配置接口的缓存有效期（秒）
+        max_bytes: 缓存响应体的总字节数上限，超出时淘汰最久未使用的条目
+        stale_grace: 过期后仍可作为旧数据返回的宽限时长（秒）
+        """
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.stale_grace = stale_grace
+        self.clock = clock
+
+        self._entries = OrderedDict()  # key -> (expires_at, size, data)
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(path, params):
+        """生成缓存键：接口路径 + 排序后的参数（排除 key）"""
+        return path, tuple(sorted(
+            (name, str(value)) for name, value in params.items() if name not in EXCLUDED_PARAMS
+        ))
+
+    def ttl_for(self, path):
+        return self.ttls.get(path, self.default_ttl)
+
+    def get(self, path, params):
+        """返回未过期的缓存数据，未命中时返回 None"""
+        key = self.make_key(path, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, size, data = entry
+            if expires_at <= self.clock():
+                # 宽限期内的条目保留，供 get_stale 使用
+                if expires_at + self.stale_grace <= self.clock():
+                    self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def get_stale(self, path, params):
+        """返回已过期但仍在宽限期内的缓存数据，否则返回 None"""
+        key = self.make_key(path, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, size, data = entry
+            if expires_at + self.stale_grace <= self.clock():
+                return None
+
+            self._entries.move_to_end(key)
+            self.stale_hits += 1
+            return data
+
+    def put(self, path, params, data, size, ttl=None):
+        """写入缓存，size 为响应体字节数，用于内存上限统计；ttl 为空时使用接口默认有效期"""
+        if ttl is None:
+            ttl = self.ttl_for(path)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        key = self.make_key(path, params)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (self.clock() + ttl, size, data)
+            self.total_bytes += size
+
+            while self.total_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate(self, path=None):
+        """清除指定接口（或全部）的缓存"""
+        with self._lock:
+            for key in [key for key in self._entries if path is None or key[0] == path]:
+                self._remove(key)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.total_bytes -= size
@@ -0,0 +1,189 @@
+import re
+
+import numpy as np
+
+_TZ_SUFFIX = re.compile(r"(Z|[+-]\d{2}:?\d{2})$")
+
+
+def to_datetime64(values):
+    """
+    ISO 8601 时间或日期字符串转换为 datetime64[s]。
+    保留当地时间、去掉时区偏移（图表按当地时间显示），空值为 NaT。
+    """
+    return np.array([_TZ_SUFFIX.sub("", value) if value else "NaT" for value in values], dtype="datetime64[s]")
+
+
+def to_float32(values):
+    """API 返回的数值或数值字符串转换为 float32，空值为 NaN，格式有误时抛出 ValueError"""
+    return np.array(["nan" if value is None or value == "" else value for value in values]).astype(np.float32)
+
+
+def clock_to_hours(values):
+    """时刻字符串 (HH:MM) 转换为以小时计的 float32，空值或格式有误时为 NaN"""
+    hours = np.full(len(values), np.nan, dtype=np.float32)
+    for i, value in enumerate(values):
+        if value and ':' in value:
+            hour, minute = value.split(':')[:2]
+            if hour.isdigit() and minute.isdigit():
+                hours[i] = int(hour) + int(minute) / 60
+    return hours
+
+
+class TimeSeries:
+    """
+    列式时间序列：时间戳为 datetime64[s]，数值列为 float32（缺失值为 NaN），
+    文本列（天气描述、风向等）为 object 数组。每次获取后解析一次，重绘时直接取用数组。
+    """
+
+    def __init__(self, timestamps, values=None, texts=None):
+        """
+        timestamps: 时间戳序列
+        values: {列名: 数值序列}
+        texts: {列名: 文本序列}
+        """
+        self.timestamps = np.asarray(timestamps, dtype="datetime64[s]")
+        self.values = {name: np.asarray(column, dtype=np.float32) for name, column in (values or {}).items()}
+        self.texts = {name: np.asarray(column, dtype=object) for name, column in (texts or {}).items()}
+        for name, column in {**self.values, **self.texts}.items():
+            if len(column) != len(self.timestamps):
+                raise ValueError(f"列 {name} 的长度 {len(column)} 与时间戳数量 {len(self.timestamps)} 不一致")
+
+    @classmethod
+    def from_records(cls, records, time_key, fields=(), texts=(), converters=None):
+        """
+        由 API 返回的字典列表构建，逐列转换。
+        time_key: 时间字段名
+        fields: 数值字段名，默认按数值解析，缺失值为 NaN
+        texts: 文本字段名
+        converters: {字段名: 函数}，以该字段的原始值列表调用，返回数值数组，如 clock_to_hours
+        """
+        converters = converters or {}
+        values = {}
+        for name in fields:
+            raw = [record.get(name) for record in records]
+            values[name] = converters.get(name, to_float32)(raw)
+        return cls(
+            to_datetime64([record.get(time_key) for record in records]),
+            values,
+            {name: [record.get(name) for record in records] for name in texts},
+        )
+
+    @classmethod
+    def concat(cls, parts):
+        """按顺序拼接多个列相同的序列"""
+        parts = list(parts)
+        if not parts:
+            return cls([])
+        return cls(
+            np.concatenate([part.timestamps for part in parts]),
+            {name: np.concatenate([part.values[name] for part in parts]) for name in parts[0].values},
+            {name: np.concatenate([part.texts[name] for part in parts]) for name in parts[0].texts},
+        )
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, key):
+        """列名返回对应的数组；切片、下标数组或布尔掩码返回新的 TimeSeries（切片不复制数据）"""
+        if isinstance(key, str):
+            if key in self.values:
+                return self.values[key]
+            return self.texts[key]
+        return TimeSeries(
+            self.timestamps[key],
+            {name: column[key] for name, column in self.values.items()},
+            {name: column[key] for name, column in self.texts.items()},
+        )
+
+    @property
+    def columns(self):
+        return list(self.values) + list(self.texts)
+
+    def between(self, start=None, end=None):
+        """取时间在 [start, end) 内的部分，要求时间戳已排序"""
+        lo = 0 if start is None else np.searchsorted(self.timestamps, np.datetime64(start, "s"), side="left")
+        hi = len(self) if end is None else np.searchsorted(self.timestamps, np.datetime64(end, "s"), side="left")
+        return self[lo:hi]
+
+    def strftime(self, fmt):
+        """按 fmt 格式化时间戳，用作坐标轴刻度文字；NaT 格式化为空字符串"""
+        return [moment.strftime(fmt) if moment is not None else "" for moment in self.timestamps.astype(object)]
+
+    def max(self, name, default=0.0):
+        """数值列忽略 NaN 的最大值，全部缺失时返回 default"""
+        column = self.values[name]
+        return float(np.nanmax(column)) if np.isfinite(column).any() else default
+
+    def resample(self, unit, how="mean"):
+        """
+        按时间单位重采样，unit 为 numpy 时间单位，如 'h'（小时）、'D'（天）。
+        数值列按 how（mean/min/max/first/last）聚合并忽略 NaN，文本列取每段第一个值。
+        """
+        buckets = self.timestamps.astype(f"datetime64[{unit}]")
+        keys, first, inverse = np.unique(buckets, return_index=True, return_inverse=True)
+        values = {name: _aggregate(column, inverse, len(keys), how) for name, column in self.values.items()}
+        texts = {name: column[first] for name, column in self.texts.items()}
+        return TimeSeries(keys.astype("datetime64[s]"), values, texts)
+
+
+def normalize_hourly(series, keep="last", fill_gaps=True):
+    """
+    逐小时数据规范化：按完整的日期+小时取整后去重，全程只排序一次。
+    keep: 同一小时有多条记录时保留时间最晚（last）或最早（first）的一条
+    fill_gaps: 是否补齐首尾之间缺失的小时，补齐的行数值为 NaN、文本为 None
+    无效时间（NaT）的记录被丢弃，返回的时间戳均为整点。
+    """
+    if keep not in ("first", "last"):
+        raise ValueError(f"不支持的保留方式: {keep}")
+
+    hours = series.timestamps.astype("datetime64[h]")
+    valid = np.flatnonzero(~np.isnat(hours))
+    order = valid[np.argsort(series.timestamps[valid], kind="stable")]
+    sorted_hours = hours[order]
+
+    # 排序后同一小时的记录相邻，取每段的第一条或最后一条
+    changed = sorted_hours[1:] != sorted_hours[:-1]
+    boundary = np.r_[True, changed] if keep == "first" else np.r_[changed, True]
+    picked = order[boundary] if len(order) else order
+    hours = hours[picked]
+
+    if not fill_gaps or len(hours) == 0:
+        normalized = series[picked]
+        normalized.timestamps = hours.astype("datetime64[s]")
+        return normalized
+
+    full = np.arange(hours[0], hours[-1] + np.timedelta64(1, "h"))
+    positions = (hours - hours[0]).astype(np.int64)
+    values = {}
+    for name, column in series.values.items():
+        values[name] = np.full(len(full), np.nan, dtype=np.float32)
+        values[name][positions] = column[picked]
+    texts = {}
+    for name, column in series.texts.items():
+        texts[name] = np.full(len(full), None, dtype=object)
+        texts[name][positions] = column[picked]
+    return TimeSeries(full.astype("datetime64[s]"), values, texts)
+
+
+def _aggregate(column, inverse, count, how):
+    valid = ~np.isnan(column)
+    if how == "mean":
+        sums = np.bincount(inverse, weights=np.where(valid, column, 0), minlength=count)
+        counts = np.bincount(inverse, weights=valid, minlength=count)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (sums / counts).astype(np.float32)  # 整段缺失时 0/0 为 NaN
+
+    result = np.full(count, np.nan, dtype=np.float32)
+    if how in ("min", "max"):
+        # fmin/fmax 遇到 NaN 时取另一个值，整段缺失时保持 NaN
+        (np.fmin if how == "min" else np.fmax).at(result, inverse, column)
+    elif how in ("first", "last"):
+        # 每段中第一个（最后一个）有效值的下标，整段缺失时保持初始的越界值
+        positions = np.flatnonzero(valid)
+        picked = np.full(count, len(column) if how == "first" else -1)
+        (np.minimum if how == "first" else np.maximum).at(picked, inverse[positions], positions)
+        found = (picked >= 0) & (picked < len(column))
+        result[found] = column[picked[found]]
+    else:
+        raise ValueError(f"不支持的聚合方式: {how}")
+    return result
@@ -5,6 +5,8 @@ from PyQt6.QtWidgets import (
     QVBoxLayout, QLabel, QPushButton, QLineEdit, QWidget, QMessageBox, QHBoxLayout
 )
 
+from utils.async_fetch import AsyncFetcher
+
 
 class WeatherAlerts(QWidget):
     def __init__(self, api_client, parent=None):
@@ -15,6 +17,7 @@ class WeatherAlerts(QWidget):
 
         self.data = []  # 保存气象灾害预警数据
         self.current_index = 0  # 当前显示的预警索引
+        self.fetcher = AsyncFetcher(self)
 
         self.init_ui()
 
@@ -60,22 +63,24 @@ class WeatherAlerts(QWidget):
             QMessageBox.warning(self, "警告", "城市名称不能为空！")
             return
 
-        try:
-            weather_data = self.api_client.fetch_weather_alerts(location=city)
-            self.data = weather_data.get('results', [{}])[0].get('alarms', [])
-            if not self.data:
-                QMessageBox.information(self, "提示", "当前城市暂无预警信息！")
-                self.alert_info.setText("当前城市暂无预警信息！")
-                self.prev_button.setEnabled(False)
-                self.next_button.setEnabled(False)
-                return
-
-            self.current_index = 0
-            self.update_alert_info()
-            self.prev_button.setEnabled(True)
-            self.next_button.setEnabled(True)
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"获取预警信息失败: {e}")
+        self.fetcher.run(
+            self.api_client.fetch_weather_alerts, location=city,
+            on_result=self.on_alerts_fetched, error_message="获取预警信息失败",
+        )
+
+    def on_alerts_fetched(self, weather_data):
+        self.data = weather_data.get('results', [{}])[0].get('alarms', [])
+        if not self.data:
+            QMessageBox.information(self, "提示", "当前城市暂无预警信息！")
+            self.alert_info.setText("当前城市暂无预警信息！")
+            self.prev_button.setEnabled(False)
+            self.next_button.setEnabled(False)
+            return
+
+        self.current_index = 0
+        self.update_alert_info()
+        self.prev_button.setEnabled(True)
+        self.next_button.setEnabled(True)
 
     def update_alert_info(self):
         if not self.data:
@@ -1,18 +1,28 @@
 import sys
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtWidgets import QVBoxLayout, QLabel, QPushButton, QLineEdit, QWidget, QMessageBox
 
+from utils.async_fetch import AsyncFetcher
+
 
 class CurrentWeather(QWidget):
+    # 后台刷新到更新的数据时触发（跨线程，经信号切回 GUI 线程）
+    data_refreshed = pyqtSignal(object)
+
     def __init__(self, api_client, parent=None):
         super().__init__(parent)
         self.api_client = api_client
         self.setWindowTitle("天气实况")
         self.setFixedSize(400, 600)
 
+        self.location = None  # 当前显示的城市
+        self.fetcher = AsyncFetcher(self)
+
         self.init_ui()
 
+        self.data_refreshed.connect(self.display_weather)
+
     def init_ui(self):
         layout = QVBoxLayout()
 
@@ -37,11 +47,26 @@ class CurrentWeather(QWidget):
             QMessageBox.warning(self, "警告", "城市名称不能为空！")
             return
 
-        try:
-            weather_data = self.api_client.fetch_current_weather(location=location)
-            self.display_weather(weather_data)
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"获取天气数据失败: {e}")
+        self.location = location
+        self.fetcher.run(
+            self.api_client.fetch_current_weather, location=location,
+            on_result=self.display_weather, error_message="获取天气数据失败",
+        )
+
+    def on_data_refreshed(self, path, params, data):
+        # 在后台线程中调用，仅转发当前城市的天气实况
+        if path == "/weather/now.json" and params.get("location") == self.location:
+            self.data_refreshed.emit(data)
+
+    def showEvent(self, event):
+        # 只在窗口显示期间接收后台刷新，关闭后共享的 api_client 不再持有本窗口
+        self.api_client.add_refresh_listener(self.on_data_refreshed)
+        super().showEvent(event)
+
+    def closeEvent(self, event):
+        self.location = None
+        self.api_client.remove_refresh_listener(self.on_data_refreshed)
+        super().closeEvent(event)
 
     def display_weather(self, data):
         try:
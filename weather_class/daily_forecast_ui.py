@@ -1,15 +1,13 @@
 import sys
 
-import matplotlib
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
     QVBoxLayout, QLabel, QPushButton, QLineEdit, QWidget, QMessageBox
 )
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 
-matplotlib.rcParams['font.sans-serif'] = ['SimHei']  # 设置字体以支持中文显示
-matplotlib.rcParams['axes.unicode_minus'] = False  # 正确显示负号
+from utils.async_fetch import AsyncFetcher
+from utils.charts import ChartCanvas
+from utils.timeseries import TimeSeries
 
 class DailyForecast(QWidget):
     def __init__(self, api_client, parent=None):
@@ -18,7 +16,8 @@ class DailyForecast(QWidget):
         self.setWindowTitle("逐日天气预报")
         self.setFixedSize(800, 800)
 
-        self.data = []  # 保存逐日天气数据
+        self.series = None  # 逐日天气时间序列
+        self.fetcher = AsyncFetcher(self)
 
         self.init_ui()
 
@@ -47,14 +46,14 @@ class DailyForecast(QWidget):
 
         self.setLayout(layout)
 
-        # Matplotlib 图表区域
-        self.canvas = FigureCanvas(Figure(figsize=(10, 8)))
+        # Matplotlib 图表区域，坐标轴装饰只创建一次
+        self.canvas = ChartCanvas(figsize=(10, 8))
         layout.addWidget(self.canvas)
-        self.ax_high = self.canvas.figure.add_subplot(511)
-        self.ax_low = self.canvas.figure.add_subplot(512)
-        self.ax_precip = self.canvas.figure.add_subplot(513)
-        self.ax_wind = self.canvas.figure.add_subplot(514)
-        self.ax_humidity = self.canvas.figure.add_subplot(515)
+        self.high_chart = self.canvas.add_chart(511, "最高温度", "日期", "温度 (°C)", [("最高温度", None)])
+        self.low_chart = self.canvas.add_chart(512, "最低温度", "日期", "温度 (°C)", [("最低温度", 'blue')])
+        self.precip_chart = self.canvas.add_chart(513, "降水概率", "日期", "概率 (%)", [("降水概率", 'green')])
+        self.wind_chart = self.canvas.add_chart(514, "风速", "日期", "风速 (km/h)", [("风速", 'orange')], annotate=True)
+        self.humidity_chart = self.canvas.add_chart(515, "湿度", "日期", "湿度 (%)", [("湿度", 'purple')])
         self.canvas.figure.tight_layout(pad=5.0)
 
     def fetch_daily_forecast(self):
@@ -69,78 +68,42 @@ class DailyForecast(QWidget):
             QMessageBox.warning(self, "警告", "请输入有效的天数（1~15）！")
             return
 
-        try:
-            weather_data = self.api_client.fetch_daily_forecast(location=city, days=int(days))
-            self.data = weather_data.get('results', [{}])[0].get('daily', [])
-            if not self.data:
-                QMessageBox.warning(self, "警告", "未获取到天气数据！")
-                return
+        self.fetcher.run(
+            self.api_client.fetch_daily_forecast, location=city, days=int(days),
+            on_result=self.on_daily_forecast_fetched, error_message="获取天气数据失败",
+        )
 
-            self.plot_weather_data()
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"获取天气数据失败: {e}")
+    def on_daily_forecast_fetched(self, weather_data):
+        daily = weather_data.get('results', [{}])[0].get('daily', [])
+        if not daily:
+            QMessageBox.warning(self, "警告", "未获取到天气数据！")
+            return
+
+        self.series = TimeSeries.from_records(
+            daily, 'date',
+            fields=('high', 'low', 'precip', 'wind_speed', 'humidity'),
+            texts=('wind_direction', 'text_day', 'text_night'),
+        )
+        self.plot_weather_data()
 
     def plot_weather_data(self):
-        if not self.data:
+        if not self.series:
             return
 
-        dates = [day['date'][5:] for day in self.data]  # 去掉年份，仅显示月-日
-        highs = [int(day['high']) for day in self.data]
-        lows = [int(day['low']) for day in self.data]
-        precips = [float(day['precip']) for day in self.data]
-        wind_speeds = [float(day['wind_speed']) for day in self.data]
-        wind_directions = [day['wind_direction'] for day in self.data]
-        humidities = [float(day['humidity']) for day in self.data]
-        day_texts = [day['text_day'] for day in self.data]
-        night_texts = [day['text_night'] for day in self.data]
-
-        self.ax_high.clear()
-        self.ax_low.clear()
-        self.ax_precip.clear()
-        self.ax_wind.clear()
-        self.ax_humidity.clear()
-
-        # 最高温度
-        self.ax_high.plot(dates, highs, marker='o', label="最高温度")
-        self.ax_high.set_title("最高温度")
-        self.ax_high.set_xlabel("日期")
-        self.ax_high.set_ylabel("温度 (°C)")
-        self.ax_high.grid(True)
-
-        # 最低温度
-        self.ax_low.plot(dates, lows, marker='o', label="最低温度", color='blue')
-        self.ax_low.set_title("最低温度")
-        self.ax_low.set_xlabel("日期")
-        self.ax_low.set_ylabel("温度 (°C)")
-        self.ax_low.grid(True)
-
-        # 降水概率
-        self.ax_precip.plot(dates, precips, marker='o', label="降水概率", color='green')
-        self.ax_precip.set_title("降水概率")
-        self.ax_precip.set_xlabel("日期")
-        self.ax_precip.set_ylabel("概率 (%)")
-        self.ax_precip.grid(True)
-
-        # 风速
-        self.ax_wind.plot(dates, wind_speeds, marker='o', label="风速", color='orange')
-        for i, direction in enumerate(wind_directions):
-            self.ax_wind.annotate(direction, (dates[i], wind_speeds[i]), textcoords="offset points", xytext=(0, 10), ha='center')
-        self.ax_wind.set_title("风速")
-        self.ax_wind.set_xlabel("日期")
-        self.ax_wind.set_ylabel("风速 (km/h)")
-        self.ax_wind.grid(True)
-
-        # 湿度
-        self.ax_humidity.plot(dates, humidities, marker='o', label="湿度", color='purple')
-        self.ax_humidity.set_title("湿度")
-        self.ax_humidity.set_xlabel("日期")
-        self.ax_humidity.set_ylabel("湿度 (%)")
-        self.ax_humidity.grid(True)
-
-        self.canvas.draw()
+        series = self.series
+        dates = series.strftime("%m-%d")  # 去掉年份，仅显示月-日
+
+        x = range(len(dates))
+        ticks = {"xticks": x, "xticklabels": dates}
+        self.high_chart.set_data(x, [series['high']], **ticks)
+        self.low_chart.set_data(x, [series['low']], **ticks)
+        self.precip_chart.set_data(x, [series['precip']], **ticks)
+        self.wind_chart.set_data(x, [series['wind_speed']], annotations=series['wind_direction'], **ticks)
+        self.humidity_chart.set_data(x, [series['humidity']], **ticks)
+        self.canvas.render()
 
         # 更新白天天气和晚间天气
-        self.weather_info.setText(f"白天天气: {day_texts[0]}\n晚间天气: {night_texts[0]}")
+        self.weather_info.setText(f"白天天气: {series['text_day'][0]}\n晚间天气: {series['text_night'][0]}")
 
 if __name__ == "__main__":
     from PyQt6.QtWidgets import QApplication
@@ -1,14 +1,12 @@
 import sys
 
-import matplotlib
 from PyQt6.QtWidgets import (
     QVBoxLayout, QPushButton, QLineEdit, QWidget, QMessageBox
 )
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 
-matplotlib.rcParams['font.sans-serif'] = ['SimHei']
-matplotlib.rcParams['axes.unicode_minus'] = False
+from utils.async_fetch import AsyncFetcher
+from utils.charts import ChartCanvas
+from utils.timeseries import TimeSeries
 
 class HourlyForecast(QWidget):
     def __init__(self, api_client, parent=None):
@@ -17,7 +15,8 @@ class HourlyForecast(QWidget):
         self.setWindowTitle("24小时逐小时天气预报")
         self.setFixedSize(800, 800)
 
-        self.data = []  # 保存逐小时天气数据
+        self.series = None  # 逐小时天气时间序列
+        self.fetcher = AsyncFetcher(self)
 
         self.init_ui()
 
@@ -40,11 +39,15 @@ class HourlyForecast(QWidget):
         layout.addWidget(btn_fetch)
 
         # Matplotlib 图表区域
-        self.canvas = FigureCanvas(Figure(figsize=(10, 8)))
+        self.canvas = ChartCanvas(figsize=(10, 8))
         layout.addWidget(self.canvas)
-        self.ax_temperature = self.canvas.figure.add_subplot(311)
-        self.ax_humidity = self.canvas.figure.add_subplot(312)
-        self.ax_wind = self.canvas.figure.add_subplot(313)
+        self.temperature_chart = self.canvas.add_chart(
+            311, "温度", "时间 (小时)", "温度 (°C)", [("温度", None)], annotate=True
+        )
+        self.humidity_chart = self.canvas.add_chart(312, "湿度", "时间 (小时)", "湿度 (%)", [("湿度", 'blue')])
+        self.wind_chart = self.canvas.add_chart(
+            313, "风速", "时间 (小时)", "风速 (km/h)", [("风速", 'orange')], annotate=True
+        )
         self.canvas.figure.tight_layout(pad=5.0)
 
         self.setLayout(layout)
@@ -61,59 +64,36 @@ class HourlyForecast(QWidget):
             QMessageBox.warning(self, "警告", "请输入有效的小时数（1~24）！")
             return
 
-        try:
-            weather_data = self.api_client.fetch_hourly_forecast(location=city, hours=int(hours))
-            self.data = weather_data.get('results', [{}])[0].get('hourly', [])
-            if not self.data:
-                QMessageBox.warning(self, "警告", "未获取到天气数据！")
-                return
+        self.fetcher.run(
+            self.api_client.fetch_hourly_forecast, location=city, hours=int(hours),
+            on_result=self.on_hourly_forecast_fetched, error_message="获取天气数据失败",
+        )
 
-            self.plot_weather_data()
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"获取天气数据失败: {e}")
+    def on_hourly_forecast_fetched(self, weather_data):
+        hourly = weather_data.get('results', [{}])[0].get('hourly', [])
+        if not hourly:
+            QMessageBox.warning(self, "警告", "未获取到天气数据！")
+            return
+
+        self.series = TimeSeries.from_records(
+            hourly, 'time', fields=('temperature', 'humidity', 'wind_speed'), texts=('wind_direction', 'text'),
+        )
+        self.plot_weather_data()
 
     def plot_weather_data(self):
-        if not self.data:
+        if not self.series:
             return
 
-        # 修复小时提取问题
-        hours = [hour['time'].split('T')[-1].split(':')[0] for hour in self.data]  # 提取小时部分
-        temperatures = [float(hour['temperature']) for hour in self.data]
-        humidities = [float(hour['humidity']) for hour in self.data]
-        wind_speeds = [float(hour['wind_speed']) for hour in self.data]
-        wind_directions = [hour['wind_direction'] for hour in self.data]
-        weather_texts = [hour['text'] for hour in self.data]  # 获取天气描述
-
-        self.ax_temperature.clear()
-        self.ax_humidity.clear()
-        self.ax_wind.clear()
-
-        # 温度
-        self.ax_temperature.plot(hours, temperatures, marker='o', label="温度")
-        for i, text in enumerate(weather_texts):
-            self.ax_temperature.annotate(text, (hours[i], temperatures[i]), textcoords="offset points", xytext=(0, 10), ha='center')
-        self.ax_temperature.set_title("温度")
-        self.ax_temperature.set_xlabel("时间 (小时)")
-        self.ax_temperature.set_ylabel("温度 (°C)")
-        self.ax_temperature.grid(True)
-
-        # 湿度
-        self.ax_humidity.plot(hours, humidities, marker='o', label="湿度", color='blue')
-        self.ax_humidity.set_title("湿度")
-        self.ax_humidity.set_xlabel("时间 (小时)")
-        self.ax_humidity.set_ylabel("湿度 (%)")
-        self.ax_humidity.grid(True)
-
-        # 风速
-        self.ax_wind.plot(hours, wind_speeds, marker='o', label="风速", color='orange')
-        for i, direction in enumerate(wind_directions):
-            self.ax_wind.annotate(direction, (hours[i], wind_speeds[i]), textcoords="offset points", xytext=(0, 10), ha='center')
-        self.ax_wind.set_title("风速")
-        self.ax_wind.set_xlabel("时间 (小时)")
-        self.ax_wind.set_ylabel("风速 (km/h)")
-        self.ax_wind.grid(True)
-
-        self.canvas.draw()
+        series = self.series
+        hours = series.strftime("%H")  # 提取小时部分
+
+        x = range(len(hours))
+        ticks = {"xticks": x, "xticklabels": hours}
+        self.temperature_chart.set_data(x, [series['temperature']], annotations=series['text'], **ticks)
+        self.humidity_chart.set_data(x, [series['humidity']], **ticks)
+        self.wind_chart.set_data(x, [series['wind_speed']], annotations=series['wind_direction'], **ticks)
+
+        self.canvas.render()
 
 if __name__ == "__main__":
     from PyQt6.QtWidgets import QApplication
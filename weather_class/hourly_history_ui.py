@@ -1,14 +1,13 @@
 import sys
 
-import matplotlib
+import numpy as np
 from PyQt6.QtWidgets import (
     QVBoxLayout, QPushButton, QLineEdit, QWidget, QMessageBox
 )
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 
-matplotlib.rcParams['font.sans-serif'] = ['SimHei']
-matplotlib.rcParams['axes.unicode_minus'] = False
+from utils.async_fetch import AsyncFetcher
+from utils.charts import ChartCanvas
+from utils.timeseries import TimeSeries, normalize_hourly
 
 class HourlyHistory(QWidget):
     def __init__(self, api_client, parent=None):
@@ -17,7 +16,8 @@ class HourlyHistory(QWidget):
         self.setWindowTitle("过去24小时历史天气")
         self.setFixedSize(1650, 850)
 
-        self.data = []  # 保存历史天气数据
+        self.series = None  # 历史天气时间序列
+        self.fetcher = AsyncFetcher(self)
 
         self.init_ui()
 
@@ -34,16 +34,25 @@ class HourlyHistory(QWidget):
         btn_fetch.clicked.connect(self.fetch_hourly_history)
         layout.addWidget(btn_fetch)
 
-        # Matplotlib 图表区域
-        self.canvas = FigureCanvas(Figure(figsize=(15, 10)))
+        # Matplotlib 图表区域，坐标轴装饰只创建一次
+        self.canvas = ChartCanvas(figsize=(15, 10))
         layout.addWidget(self.canvas)
-        self.ax_temperature = self.canvas.figure.add_subplot(241)
-        self.ax_pressure = self.canvas.figure.add_subplot(242)
-        self.ax_humidity = self.canvas.figure.add_subplot(243)
-        self.ax_visibility = self.canvas.figure.add_subplot(244)
-        self.ax_wind_speed = self.canvas.figure.add_subplot(245)
-        self.ax_clouds = self.canvas.figure.add_subplot(246)
-        self.ax_dew_point = self.canvas.figure.add_subplot(247)
+        self.temperature_chart = self.canvas.add_chart(
+            241, "温度与体感温度", "时间 (小时)", "温度 (°C)", [("温度", None), ("体感温度", 'orange')],
+            annotate=True, legend=True,
+        )
+        self.pressure_chart = self.canvas.add_chart(242, "气压", "时间 (小时)", "气压 (mb)", [("气压", 'blue')])
+        self.humidity_chart = self.canvas.add_chart(243, "湿度", "时间 (小时)", "湿度 (%)", [("湿度", 'green')])
+        self.visibility_chart = self.canvas.add_chart(
+            244, "能见度", "时间 (小时)", "能见度 (km)", [("能见度", 'purple')]
+        )
+        self.wind_speed_chart = self.canvas.add_chart(
+            245, "风速与风向", "时间 (小时)", "风速 (km/h)", [("风速", 'red')], annotate=True
+        )
+        self.clouds_chart = self.canvas.add_chart(246, "云量", "时间 (小时)", "云量 (%)", [("云量", 'brown')])
+        self.dew_point_chart = self.canvas.add_chart(
+            247, "露点温度", "时间 (小时)", "露点温度 (°C)", [("露点温度", 'cyan')]
+        )
         self.canvas.figure.tight_layout(pad=5.0)
 
         self.setLayout(layout)
@@ -55,147 +64,66 @@ class HourlyHistory(QWidget):
             QMessageBox.warning(self, "警告", "城市名称不能为空！")
             return
 
-        try:
-            weather_data = self.api_client.fetch_hourly_history(location=city)
-            raw_data = weather_data.get('results', [{}])[0].get('hourly_history', [])
-
-            # 去重逻辑，按小时去重
-            seen_hours = set()
-            unique_data = []
-            for item in raw_data:
-                hour = item['last_update'].split('T')[-1][:2]  # 提取小时部分
-                if hour not in seen_hours:
-                    seen_hours.add(hour)
-                    unique_data.append(item)
-
-            self.data = sorted(unique_data, key=lambda x: x['last_update'])
-
-            if not self.data:
-                QMessageBox.warning(self, "警告", "未获取到天气数据！")
-                return
+        self.fetcher.run(
+            self.api_client.fetch_hourly_history, location=city,
+            on_result=self.on_hourly_history_fetched, error_message="获取天气数据失败",
+        )
+
+    def on_hourly_history_fetched(self, weather_data):
+        raw_data = weather_data.get('results', [{}])[0].get('hourly_history', [])
+
+        # 只在获取后解析一次，露点温度等缺失值为 NaN；
+        # 按完整的日期+小时去重并排序，跨越午夜时不会丢失前一天的同一小时，缺失的小时补为 NaN
+        self.series = normalize_hourly(TimeSeries.from_records(
+            raw_data, 'last_update',
+            fields=('temperature', 'feels_like', 'pressure', 'humidity', 'visibility',
+                    'wind_speed', 'clouds', 'dew_point'),
+            texts=('wind_direction', 'text'),
+        ))
+
+        if not self.series:
+            QMessageBox.warning(self, "警告", "未获取到天气数据！")
+            return
 
-            self.plot_weather_data()
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"获取天气数据失败: {e}")
+        self.plot_weather_data()
 
     def plot_weather_data(self):
-        if not self.data:
+        if not self.series:
             return
 
-        # 提取数据
-        hourly_data = sorted(self.data, key=lambda x: x['last_update'])  # 确保按时间顺序排序
-        times = [hour['last_update'].split('T')[-1][:2] for hour in hourly_data]  # 提取小时部分
-        temperatures = [float(hour['temperature']) for hour in hourly_data]
-        feels_like = [float(hour['feels_like']) for hour in hourly_data]
-        pressures = [float(hour['pressure']) for hour in hourly_data]
-        humidities = [float(hour['humidity']) for hour in hourly_data]
-        visibilities = [float(hour['visibility']) for hour in hourly_data]
-        wind_speeds = [float(hour['wind_speed']) for hour in hourly_data]
-        wind_directions = [hour['wind_direction'] for hour in hourly_data]
-        clouds = [float(hour['clouds']) for hour in hourly_data]
-        dew_points = [float(hour['dew_point']) if hour['dew_point'] else None for hour in hourly_data]
-        weather_texts = [hour['text'] for hour in hourly_data]
-
-        # 清空图表
-        self.ax_temperature.clear()
-        self.ax_pressure.clear()
-        self.ax_humidity.clear()
-        self.ax_visibility.clear()
-        self.ax_wind_speed.clear()
-        self.ax_clouds.clear()
-        self.ax_dew_point.clear()
+        series = self.series
+        times = series.strftime("%H")  # 提取小时部分
 
         # 每隔 3 小时显示一次
+        x = range(len(times))
         xticks = range(0, len(times), 3)
-        xtick_labels = [times[i] for i in xticks]
-
-        # 温度与天气
-        self.ax_temperature.plot(times, temperatures, marker='o', label="温度")
-        self.ax_temperature.plot(times, feels_like, marker='o', label="体感温度", color='orange')
-        for i, text in enumerate(weather_texts):
-            if i % 2 == 0:  # 每隔两个小时标注一次
-                self.ax_temperature.annotate(
-                    text,
-                    (times[i], temperatures[i]),
-                    textcoords="offset points",
-                    xytext=(0, 10),
-                    ha='center'
-                )
-        self.ax_temperature.set_title("温度与体感温度")
-        self.ax_temperature.set_xlabel("时间 (小时)")
-        self.ax_temperature.set_ylabel("温度 (°C)")
-        self.ax_temperature.legend()
-        self.ax_temperature.set_xticks(xticks)
-        self.ax_temperature.set_xticklabels(xtick_labels)
-        self.ax_temperature.grid(True)
-
-        # 气压
-        self.ax_pressure.plot(times, pressures, marker='o', label="气压", color='blue')
-        self.ax_pressure.set_title("气压")
-        self.ax_pressure.set_xlabel("时间 (小时)")
-        self.ax_pressure.set_ylabel("气压 (mb)")
-        self.ax_pressure.set_xticks(xticks)
-        self.ax_pressure.set_xticklabels(xtick_labels)
-        self.ax_pressure.grid(True)
-
-        # 湿度
-        self.ax_humidity.plot(times, humidities, marker='o', label="湿度", color='green')
-        self.ax_humidity.set_title("湿度")
-        self.ax_humidity.set_xlabel("时间 (小时)")
-        self.ax_humidity.set_ylabel("湿度 (%)")
-        self.ax_humidity.set_xticks(xticks)
-        self.ax_humidity.set_xticklabels(xtick_labels)
-        self.ax_humidity.grid(True)
-
-        # 能见度
-        self.ax_visibility.plot(times, visibilities, marker='o', label="能见度", color='purple')
-        self.ax_visibility.set_title("能见度")
-        self.ax_visibility.set_xlabel("时间 (小时)")
-        self.ax_visibility.set_ylabel("能见度 (km)")
-        self.ax_visibility.set_xticks(xticks)
-        self.ax_visibility.set_xticklabels(xtick_labels)
-        self.ax_visibility.grid(True)
-
-        # 风速与风向
-        self.ax_wind_speed.plot(times, wind_speeds, marker='o', label="风速", color='red')
-        for i, direction in enumerate(wind_directions):
-            if i % 2 == 0:  # 每隔两个小时标注一次
-                self.ax_wind_speed.annotate(
-                    direction,
-                    (times[i], wind_speeds[i]),
-                    textcoords="offset points",
-                    xytext=(0, 10),
-                    ha='center'
-                )
-        self.ax_wind_speed.set_title("风速与风向")
-        self.ax_wind_speed.set_xlabel("时间 (小时)")
-        self.ax_wind_speed.set_ylabel("风速 (km/h)")
-        self.ax_wind_speed.set_xticks(xticks)
-        self.ax_wind_speed.set_xticklabels(xtick_labels)
-        self.ax_wind_speed.grid(True)
-
-        # 云量
-        self.ax_clouds.plot(times, clouds, marker='o', label="云量", color='brown')
-        self.ax_clouds.set_title("云量")
-        self.ax_clouds.set_xlabel("时间 (小时)")
-        self.ax_clouds.set_ylabel("云量 (%)")
-        self.ax_clouds.set_xticks(xticks)
-        self.ax_clouds.set_xticklabels(xtick_labels)
-        self.ax_clouds.grid(True)
-
-        # 露点温度
-        if any(dew_points):  # 检查是否有有效的露点温度数据
-            self.ax_dew_point.plot(times, [dp if dp is not None else 0 for dp in dew_points], marker='o', label="露点温度", color='cyan')
-            self.ax_dew_point.set_title("露点温度")
-            self.ax_dew_point.set_xlabel("时间 (小时)")
-            self.ax_dew_point.set_ylabel("露点温度 (°C)")
-            self.ax_dew_point.set_xticks(xticks)
-            self.ax_dew_point.set_xticklabels(xtick_labels)
-            self.ax_dew_point.grid(True)
+        ticks = {"xticks": xticks, "xticklabels": [times[i] for i in xticks]}
+
+        # 温度与天气，每隔两个小时标注一次
+        self.temperature_chart.set_data(
+            x, [series['temperature'], series['feels_like']],
+            annotations=[text if i % 2 == 0 else None for i, text in enumerate(series['text'])], **ticks
+        )
+        self.pressure_chart.set_data(x, [series['pressure']], **ticks)
+        self.humidity_chart.set_data(x, [series['humidity']], **ticks)
+        self.visibility_chart.set_data(x, [series['visibility']], **ticks)
+
+        # 风速与风向，每隔两个小时标注一次
+        self.wind_speed_chart.set_data(
+            x, [series['wind_speed']],
+            annotations=[direction if i % 2 == 0 else None for i, direction in enumerate(series['wind_direction'])],
+            **ticks
+        )
+        self.clouds_chart.set_data(x, [series['clouds']], **ticks)
+
+        # 露点温度，缺失的小时为 NaN，折线在此断开
+        dew_points = series['dew_point']
+        if not np.isnan(dew_points).all():  # 检查是否有有效的露点温度数据
+            self.dew_point_chart.set_data(x, [dew_points], **ticks)
         else:
-            self.ax_dew_point.text(0.5, 0.5, "暂无露点温度数据", transform=self.ax_dew_point.transAxes, ha='center', va='center', fontsize=12, color='red')
+            self.dew_point_chart.show_message("暂无露点温度数据")
 
-        self.canvas.draw()
+        self.canvas.render()
 
 if __name__ == "__main__":
     from PyQt6.QtWidgets import QApplication
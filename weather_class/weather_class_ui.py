@@ -1,10 +1,7 @@
 import sys
 from PyQt6.QtWidgets import QMainWindow, QVBoxLayout, QPushButton, QWidget, QGroupBox, QApplication
-from weather_class.current_weather_ui import CurrentWeather
-from weather_class.daily_forecast_ui import DailyForecast
-from weather_class.hourly_forecast_ui import HourlyForecast
-from weather_class.hourly_history_ui import HourlyHistory
-from weather_class.alerts_ui import WeatherAlerts
+
+# 子功能窗口在首次打开时才导入，启动时不加载 matplotlib 等重量级依赖
 
 class WeatherClass(QMainWindow):
     def __init__(self, api_client, parent=None):
@@ -98,26 +95,31 @@ class WeatherClass(QMainWindow):
 
     def open_current_weather(self):
         if self.current_weather_window is None:
+            from weather_class.current_weather_ui import CurrentWeather
             self.current_weather_window = CurrentWeather(self.api_client)
         self.current_weather_window.show()
 
     def open_daily_forecast(self):
         if self.daily_forecast_window is None:
+            from weather_class.daily_forecast_ui import DailyForecast
             self.daily_forecast_window = DailyForecast(self.api_client)
         self.daily_forecast_window.show()
 
     def open_hourly_forecast(self):
         if self.hourly_forecast_window is None:
+            from weather_class.hourly_forecast_ui import HourlyForecast
             self.hourly_forecast_window = HourlyForecast(self.api_client)
         self.hourly_forecast_window.show()
 
     def open_hourly_history(self):
         if self.hourly_history_window is None:
+            from weather_class.hourly_history_ui import HourlyHistory
             self.hourly_history_window = HourlyHistory(self.api_client)
         self.hourly_history_window.show()
 
     def open_alerts(self):
         if self.alerts_window is None:
+            from weather_class.alerts_ui import WeatherAlerts
             self.alerts_window = WeatherAlerts(self.api_client)
         self.alerts_window.show()
 